@@ -2,7 +2,8 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from flask_cors import cross_origin
-from ml.routes import get_available_models, add_model, remove_model
+from ml.routes import (get_available_models, add_model, remove_model, set_model_settings, check_quantization,
+                       prefetch_model, verify_model_artifacts, is_registered_model)
 from models import User, db
 from datetime import datetime
 
@@ -88,9 +89,12 @@ def add_new_model():
         if not model_name:
             return jsonify({"error": "model_name is required"}), 400
         
-        print(f"Adding model: {model_name} by user: {user.name}")
+        inference_mode = data.get('inference_mode', 'fp32')
+        engine = data.get('engine', 'pytorch')
         
-        if add_model(model_name):
+        print(f"Adding model: {model_name} ({engine}, {inference_mode}) by user: {user.name}")
+        
+        if add_model(model_name, inference_mode, engine):
             return jsonify({
                 "status": "success",
                 "message": "Model added successfully",
@@ -135,6 +139,119 @@ def delete_model(model_name):
         print(f"Error in delete_model: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@admin_bp.route('/models/<path:model_name>/settings', methods=['PUT'])
+@cross_origin()
+@jwt_required()
+def update_model_settings(model_name):
+    """Update inference settings of an AI model"""
+    try:
+        user, error_response, status_code = require_admin()
+        if error_response:
+            return error_response, status_code
+        
+        data = request.get_json()
+        if not data or ('inference_mode' not in data and 'engine' not in data):
+            return jsonify({"error": "inference_mode or engine is required"}), 400
+        
+        print(f"Updating settings of {model_name} to {data} by user: {user.name}")
+        
+        settings = set_model_settings(model_name, data.get('inference_mode'), data.get('engine'))
+        if settings is None:
+            return jsonify({
+                "status": "error",
+                "error": "Model not found or invalid inference_mode/engine"
+            }), 400
+        
+        return jsonify({
+            "status": "success",
+            "message": "Model settings updated successfully",
+            "settings": settings
+        })
+        
+    except Exception as e:
+        print(f"Error in update_model_settings: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@admin_bp.route('/models/<path:model_name>/quantization-check', methods=['POST'])
+@cross_origin()
+@jwt_required()
+def quantization_check(model_name):
+    """Compare int8 against fp32 predictions on a sample set"""
+    try:
+        user, error_response, status_code = require_admin()
+        if error_response:
+            return error_response, status_code
+        
+        data = request.get_json(silent=True) or {}
+        samples = data.get('samples')
+        if samples is not None and not isinstance(samples, list):
+            return jsonify({"error": "samples must be a list of strings"}), 400
+        if not is_registered_model(model_name):
+            return jsonify({"error": f"Unknown model: {model_name}"}), 404
+        
+        return jsonify({
+            "status": "success",
+            "model_name": model_name,
+            "report": check_quantization(model_name, samples)
+        })
+        
+    except Exception as e:
+        print(f"Error in quantization_check: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@admin_bp.route('/models/<path:model_name>/prefetch', methods=['POST'])
+@cross_origin()
+@jwt_required()
+def prefetch(model_name):
+    """Download a model into the local artifact store (force=true re-downloads it)"""
+    try:
+        user, error_response, status_code = require_admin()
+        if error_response:
+            return error_response, status_code
+        
+        data = request.get_json(silent=True) or {}
+        print(f"Prefetching model: {model_name} by user: {user.name}")
+        
+        artifact = prefetch_model(model_name, force=bool(data.get('force')))
+        if artifact is None:
+            return jsonify({
+                "status": "error",
+                "error": "Model not found"
+            }), 404
+        
+        return jsonify({
+            "status": "success",
+            "message": "Model stored locally",
+            "artifact": artifact
+        })
+        
+    except Exception as e:
+        print(f"Error in prefetch: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@admin_bp.route('/models/verify', methods=['POST'])
+@cross_origin()
+@jwt_required()
+def verify_models():
+    """Re-hash the stored model files against the recorded checksums"""
+    try:
+        user, error_response, status_code = require_admin()
+        if error_response:
+            return error_response, status_code
+        
+        data = request.get_json(silent=True) or {}
+        reports = verify_model_artifacts(data.get('model_name'))
+        
+        return jsonify({
+            "status": "success",
+            "ok": all(report['ok'] for report in reports),
+            "models": reports
+        })
+        
+    except Exception as e:
+        print(f"Error in verify_models: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
 @admin_bp.route('/users', methods=['GET'])
 @cross_origin()
 @jwt_required()
@@ -1,6 +1,6 @@
 # app.py
 
-from flask import Flask
+from flask import Flask, Response
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from dotenv import load_dotenv
@@ -9,9 +9,25 @@ import os
 # Import blueprints
 from auth import auth_bp
 from models import db
+from models.migrations import run_migrations
+from models.engine import engine_options, configure_engine
 from ml.routes import ml_bp
 from admin.routes import admin_bp
 from history.routes import history_bp  
+from jobs import jobs_bp
+from jobs.worker import prediction_workers
+from jobs.runner import resume_jobs
+from ml.routes import log_label_mapping_selftest
+from utils.instrumentation import configure_logging
+from utils.metrics import metrics
+from ml.registry import model_registry
+from ml.cache import prediction_cache
+from ml.engines import onnx_engine
+from ml.artifacts import artifact_store
+from ml.warmup import model_warmup
+from ml.remote import inference_client
+from ml.scheduler import micro_batcher
+from utils.http_cache import github_cache
 
 # Load environment variables
 load_dotenv()
@@ -23,7 +39,83 @@ def create_app():
     app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'your-secret-key-here')
     app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///db.sqlite3')
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SQLITE_BUSY_TIMEOUT_MS'] = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    app.config['SQLITE_JOURNAL_MODE'] = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')  # '' = leave the default
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(
+        app.config['SQLALCHEMY_DATABASE_URI'],
+        busy_timeout_ms=app.config['SQLITE_BUSY_TIMEOUT_MS'],
+        pool_size=int(os.environ.get('DB_POOL_SIZE', 10)),
+        max_overflow=int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+        pool_recycle=int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    )
     app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY', 'your-jwt-secret-key')
+    app.config['MODEL_REGISTRY_MAX_MB'] = int(os.environ.get('MODEL_REGISTRY_MAX_MB', 4096))
+    app.config['INFERENCE_BATCH_SIZE'] = int(os.environ.get('INFERENCE_BATCH_SIZE', 16))
+    app.config['INFERENCE_TOKEN_BUDGET'] = int(os.environ.get('INFERENCE_TOKEN_BUDGET', 8192))
+    # Coalescing window for concurrent requests of one model (0 = off). Only waited while another request for the
+    # model is in flight: more throughput under load, up to this much extra latency per batch; idle requests never wait
+    app.config['INFERENCE_BATCH_WINDOW_MS'] = float(os.environ.get('INFERENCE_BATCH_WINDOW_MS', 5))
+    app.config['INFERENCE_BATCH_MAX_TEXTS'] = int(os.environ.get('INFERENCE_BATCH_MAX_TEXTS', 64))
+    app.config['COMPARE_MAX_WORKERS'] = int(os.environ.get('COMPARE_MAX_WORKERS', 0))  # 0 = half the cores
+    app.config['PREDICTION_CACHE_SIZE'] = int(os.environ.get('PREDICTION_CACHE_SIZE', 50000))
+    app.config['PREDICTION_CACHE_DB'] = os.environ.get('PREDICTION_CACHE_DB', '')
+    app.config['MODEL_STORE_DIR'] = os.environ.get('MODEL_STORE_DIR', os.path.join(app.instance_path, 'models'))
+    app.config['MODEL_STORE_OFFLINE'] = os.environ.get('MODEL_STORE_OFFLINE', '1') == '1'  # 0 = load missing models from the hub
+    app.config['ONNX_CACHE_DIR'] = os.environ.get('ONNX_CACHE_DIR', os.path.join(app.instance_path, 'onnx'))
+    app.config['ONNX_INTRA_OP_THREADS'] = int(os.environ.get('ONNX_INTRA_OP_THREADS', os.cpu_count() or 1))
+    app.config['GITHUB_CACHE_DB'] = os.environ.get('GITHUB_CACHE_DB', os.path.join(app.instance_path, 'github_cache.sqlite3'))
+    app.config['GITHUB_CACHE_TTL'] = int(os.environ.get('GITHUB_CACHE_TTL', 60))
+    app.config['GITHUB_CACHE_MAX_MB'] = int(os.environ.get('GITHUB_CACHE_MAX_MB', 200))
+    app.config['BULK_CHUNK_SIZE'] = int(os.environ.get('BULK_CHUNK_SIZE', 20))
+    app.config['BULK_RESUME_ON_STARTUP'] = os.environ.get('BULK_RESUME_ON_STARTUP', '1') == '1'
+    app.config['JOB_LEASE_SECONDS'] = int(os.environ.get('JOB_LEASE_SECONDS', 300))  # stale after this without a heartbeat
+    app.config['PREDICT_WORKERS'] = int(os.environ.get('PREDICT_WORKERS', 2))
+    app.config['JOB_POLL_INTERVAL'] = float(os.environ.get('JOB_POLL_INTERVAL', 0.5))
+    app.config['LOG_LEVEL'] = os.environ.get('LOG_LEVEL', 'INFO')
+    app.config['LOG_SAMPLE_RATE'] = float(os.environ.get('LOG_SAMPLE_RATE', 0.1))
+    app.config['INFERENCE_DEBUG'] = os.environ.get('INFERENCE_DEBUG', '0') == '1'
+    app.config['PRELOAD_MODELS'] = os.environ.get('PRELOAD_MODELS', '')  # opt-in: 'all' or comma-separated names
+    app.config['WARMUP_PASSES'] = int(os.environ.get('WARMUP_PASSES', 3))
+    app.config['INFERENCE_SERVER'] = os.environ.get('INFERENCE_SERVER', '')  # '' = models in this process
+    app.config['INFERENCE_SERVER_AUTHKEY'] = os.environ.get('INFERENCE_SERVER_AUTHKEY', '')  # required with INFERENCE_SERVER
+    
+    # Structured logging (tensor dumps and self-tests only with INFERENCE_DEBUG=1)
+    configure_logging(level=app.config['LOG_LEVEL'], debug=app.config['INFERENCE_DEBUG'],
+                      sample_rate=app.config['LOG_SAMPLE_RATE'])
+    log_label_mapping_selftest()
+    
+    # Shared model registry (0 = no memory budget)
+    model_registry.configure(max_bytes=app.config['MODEL_REGISTRY_MAX_MB'] * 1024 * 1024 or None)
+    
+    # Cross-request micro-batching of small classification calls
+    micro_batcher.configure(window_ms=app.config['INFERENCE_BATCH_WINDOW_MS'],
+                            max_texts=app.config['INFERENCE_BATCH_MAX_TEXTS'])
+    
+    # Prediction cache (memory LRU + optional SQLite tier)
+    prediction_cache.configure(max_entries=app.config['PREDICTION_CACHE_SIZE'],
+                               db_path=app.config['PREDICTION_CACHE_DB'] or None)
+    
+    # Local model artifact store (safetensors, fetched once by the admin)
+    artifact_store.configure(root=app.config['MODEL_STORE_DIR'], offline=app.config['MODEL_STORE_OFFLINE'])
+    
+    # ONNX Runtime engine (exported graphs cached on local disk)
+    onnx_engine.configure(cache_dir=app.config['ONNX_CACHE_DIR'],
+                          intra_op_threads=app.config['ONNX_INTRA_OP_THREADS'])
+    
+    # GitHub ETag response cache (empty GITHUB_CACHE_DB disables it)
+    github_cache.configure(db_path=app.config['GITHUB_CACHE_DB'] or None,
+                           ttl=app.config['GITHUB_CACHE_TTL'],
+                           max_bytes=app.config['GITHUB_CACHE_MAX_MB'] * 1024 * 1024)
+    
+    # Inference server mode: models live in `python -m ml.server`, workers are thin clients
+    inference_client.configure(address=app.config['INFERENCE_SERVER'] or None,
+                               authkey=app.config['INFERENCE_SERVER_AUTHKEY'])
+    
+    # Startup preload + warm-up of registered models
+    model_warmup.configure(models=app.config['PRELOAD_MODELS'], passes=app.config['WARMUP_PASSES'])
+    
+    # Worker pool for async /predict jobs
+    prediction_workers.configure(max_workers=app.config['PREDICT_WORKERS'])
     
     # Initialize extensions
     db.init_app(app)
@@ -42,11 +134,35 @@ def create_app():
     app.register_blueprint(ml_bp, url_prefix='/api/ml')
     app.register_blueprint(admin_bp, url_prefix='/api/admin')
     app.register_blueprint(history_bp, url_prefix='/api')  
+    app.register_blueprint(jobs_bp, url_prefix='/api/jobs')
     
     # Create tables
     with app.app_context():
+        configure_engine(db, busy_timeout_ms=app.config['SQLITE_BUSY_TIMEOUT_MS'],
+                         journal_mode=app.config['SQLITE_JOURNAL_MODE'])
         db.create_all()
+        run_migrations(db)
         print("✅ Database tables created successfully")
+        # Interrupted jobs are resumed by `python -m jobs.runner`, not by every web worker
+    
+    # Load models in the background; /api/ml/ready reports progress
+    model_warmup.start(app)
+    
+    # Runtime gauges, read at scrape time
+    metrics.gauge('model_registry_bytes', 'Estimated memory of loaded models', model_registry.total_bytes)
+    metrics.gauge('model_registry_models', 'Loaded model variants', lambda: len(model_registry.stats()['models']))
+    metrics.gauge('models_hot', 'Models preloaded and warmed at startup',
+                  lambda: len(model_warmup.status()['hot_models']))
+    metrics.gauge('prediction_cache_hit_ratio', 'Prediction cache hit ratio',
+                  lambda: prediction_cache.stats()['hit_ratio'])
+    metrics.gauge('prediction_cache_entries', 'Prediction cache entries in memory',
+                  lambda: prediction_cache.stats()['memory_entries'])
+    metrics.gauge('github_cache_hit_ratio', 'GitHub response cache hit ratio (fresh + 304)',
+                  lambda: github_cache.stats()['hit_ratio'])
+    
+    @app.route('/metrics')
+    def metrics_endpoint():
+        return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
     
     @app.route('/')
     def index():
@@ -57,7 +173,8 @@ def create_app():
                 "auth": "/api/auth",
                 "ml": "/api/ml", 
                 "admin": "/api/admin",
-                "history": "/api/history"  # 
+                "history": "/api/history",  # 
+                "jobs": "/api/jobs"
             }
         }
     
@@ -65,4 +182,6 @@ def create_app():
 
 if __name__ == '__main__':
     app = create_app()
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        resume_jobs(app)  # dev server: resume in the serving process, not the reloader
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
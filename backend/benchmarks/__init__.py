@@ -0,0 +1,2 @@
+# backend/benchmarks/__init__.py
+# Offline inference benchmarks: python -m benchmarks.run_benchmark --help
@@ -0,0 +1,100 @@
+# backend/benchmarks/corpus.py
+
+import random
+from datetime import datetime, timedelta
+
+# Issue-tracker vocabulary so tokenizers see realistic subwords
+WORDS = (
+    "the app crashes when I open settings after upgrading to version it worked before "
+    "please add support for dark mode export import config file error message stack trace "
+    "memory usage is too high on startup slow response time login fails with timeout "
+    "thanks for the report can you share logs steps to reproduce expected behavior actual "
+    "behavior this is a duplicate of we fixed it in the latest release closing feature "
+    "request would be nice performance security accessibility usability documentation "
+    "the button does not work on mobile screen reader label missing translation encrypt "
+    "password stored in plain text api returns 500 when payload is large cpu spikes"
+).split()
+
+CODE_LINES = (
+    "Traceback (most recent call last):",
+    '  File "main.py", line 42, in <module>',
+    "TypeError: 'NoneType' object is not subscriptable",
+    "at com.example.App.onCreate(App.java:118)",
+    "$ npm run build -- --verbose",
+    "ERROR 2024-01-01T12:00:00Z request failed status=500",
+)
+
+# Corpus presets: (issues, median comments per issue)
+PRESETS = {
+    'small': (5, 8),
+    'medium': (20, 25),
+    'large': (50, 60),
+}
+
+
+def comment_length(rng):
+    """Words in a comment; log-normal like real threads (median ~35, long tail of pasted logs)"""
+    return max(1, min(1500, int(rng.lognormvariate(3.55, 1.0))))
+
+
+def comment_text(rng):
+    words = [rng.choice(WORDS) for _ in range(comment_length(rng))]
+    text = " ".join(words).capitalize() + "."
+    if rng.random() < 0.1:
+        lines = [rng.choice(CODE_LINES) for _ in range(rng.randint(3, 40))]
+        text += "\n\n```\n" + "\n".join(lines) + "\n```"
+    return text
+
+
+def generate_corpus(preset='medium', seed=1234, owner='bench', repo='corpus'):
+    """
+    Deterministic synthetic issues for the stub GitHub server.
+
+    Returns {issue_number: (issue_json, [comment_json, ...])} shaped like the
+    GitHub REST API responses the app consumes.
+    """
+    issue_count, median_comments = PRESETS[preset]
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    issues = {}
+
+    for number in range(1, issue_count + 1):
+        created = start + timedelta(days=number)
+        issue = {
+            'number': number,
+            'title': " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 10))).capitalize(),
+            'body': comment_text(rng),
+            'state': 'open',
+            'user': {'login': f"reporter{number}"},
+            'created_at': created.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'updated_at': created.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'html_url': f"https://github.com/{owner}/{repo}/issues/{number}",
+        }
+
+        # Comments per issue are heavy-tailed too: most threads are short, a few are long
+        count = max(1, int(rng.lognormvariate(0, 0.8) * median_comments))
+        comments = []
+        for index in range(count):
+            stamp = (created + timedelta(hours=index + 1)).strftime('%Y-%m-%dT%H:%M:%SZ')
+            comments.append({
+                'id': number * 100000 + index,
+                'body': comment_text(rng),
+                'user': {'login': f"user{rng.randint(1, 200)}"},
+                'created_at': stamp,
+                'updated_at': stamp,
+            })
+        issues[number] = (issue, comments)
+
+    return issues
+
+
+def corpus_stats(issues):
+    comment_counts = [len(comments) for _, comments in issues.values()]
+    words = sorted(len(c['body'].split()) for _, comments in issues.values() for c in comments)
+    return {
+        'issues': len(issues),
+        'comments': sum(comment_counts),
+        'max_comments_per_issue': max(comment_counts) if comment_counts else 0,
+        'median_words_per_comment': words[len(words) // 2] if words else 0,
+        'max_words_per_comment': words[-1] if words else 0,
+    }
@@ -0,0 +1,123 @@
+# backend/benchmarks/load_test.py
+"""
+Concurrent /api/ml/predict load test for the micro-batching scheduler.
+
+In-process (default): replays the small synthetic corpus from the stub
+GitHub server with N concurrent clients, once per batching window, so the
+throughput with and without cross-request batching can be compared:
+
+    cd backend
+    python -m benchmarks.load_test --models org/model --concurrency 16 --windows 0,5,10
+
+Against a running server (e.g. gunicorn), with real issue URLs:
+
+    python -m benchmarks.load_test --url http://localhost:5000 --models org/model \
+        --issue-url https://github.com/o/r/issues/1 --concurrency 16 --requests 200
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.stub_github import start_stub_server
+from benchmarks.run_benchmark import configure_environment, parse_args as benchmark_args, percentile, run_variant
+
+
+def http_load(url, model_name, issue_urls, concurrency, total):
+    """Fire ``total`` /predict calls at a live server from ``concurrency`` threads"""
+    import requests
+
+    latencies, errors, comments = [], [], [0]
+    lock = threading.Lock()
+    work = [issue_urls[i % len(issue_urls)] for i in range(total)]
+
+    def worker(offset):
+        session = requests.Session()
+        for issue_url in work[offset::concurrency]:
+            started = time.perf_counter()
+            response = session.post(f"{url.rstrip('/')}/api/ml/predict",
+                                    json={'model_name': model_name, 'issue_url': issue_url}, timeout=300)
+            elapsed = time.perf_counter() - started
+            with lock:
+                if response.status_code == 200:
+                    latencies.append(elapsed)
+                    comments[0] += response.json().get('total_comments', 0)
+                else:
+                    errors.append(response.status_code)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    return {
+        'model': model_name,
+        'requests': len(latencies),
+        'errors': len(errors),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2) if latencies else None,
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2) if latencies else None,
+        'requests_per_sec': round(len(latencies) / wall, 2),
+        'comments_per_sec': round(comments[0] / wall, 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent /api/ml/predict load test")
+    parser.add_argument('--models', required=True, help="comma-separated model names")
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--windows', default='0,5', help="batching windows (ms) to compare in-process")
+    parser.add_argument('--repeats', type=int, default=4, help="passes over the corpus (in-process)")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--url', help="base URL of a running server instead of the in-process app")
+    parser.add_argument('--issue-url', action='append', default=[], help="issue URL(s) for --url mode")
+    parser.add_argument('--requests', type=int, default=200, help="total requests in --url mode")
+    parser.add_argument('--output', help="optional JSON report path")
+    args = parser.parse_args(argv)
+    models = [name.strip() for name in args.models.split(',') if name.strip()]
+
+    results = []
+    if args.url:
+        if not args.issue_url:
+            parser.error("--issue-url is required with --url")
+        for model_name in models:
+            results.append(http_load(args.url, model_name, args.issue_url, args.concurrency, args.requests))
+    else:
+        issues = generate_corpus('small', args.seed)
+        server, api_url = start_stub_server(issues)
+        configure_environment(benchmark_args([]), api_url, tempfile.mkdtemp(prefix='issue-load-'))
+
+        from app import create_app
+        from ml.scheduler import micro_batcher
+        app = create_app()
+        issue_urls = [issue['html_url'] for issue, _ in issues.values()]
+
+        for window in [float(w) for w in args.windows.split(',') if w.strip()]:
+            micro_batcher.configure(window_ms=window)
+            for model_name in models:
+                row = run_variant(app, (model_name, 'fp32', 'pytorch'), issue_urls, args.repeats, args.concurrency)
+                row['batch_window_ms'] = window
+                results.append(row)
+        server.shutdown()
+
+    for row in results:
+        window = f"window={row['batch_window_ms']}ms " if 'batch_window_ms' in row else ''
+        print(f"{row['model']} {window}c={args.concurrency}: p50={row.get('p50_ms')} p95={row.get('p95_ms')} "
+              f"req/s={row.get('requests_per_sec')} comments/s={row.get('comments_per_sec')} errors={row.get('errors')}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump({'concurrency': args.concurrency, 'results': results}, f, indent=2)
+    return results
+
+
+if __name__ == '__main__':
+    main()
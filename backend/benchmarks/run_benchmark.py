@@ -0,0 +1,359 @@
+# backend/benchmarks/run_benchmark.py
+"""
+Offline /api/ml/predict benchmark.
+
+Serves a synthetic issue corpus from a local stub of api.github.com, replays
+it through the Flask app for every model / inference mode / engine variant
+and writes latency percentiles, throughput and memory figures as JSON.
+
+    cd backend
+    python -m benchmarks.run_benchmark --preset medium --engines pytorch,onnx \
+        --output benchmarks/results/after.json --baseline benchmarks/results/before.json
+
+Model weights must already be in the local Hugging Face cache (the hub is
+put in offline mode unless --allow-download is given).
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from benchmarks.corpus import PRESETS, generate_corpus, corpus_stats
+from benchmarks.stub_github import start_stub_server
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODELS = [
+    "mrizkywidodo/distilbert-base-uncased-rizkywidodo",
+    "mrizkywidodo/bert-base-rizkywidodo",
+    "mrizkywidodo/roberta-base-rizkywidodo",
+]
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def current_rss_mb():
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class RssSampler:
+    """
+    Highest current RSS seen while one variant runs. ru_maxrss is the
+    high-water mark of the whole process, so after the first large model
+    every later variant would report the same peak.
+    """
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.start_mb = None
+        self.peak_mb = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        rss = current_rss_mb()
+        if rss is not None and (self.peak_mb is None or rss > self.peak_mb):
+            self.peak_mb = rss
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self.start_mb = current_rss_mb()
+        self._sample()
+        self._thread = threading.Thread(target=self._run, name='rss-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        return self.peak_mb
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def registered_models(database_url):
+    """(model, inference_mode, engine) rows of the AIModel table, or None if unavailable"""
+    try:
+        from sqlalchemy import create_engine, text
+        if database_url.startswith('sqlite:///') and not database_url.startswith('sqlite:////'):
+            # Flask-SQLAlchemy resolves relative SQLite paths against the instance folder
+            database_url = 'sqlite:///' + os.path.join(BACKEND_DIR, 'instance', database_url[len('sqlite:///'):])
+        engine = create_engine(database_url)
+        with engine.connect() as conn:
+            rows = conn.execute(text("SELECT huggingface_url, inference_mode, engine FROM ai_model")).fetchall()
+        engine.dispose()
+        return [(row[0], row[1] or 'fp32', row[2] or 'pytorch') for row in rows] or None
+    except Exception as e:
+        print(f"⚠️ Could not read registered models: {e}")
+        return None
+
+
+def build_variants(args):
+    if args.models:
+        models = [name.strip() for name in args.models.split(',') if name.strip()]
+    else:
+        rows = registered_models(args.source_db)
+        models = list(dict.fromkeys(row[0] for row in rows)) if rows else DEFAULT_MODELS
+    modes = [mode.strip() for mode in args.modes.split(',') if mode.strip()]
+    engines = [engine.strip() for engine in args.engines.split(',') if engine.strip()]
+    return [(model, mode, engine) for model in models for engine in engines for mode in modes]
+
+
+def configure_environment(args, api_url, workdir):
+    """Environment read by create_app(); must be set before the app is built"""
+    os.environ['GITHUB_API_URL'] = api_url
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.sqlite3')}"
+    os.environ['GITHUB_CACHE_DB'] = ''
+    os.environ['PREDICTION_CACHE_DB'] = ''
+    os.environ['BULK_RESUME_ON_STARTUP'] = '0'
+    os.environ['PRELOAD_MODELS'] = ''  # cold start is measured per variant
+    os.environ['LOG_LEVEL'] = 'WARNING'
+    os.environ['LOG_SAMPLE_RATE'] = '0'
+    if not args.with_cache:
+        os.environ['PREDICTION_CACHE_SIZE'] = '0'
+    if not args.allow_download:
+        os.environ['HF_HUB_OFFLINE'] = '1'
+        os.environ['TRANSFORMERS_OFFLINE'] = '1'
+
+
+def use_variant(app, model_name, inference_mode, engine):
+    """Point the model's AIModel settings at one variant and start from a cold registry"""
+    from models import db
+    from models.aimodels import AIModel
+    from ml.registry import model_registry
+    from ml.cache import prediction_cache
+
+    with app.app_context():
+        model = AIModel.query.filter_by(huggingface_url=model_name).first()
+        if model is None:
+            model = AIModel(name=model_name.split('/')[-1], huggingface_url=model_name, uploaded_by='benchmark')
+            db.session.add(model)
+        model.inference_mode = inference_mode
+        model.engine = engine
+        db.session.commit()
+
+    model_registry.clear()
+    prediction_cache.invalidate(model_name)
+
+
+def post_predict(client, model_name, issue_url):
+    started = time.perf_counter()
+    response = client.post('/api/ml/predict', json={'model_name': model_name, 'issue_url': issue_url})
+    elapsed = time.perf_counter() - started
+    comments = response.get_json().get('total_comments', 0) if response.status_code == 200 else 0
+    return elapsed, response.status_code, comments
+
+
+def run_variant(app, variant, issue_urls, repeats, concurrency):
+    from utils.metrics import STAGE_SECONDS
+
+    model_name, inference_mode, engine = variant
+    use_variant(app, model_name, inference_mode, engine)
+    gc.collect()  # release the previous variant's model before sampling starts
+    rss = RssSampler().start()
+
+    # The first request pays for loading (and exporting/quantizing) the model
+    cold_seconds, cold_status, _ = post_predict(app.test_client(), model_name, issue_urls[0])
+    if cold_status != 200:
+        rss.stop()
+        return {'model': model_name, 'inference_mode': inference_mode, 'engine': engine,
+                'error': f"cold request failed with HTTP {cold_status}"}
+
+    work = [url for _ in range(repeats) for url in issue_urls]
+    latencies, errors, comments = [], [], [0]
+    lock = threading.Lock()
+    stages_before = STAGE_SECONDS.snapshot()
+
+    def worker(offset):
+        client = app.test_client()
+        for url in work[offset::concurrency]:
+            elapsed, status, count = post_predict(client, model_name, url)
+            with lock:
+                if status == 200:
+                    latencies.append(elapsed)
+                    comments[0] += count
+                else:
+                    errors.append(status)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    peak_rss = rss.stop()
+
+    stages = {}
+    for (endpoint, stage), (total, count) in STAGE_SECONDS.snapshot().items():
+        if endpoint != 'predict':
+            continue
+        before_total, before_count = stages_before.get((endpoint, stage), (0.0, 0))
+        if count > before_count:
+            stages[stage] = round((total - before_total) / (count - before_count) * 1000, 2)
+
+    to_ms = lambda seconds: round(seconds * 1000, 2) if seconds is not None else None
+    return {
+        'model': model_name,
+        'inference_mode': inference_mode,
+        'engine': engine,
+        'requests': len(latencies),
+        'errors': len(errors),
+        'cold_start_ms': to_ms(cold_seconds),
+        'p50_ms': to_ms(percentile(latencies, 50)),
+        'p95_ms': to_ms(percentile(latencies, 95)),
+        'p99_ms': to_ms(percentile(latencies, 99)),
+        'mean_ms': to_ms(sum(latencies) / len(latencies)) if latencies else None,
+        'comments_per_sec': round(comments[0] / wall, 2) if wall > 0 else None,
+        'requests_per_sec': round(len(latencies) / wall, 2) if wall > 0 else None,
+        'stage_mean_ms': stages,
+        'rss_mb': round(current_rss_mb() or 0, 1),
+        'start_rss_mb': round(rss.start_mb or 0, 1),
+        'peak_rss_mb': round(peak_rss or 0, 1),
+    }
+
+
+def variant_key(result):
+    return (result['model'], result['inference_mode'], result['engine'])
+
+
+def compare_with_baseline(results, baseline_path):
+    """Percent change per variant against an earlier JSON report (negative latency = faster)"""
+    with open(baseline_path) as f:
+        baseline = {variant_key(row): row for row in json.load(f).get('results', [])}
+
+    comparison = []
+    for row in results:
+        before = baseline.get(variant_key(row))
+        if not before or 'error' in row or 'error' in before:
+            continue
+        deltas = {}
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms', 'comments_per_sec', 'peak_rss_mb'):
+            if before.get(metric) and row.get(metric) is not None:
+                deltas[metric] = round((row[metric] - before[metric]) / before[metric] * 100, 1)
+        comparison.append({'model': row['model'], 'inference_mode': row['inference_mode'],
+                           'engine': row['engine'], 'change_pct': deltas})
+    return comparison
+
+
+def print_table(results):
+    print(f"{'model':<50} {'mode':<5} {'engine':<8} {'p50':>8} {'p95':>8} {'p99':>8} {'c/s':>8} {'peakMB':>8}")
+    for row in results:
+        name = row['model'][-50:]
+        if 'error' in row:
+            print(f"{name:<50} {row['inference_mode']:<5} {row['engine']:<8} {row['error']}")
+            continue
+        print(f"{name:<50} {row['inference_mode']:<5} {row['engine']:<8} "
+              f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8} "
+              f"{row['comments_per_sec']:>8} {row['peak_rss_mb']:>8}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmark of /api/ml/predict")
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='medium', help="corpus size")
+    parser.add_argument('--seed', type=int, default=1234, help="corpus seed (same seed = same corpus)")
+    parser.add_argument('--models', help="comma-separated model names (default: models registered in AIModel)")
+    parser.add_argument('--source-db', default=os.environ.get('DATABASE_URL', 'sqlite:///db.sqlite3'),
+                        help="database to read registered models from")
+    parser.add_argument('--modes', default='fp32', help="comma-separated inference modes (fp32,int8)")
+    parser.add_argument('--engines', default='pytorch', help="comma-separated engines (pytorch,onnx)")
+    parser.add_argument('--repeats', type=int, default=3, help="passes over the corpus per variant")
+    parser.add_argument('--concurrency', type=int, default=1, help="concurrent client threads")
+    parser.add_argument('--with-cache', action='store_true', help="keep the prediction cache enabled")
+    parser.add_argument('--allow-download', action='store_true', help="allow Hugging Face hub downloads")
+    parser.add_argument('--output', help="JSON report path (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument('--baseline', help="earlier JSON report to compare against")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    variants = build_variants(args)
+
+    issues = generate_corpus(args.preset, args.seed)
+    server, api_url = start_stub_server(issues)
+    workdir = tempfile.mkdtemp(prefix='issue-bench-')
+    configure_environment(args, api_url, workdir)
+
+    from app import create_app
+    app = create_app()
+    issue_urls = [issue['html_url'] for issue, _ in issues.values()]
+
+    print(f"🏁 {len(variants)} variant(s), {len(issue_urls)} issues x {args.repeats} repeats, "
+          f"concurrency {args.concurrency}")
+    results = []
+    for variant in variants:
+        print(f"⏱️  {' / '.join(variant)}")
+        results.append(run_variant(app, variant, issue_urls, args.repeats, args.concurrency))
+
+    report = {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat() + 'Z',
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'preset': args.preset,
+            'seed': args.seed,
+            'repeats': args.repeats,
+            'concurrency': args.concurrency,
+            'prediction_cache': args.with_cache,
+            'inference_batch_size': app.config['INFERENCE_BATCH_SIZE'],
+            'inference_token_budget': app.config['INFERENCE_TOKEN_BUDGET'],
+            'corpus': corpus_stats(issues),
+        },
+        'results': results,
+    }
+    if args.baseline:
+        report['comparison'] = compare_with_baseline(results, args.baseline)
+
+    output = args.output or os.path.join(BACKEND_DIR, 'benchmarks', 'results',
+                                         datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print_table(results)
+    for row in report.get('comparison', []):
+        print(f"Δ {row['model']} {row['inference_mode']}/{row['engine']}: {row['change_pct']}")
+    print(f"📄 Report written to {output}")
+
+    server.shutdown()
+    return report
+
+
+if __name__ == '__main__':
+    main()
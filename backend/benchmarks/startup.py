@@ -0,0 +1,117 @@
+# backend/benchmarks/startup.py
+"""
+Startup cost of a worker that only serves the non-ML APIs.
+
+Each sample runs in a fresh interpreter: import app, create_app() with
+the default configuration (PRELOAD_MODELS and the other settings unset,
+as a plain `gunicorn 'app:create_app()'` worker starts), then hit
+/api/auth/login and /api/history. Reports import/startup time, RSS and
+whether any part of the ML stack was imported along the way.
+
+    cd backend
+    python -m benchmarks.startup --samples 5 --output benchmarks/results/startup.json
+
+Exits with status 1 if torch, transformers, onnxruntime or numpy got
+imported or the default configuration would preload models, so it
+doubles as a regression check for lazy imports.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.run_benchmark import BACKEND_DIR, percentile
+
+HEAVY_MODULES = ('torch', 'transformers', 'onnxruntime', 'numpy')
+
+CHILD = r"""
+import json, os, sys, time
+started = time.perf_counter()
+import app as app_module
+imported = time.perf_counter()
+app = app_module.create_app()
+created = time.perf_counter()
+
+from ml.warmup import model_warmup
+
+from flask_jwt_extended import create_access_token
+from models import db, User
+with app.app_context():
+    if not db.session.get(User, 1):
+        db.session.add(User(id=1, name='bench', email='bench@example.com', password='x', role='USER'))
+        db.session.commit()
+    token = create_access_token(identity='1')
+
+client = app.test_client()
+timings = {}
+for name, call in (
+    ('login_ms', lambda: client.post('/api/auth/login', json={'email': 'nobody@example.com', 'password': 'x'})),
+    ('history_ms', lambda: client.get('/api/history', headers={'Authorization': f'Bearer {token}'})),
+):
+    t = time.perf_counter()
+    call()
+    timings[name] = (time.perf_counter() - t) * 1000
+
+rss = None
+with open('/proc/self/status') as status:
+    for line in status:
+        if line.startswith('VmRSS:'):
+            rss = int(line.split()[1]) / 1024
+
+print(json.dumps(dict(
+    import_ms=(imported - started) * 1000,
+    create_app_ms=(created - imported) * 1000,
+    rss_mb=rss,
+    heavy_modules=[m for m in HEAVY if m in sys.modules],
+    preload=model_warmup.models if model_warmup.enabled else None,
+    **timings
+)))
+"""
+
+
+def measure_once(workdir):
+    # Defaults, not a tuned environment: a default that preloads models must fail this check
+    env = {key: value for key, value in os.environ.items()
+           if key not in ('PRELOAD_MODELS', 'INFERENCE_SERVER', 'WARMUP_PASSES')}
+    env.update(DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'startup.sqlite3')}",
+               GITHUB_CACHE_DB='', LOG_LEVEL='WARNING')
+    code = f"HEAVY = {HEAVY_MODULES!r}\n" + CHILD
+    output = subprocess.check_output([sys.executable, '-c', code], cwd=BACKEND_DIR, env=env, text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Startup time / RSS of a non-ML worker")
+    parser.add_argument('--samples', type=int, default=5)
+    parser.add_argument('--output', help="optional JSON report path")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='issue-startup-')
+    samples = [measure_once(workdir) for _ in range(args.samples)]
+
+    summary = {}
+    for key in ('import_ms', 'create_app_ms', 'login_ms', 'history_ms', 'rss_mb'):
+        values = [sample[key] for sample in samples if sample.get(key) is not None]
+        summary[key] = {'p50': round(percentile(values, 50), 2), 'max': round(max(values), 2)} if values else None
+    heavy = sorted({module for sample in samples for module in sample['heavy_modules']})
+    preload = next((sample['preload'] for sample in samples if sample.get('preload')), None)
+    report = {'samples': len(samples), 'summary': summary, 'heavy_modules': heavy, 'preload': preload}
+
+    for key, stats in summary.items():
+        print(f"{key:<14} p50={stats['p50']:>8}  max={stats['max']:>8}" if stats else f"{key:<14} n/a")
+    print(f"ML stack imported: {', '.join(heavy) if heavy else 'no'}")
+    print(f"Models preloaded by default: {preload or 'no'}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    return 1 if heavy or preload else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
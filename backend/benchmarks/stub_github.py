@@ -0,0 +1,71 @@
+# backend/benchmarks/stub_github.py
+
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+
+class StubGitHubHandler(BaseHTTPRequestHandler):
+    """Serves issues, comments (Link-paginated, with ``since``) and issue lists from a corpus"""
+
+    issues = {}
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, payload, status=200, links=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if links:
+            self.send_header('Link', links)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_page(self, items, url, query):
+        per_page = int(query.get('per_page', ['30'])[0])
+        page = int(query.get('page', ['1'])[0])
+        last = max(1, (len(items) + per_page - 1) // per_page)
+
+        links = None
+        if page < last:
+            base = f"http://{self.headers['Host']}{url.path}?per_page={per_page}"
+            if 'since' in query:
+                base += f"&since={query['since'][0]}"
+            links = f'<{base}&page={page + 1}>; rel="next", <{base}&page={last}>; rel="last"'
+        self.send_json(items[(page - 1) * per_page:page * per_page], links=links)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        parts = url.path.strip('/').split('/')
+
+        # /repos/<owner>/<repo>/issues[/<n>[/comments]]
+        if len(parts) < 4 or parts[0] != 'repos' or parts[3] != 'issues':
+            return self.send_json({'message': 'Not Found'}, 404)
+
+        if len(parts) == 4:
+            return self.send_page([issue for issue, _ in self.issues.values()], url, query)
+
+        try:
+            issue, comments = self.issues[int(parts[4])]
+        except (ValueError, KeyError):
+            return self.send_json({'message': 'Not Found'}, 404)
+
+        if len(parts) == 6 and parts[5] == 'comments':
+            since = query.get('since', [None])[0]
+            if since:
+                comments = [c for c in comments if c['updated_at'] >= since]
+            return self.send_page(comments, url, query)
+        return self.send_json(issue)
+
+
+def start_stub_server(issues, host='127.0.0.1', port=0):
+    """Start the stub in a daemon thread; returns (server, base_url)"""
+    handler = type('CorpusHandler', (StubGitHubHandler,), {'issues': issues})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='stub-github', daemon=True).start()
+    return server, f"http://{host}:{server.server_port}"
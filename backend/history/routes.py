@@ -2,16 +2,19 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from flask_cors import cross_origin
-from models import db, ClassificationHistory, User
-from sqlalchemy import desc
+from models import db, ClassificationHistory, ClassificationResult, ClassificationStat, User
+from sqlalchemy import desc, func
+from datetime import date, datetime, time, timedelta
 import traceback
 import json
+from utils.metrics import HISTORY_SECONDS
 
 history_bp = Blueprint('history', __name__)
 
 @history_bp.route('/history', methods=['GET'])
 @cross_origin()
 @jwt_required()
+@HISTORY_SECONDS.time(route='list')
 def get_history():
     """Get classification history for authenticated user"""
     try:
@@ -19,12 +22,13 @@ def get_history():
         if not user_id:
             return jsonify({"error": "Invalid token or user not found"}), 401
         
-        # Get pagination parameters
-        page = request.args.get('page', 1, type=int)
+        # Get pagination parameters (?cursor= keyset paging; ?page= kept for older clients)
+        page = request.args.get('page', type=int)
+        cursor = request.args.get('cursor')
         per_page = min(request.args.get('per_page', 10, type=int), 100)
         
-        # Build query with filters
-        query = ClassificationHistory.query.filter_by(user_id=user_id)
+        # Build query with filters (summary columns only, results stay in the database)
+        query = ClassificationHistory.summary_query(user_id)
         
         model_name = request.args.get('model_name')
         if model_name:
@@ -38,26 +42,46 @@ def get_history():
         if status:
             query = query.filter_by(status=status)
         
-        # Execute pagination
-        pagination = query.order_by(desc(ClassificationHistory.timestamp)).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        # Histories with at least one comment classified as this label
+        prediction = request.args.get('prediction')
+        if prediction:
+            query = query.filter(ClassificationHistory.results.any(ClassificationResult.prediction == prediction))
         
-        return jsonify({
-            'history': [item.to_dict() for item in pagination.items],
-            'pagination': {
+        if page:
+            pagination = query.order_by(desc(ClassificationHistory.timestamp), desc(ClassificationHistory.id)).paginate(
+                page=page, per_page=per_page, error_out=False
+            )
+            items = pagination.items
+            pagination_info = {
                 'page': page,
                 'pages': pagination.pages,
                 'per_page': per_page,
                 'total': pagination.total,
                 'has_next': pagination.has_next,
                 'has_prev': pagination.has_prev
-            },
+            }
+        else:
+            try:
+                items, next_cursor = ClassificationHistory.keyset_page(query, cursor, per_page)
+            except ValueError:
+                return jsonify({"error": "Invalid cursor"}), 400
+            pagination_info = {
+                'per_page': per_page,
+                'cursor': cursor,
+                'next_cursor': next_cursor,
+                'has_next': next_cursor is not None,
+                'has_prev': bool(cursor)
+            }
+        
+        return jsonify({
+            'history': [item.summary_dict() for item in items],
+            'pagination': pagination_info,
             'user_id': user_id,
             'filters_applied': {
                 'model_name': model_name,
                 'model_type': model_type,
-                'status': status
+                'status': status,
+                'prediction': prediction
             }
         }), 200
         
@@ -67,6 +91,7 @@ def get_history():
 @history_bp.route('/history/<int:history_id>', methods=['GET'])
 @cross_origin()
 @jwt_required()
+@HISTORY_SECONDS.time(route='detail')
 def get_history_detail(history_id):
     """Get specific history item details"""
     try:
@@ -89,6 +114,7 @@ def get_history_detail(history_id):
 @history_bp.route('/history/<int:history_id>/update', methods=['PUT'])
 @cross_origin()
 @jwt_required()
+@HISTORY_SECONDS.time(route='update')
 def update_predictions(history_id):
     """Update predictions in classification history"""
     try:
@@ -107,10 +133,20 @@ def update_predictions(history_id):
         if not history_item:
             return jsonify({"error": "History item not found"}), 404
         
-        # Convert predictions to JSON string for database storage
-        predictions_json = json.dumps(data['predictions'], ensure_ascii=False)
-        history_item.results_json = predictions_json
-        history_item.result_count = len(data['predictions'])
+        predictions = data['predictions']
+        before = ClassificationStat.tally(history_item)
+        rows = history_item.results
+        if len(rows) == len(predictions):
+            # Same comments: only relabel the rows that changed
+            for row, item in zip(rows, predictions):
+                label = item.get('prediction') or item.get('top_prediction') or item.get('label')
+                if label and label != row.prediction:
+                    row.prediction = label
+                    row.edited = True
+            history_item.refresh_mirror()
+        else:
+            history_item.set_results(predictions)
+        ClassificationStat.replace(user_id, before, history_item)
         
         db.session.commit()
         
@@ -129,6 +165,7 @@ def update_predictions(history_id):
 @history_bp.route('/history/<int:history_id>', methods=['DELETE'])
 @cross_origin()
 @jwt_required()
+@HISTORY_SECONDS.time(route='delete')
 def delete_history_item(history_id):
     """Delete specific history item"""
     try:
@@ -143,6 +180,7 @@ def delete_history_item(history_id):
         if not history_item:
             return jsonify({"error": "History item not found"}), 404
         
+        ClassificationStat.apply(user_id, ClassificationStat.tally(history_item), -1)
         db.session.delete(history_item)
         db.session.commit()
         
@@ -155,6 +193,7 @@ def delete_history_item(history_id):
 @history_bp.route('/history/clear', methods=['DELETE'])
 @cross_origin()
 @jwt_required()
+@HISTORY_SECONDS.time(route='clear')
 def clear_history():
     """Clear all classification history for current user"""
     try:
@@ -162,7 +201,12 @@ def clear_history():
         if not user_id:
             return jsonify({"error": "Invalid token"}), 401
         
+        history_ids = db.session.query(ClassificationHistory.id).filter_by(user_id=user_id)
+        ClassificationResult.query.filter(ClassificationResult.history_id.in_(history_ids)).delete(
+            synchronize_session=False
+        )
         deleted_count = ClassificationHistory.query.filter_by(user_id=user_id).delete()
+        ClassificationStat.query.filter_by(user_id=user_id).delete()
         db.session.commit()
         
         return jsonify({
@@ -173,4 +217,174 @@ def clear_history():
         
     except Exception as e:
         db.session.rollback()
-        return jsonify({"error": f"Failed to clear history: {str(e)}"}), 500
\ No newline at end of file
+        return jsonify({"error": f"Failed to clear history: {str(e)}"}), 500
+
+@history_bp.route('/history/results', methods=['GET'])
+@cross_origin()
+@jwt_required()
+@HISTORY_SECONDS.time(route='results')
+def search_results():
+    """Classified comments across the user's histories, e.g. all NFR comments of one model"""
+    try:
+        user_id = get_jwt_identity()
+        if not user_id:
+            return jsonify({"error": "Invalid token"}), 401
+        
+        page = request.args.get('page', 1, type=int)
+        per_page = min(request.args.get('per_page', 50, type=int), 500)
+        
+        query = db.session.query(ClassificationResult, ClassificationHistory.issue_url).join(
+            ClassificationHistory, ClassificationResult.history_id == ClassificationHistory.id
+        ).filter(ClassificationHistory.user_id == user_id)
+        
+        model_name = request.args.get('model_name')
+        if model_name:
+            query = query.filter(ClassificationResult.model_name == model_name)
+        
+        prediction = request.args.get('prediction')
+        if prediction:
+            query = query.filter(ClassificationResult.prediction == prediction)
+        
+        total = query.count()
+        rows = query.order_by(desc(ClassificationResult.history_id), ClassificationResult.position).offset(
+            (page - 1) * per_page
+        ).limit(per_page).all()
+        
+        results = []
+        for row, issue_url in rows:
+            item = row.to_dict()
+            item.update({'history_id': row.history_id, 'model_name': row.model_name, 'issue_url': issue_url})
+            results.append(item)
+        
+        return jsonify({
+            'results': results,
+            'pagination': {
+                'page': page,
+                'per_page': per_page,
+                'total': total,
+                'has_next': page * per_page < total,
+                'has_prev': page > 1
+            },
+            'filters_applied': {'model_name': model_name, 'prediction': prediction}
+        }), 200
+        
+    except Exception as e:
+        return jsonify({"error": f"Failed to search results: {str(e)}"}), 500
+
+def summarize_labels(rows):
+    """{comments, avg_confidence, labels: {label: {count, share, avg_confidence}}} from (label, count, sum) rows"""
+    labels = {}
+    for prediction, count, confidence_sum in rows:
+        if not count:
+            continue
+        entry = labels.setdefault(prediction, [0, 0.0])
+        entry[0] += count
+        entry[1] += confidence_sum or 0.0
+    comments = sum(count for count, _ in labels.values())
+    confidence_total = sum(confidence_sum for _, confidence_sum in labels.values())
+    return {
+        'comments': comments,
+        'avg_confidence': round(confidence_total / comments, 3) if comments else None,
+        'labels': {
+            prediction: {
+                'count': count,
+                'share': round(count / comments, 3),
+                'avg_confidence': round(confidence_sum / count, 3)
+            }
+            for prediction, (count, confidence_sum) in sorted(labels.items())
+        }
+    }
+
+def bucket_key(day, bucket):
+    if bucket == 'month':
+        return day.strftime('%Y-%m')
+    if bucket == 'week':
+        return (day - timedelta(days=day.weekday())).isoformat()  # Monday of the ISO week
+    return day.isoformat()
+
+@history_bp.route('/history/stats', methods=['GET'])
+@cross_origin()
+@jwt_required()
+@HISTORY_SECONDS.time(route='stats')
+def get_history_stats():
+    """Label distribution per model, repository and time bucket, from the summary counters"""
+    try:
+        user_id = get_jwt_identity()
+        if not user_id:
+            return jsonify({"error": "Invalid token"}), 401
+        
+        bucket = request.args.get('bucket', 'day')
+        if bucket not in ('day', 'week', 'month'):
+            return jsonify({"error": "bucket must be day, week or month"}), 400
+        try:
+            since = date.fromisoformat(request.args['since']) if request.args.get('since') else None
+            until = date.fromisoformat(request.args['until']) if request.args.get('until') else None
+        except ValueError:
+            return jsonify({"error": "since/until must be YYYY-MM-DD"}), 400
+        
+        model_name = request.args.get('model_name')
+        repository = request.args.get('repository')
+        
+        comments = func.sum(ClassificationStat.comment_count)
+        confidence = func.sum(ClassificationStat.confidence_sum)
+        
+        def grouped(*columns):
+            query = db.session.query(*columns, ClassificationStat.prediction, comments, confidence).filter(
+                ClassificationStat.user_id == user_id
+            )
+            if model_name:
+                query = query.filter(ClassificationStat.model_name == model_name)
+            if repository:
+                query = query.filter(ClassificationStat.repository == repository)
+            if since:
+                query = query.filter(ClassificationStat.day >= since)
+            if until:
+                query = query.filter(ClassificationStat.day <= until)
+            return query.group_by(*columns, ClassificationStat.prediction).all()
+        
+        def by(column):
+            groups = {}
+            for row in grouped(column):
+                groups.setdefault(row[0], []).append(row[1:])
+            return {key: summarize_labels(rows) for key, rows in groups.items()}
+        
+        # Days are rolled up into weeks/months here; at most one row per day and label
+        buckets = {}
+        for day, prediction, count, confidence_sum in grouped(ClassificationStat.day):
+            buckets.setdefault(bucket_key(day, bucket), []).append((prediction, count, confidence_sum))
+        
+        # Histories per model (index-only count on classification_history)
+        history_query = db.session.query(ClassificationHistory.model_name, func.count(ClassificationHistory.id)).filter(
+            ClassificationHistory.user_id == user_id
+        )
+        if model_name:
+            history_query = history_query.filter(ClassificationHistory.model_name == model_name)
+        if since:
+            history_query = history_query.filter(ClassificationHistory.timestamp >= datetime.combine(since, time.min))
+        if until:
+            history_query = history_query.filter(ClassificationHistory.timestamp <= datetime.combine(until, time.max))
+        histories = dict(history_query.group_by(ClassificationHistory.model_name).all())
+        
+        by_model = by(ClassificationStat.model_name)
+        for name, summary in by_model.items():
+            summary['histories'] = histories.get(name, 0)
+        
+        totals = summarize_labels(grouped())
+        totals['histories'] = sum(histories.values()) if not repository else None
+        
+        return jsonify({
+            'totals': totals,
+            'by_model': by_model,
+            'by_repository': by(ClassificationStat.repository),
+            'by_time': [dict(summarize_labels(rows), bucket=key) for key, rows in sorted(buckets.items())],
+            'bucket': bucket,
+            'filters_applied': {
+                'model_name': model_name,
+                'repository': repository,
+                'since': since.isoformat() if since else None,
+                'until': until.isoformat() if until else None
+            }
+        }), 200
+        
+    except Exception as e:
+        return jsonify({"error": f"Failed to get history stats: {str(e)}"}), 500
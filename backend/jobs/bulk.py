@@ -0,0 +1,240 @@
+#backend/jobs/bulk.py
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from jobs.lease import claim, heartbeat, owned, requeue_stale, DEFAULT_LEASE_SECONDS
+from models import db, BulkJob, BulkJobIssue, ClassificationHistory, ClassificationStat
+from utils.github_api import GitHubClient, GitHubError
+
+BULK_CHUNK_SIZE = 20
+FETCH_WORKERS = 4
+ACTIVE_STATUSES = ('queued', 'running', 'cancelling')
+RESUMABLE_STATUSES = ('cancelled', 'failed', 'completed')
+
+_runners = {}
+_runners_lock = threading.Lock()
+
+
+def list_repo_issues(client, repo, filters):
+    """Enumerate issues (not pull requests) of owner/repo matching the job filters"""
+    params = {'state': filters.get('state') or 'all', 'direction': 'asc'}
+    if filters.get('labels'):
+        labels = filters['labels']
+        params['labels'] = ','.join(labels) if isinstance(labels, list) else labels
+    if filters.get('since'):
+        params['since'] = filters['since']
+
+    items = client.fetch_all_pages(f"{client.base_url}/repos/{repo}/issues", params)
+    if items is None:
+        raise RuntimeError(f"Failed to list issues of {repo}")
+
+    created_after = filters.get('created_after')
+    created_before = filters.get('created_before')
+    issues = []
+    for item in items:
+        if 'pull_request' in item:
+            continue
+        created = (item.get('created_at') or '')[:10]
+        if created_after and created < created_after:
+            continue
+        if created_before and created > created_before:
+            continue
+        issues.append(item)
+    return issues
+
+
+def enumerate_issues(job, client):
+    """Store the job's issue list once so a restarted job never lists or reclassifies again"""
+    issues = list_repo_issues(client, job.repo, job.filters)
+    known = {row.issue_number for row in job.issues.with_entities(BulkJobIssue.issue_number)}
+
+    for item in issues:
+        number = str(item.get('number'))
+        if number in known:
+            continue
+        db.session.add(BulkJobIssue(
+            job_id=job.id,
+            issue_number=number,
+            issue_url=item.get('html_url') or f"https://github.com/{job.repo}/issues/{number}",
+            issue_title=item.get('title')
+        ))
+
+    db.session.flush()
+    job.total_issues = job.issues.count()
+    job.enumerated = True
+    db.session.commit()
+    print(f"📋 Bulk job {job.id}: {job.total_issues} issues in {job.repo}")
+
+
+def process_chunk(job, rows, client, loaded):
+    """Fetch, classify and store one chunk of issues; one commit per chunk"""
+    from ml.routes import build_comments_data
+    from ml.inference import classify_texts, build_result_rows, DEFAULT_BATCH_SIZE, DEFAULT_TOKEN_BUDGET
+    from ml.cache import prediction_cache
+
+    owner, repo = job.repo.split('/', 1)
+    numbers = [row.issue_number for row in rows]
+    def fetch(number):
+        try:
+            return client.fetch_issue_with_comments(owner, repo, number)
+        except GitHubError as e:
+            # Marked failed (retried when the job is resumed) rather than stored with missing comments
+            print(f"⚠️ Bulk job {job.id}: issue #{number}: {e}")
+            return None, None
+
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        fetched = list(pool.map(fetch, numbers))
+
+    # All comments of the chunk go through the batched classifier together
+    texts, spans = [], []
+    for row, (issue_data, comments) in zip(rows, fetched):
+        comments_data = build_comments_data(issue_data, comments) if issue_data else None
+        spans.append((len(texts), comments_data))
+        texts.extend(c['text'] for c in comments_data or [])
+
+    predictions, _ = classify_texts(
+        loaded, texts,
+        current_app.config.get('INFERENCE_BATCH_SIZE', DEFAULT_BATCH_SIZE),
+        current_app.config.get('INFERENCE_TOKEN_BUDGET', DEFAULT_TOKEN_BUDGET),
+        cache=prediction_cache
+    )
+
+    for row, (issue_data, _), (offset, comments_data) in zip(rows, fetched, spans):
+        if comments_data is None:
+            row.status = 'failed'
+            job.failed_issues += 1
+            continue
+
+        result = build_result_rows(comments_data, predictions[offset:offset + len(comments_data)], row.issue_number)
+        row.comment_count = len(result)
+        row.issue_title = issue_data.get('title', row.issue_title)
+        if result:
+            history = ClassificationHistory(
+                user_id=job.user_id,
+                model_name=job.model_name,
+                model_type='system',
+                source_type='github',
+                issue_url=row.issue_url,
+                issue_title=row.issue_title,
+                issue_number=row.issue_number,
+                status='completed'
+            )
+            history.set_results(result)
+            db.session.add(history)
+            ClassificationStat.apply(job.user_id, ClassificationStat.tally(history))
+            db.session.flush()
+            row.history_id = history.id
+        row.status = 'done'
+        job.classified_comments += len(result)
+
+    job.processed_issues += len(rows)
+    db.session.commit()
+
+
+def retry_failed_issues(job_id):
+    """Put a job's failed issues back in the queue and take them out of its progress; returns how many"""
+    retried = BulkJobIssue.query.filter_by(job_id=job_id, status='failed').update(
+        {BulkJobIssue.status: 'pending'}, synchronize_session=False)
+    if retried:
+        BulkJob.query.filter_by(id=job_id).update({
+            BulkJob.failed_issues: BulkJob.failed_issues - retried,
+            BulkJob.processed_issues: BulkJob.processed_issues - retried,
+        }, synchronize_session=False)
+    return retried
+
+
+def run_bulk_job(job_id, chunk_size=BULK_CHUNK_SIZE):
+    """Run (or resume) a bulk job until it completes or is cancelled"""
+    from ml.routes import get_github_token, get_loaded_model
+
+    # Only the process that wins the queued -> running claim runs the job
+    if not claim(BulkJob, job_id):
+        return
+    job = db.session.get(BulkJob, job_id)
+    db.session.refresh(job)
+    job.error = None
+    db.session.commit()
+
+    client = GitHubClient(get_github_token())
+    if not job.enumerated:
+        enumerate_issues(job, client)
+
+    loaded = get_loaded_model(job.model_name)
+
+    while True:
+        # Renew the lease before every chunk; stop if another process took the job over
+        if not heartbeat(BulkJob, job.id):
+            print(f"⚠️ Bulk job {job.id}: lease lost, stopping")
+            return
+        db.session.refresh(job)
+        if job.status == 'cancelling':
+            job.status = 'cancelled'
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+            print(f"🛑 Bulk job {job.id} cancelled at {job.processed_issues}/{job.total_issues}")
+            return
+
+        rows = job.issues.filter_by(status='pending').order_by(BulkJobIssue.id).limit(chunk_size).all()
+        if not rows:
+            break
+        process_chunk(job, rows, client, loaded)
+        print(f"📊 Bulk job {job.id}: {job.processed_issues}/{job.total_issues} issues")
+
+    owned(BulkJob, job.id).update({BulkJob.status: 'completed', BulkJob.finished_at: datetime.utcnow()},
+                                  synchronize_session=False)
+    db.session.commit()
+    print(f"✅ Bulk job {job.id} completed: {job.classified_comments} comments")
+
+
+def _runner(app, job_id):
+    with app.app_context():
+        try:
+            run_bulk_job(job_id, app.config.get('BULK_CHUNK_SIZE', BULK_CHUNK_SIZE))
+        except Exception as e:
+            print(f"❌ Bulk job {job_id} failed: {e}")
+            traceback.print_exc()
+            db.session.rollback()
+            owned(BulkJob, job_id).update({
+                BulkJob.status: 'failed',
+                BulkJob.error: str(e),
+                BulkJob.finished_at: datetime.utcnow(),
+            }, synchronize_session=False)
+            db.session.commit()
+        finally:
+            db.session.remove()
+            with _runners_lock:
+                _runners.pop(job_id, None)
+
+
+def start_bulk_job(app, job_id):
+    """Run a job in a background thread unless it is already running in this process"""
+    with _runners_lock:
+        thread = _runners.get(job_id)
+        if thread is not None and thread.is_alive():
+            return False
+        thread = threading.Thread(target=_runner, args=(app, job_id), name=f"bulk-job-{job_id}", daemon=True)
+        _runners[job_id] = thread
+        thread.start()
+        return True
+
+
+def resume_bulk_jobs(app, lease_seconds=DEFAULT_LEASE_SECONDS):
+    """Re-queue jobs whose owner stopped heartbeating and start every queued job (each runs once: claim)"""
+    cutoff = datetime.utcnow() - timedelta(seconds=lease_seconds)
+    BulkJob.query.filter(
+        BulkJob.status == 'cancelling',
+        db.or_(BulkJob.heartbeat.is_(None), BulkJob.heartbeat < cutoff)
+    ).update({BulkJob.status: 'cancelled', BulkJob.owner: None, BulkJob.finished_at: datetime.utcnow()},
+             synchronize_session=False)
+    db.session.commit()
+
+    requeued = requeue_stale(BulkJob, lease_seconds)
+    if requeued:
+        print(f"🔄 Re-queued {requeued} stale bulk job(s)")
+
+    for (job_id,) in db.session.query(BulkJob.id).filter_by(status='queued').all():
+        start_bulk_job(app, job_id)
@@ -0,0 +1,106 @@
+#backend/jobs/lease.py
+"""
+Job ownership shared by bulk and async prediction jobs. Every gunicorn
+worker (and every host) may try to run the same job, so a job only runs
+after an atomic queued -> running claim, and the owner keeps a heartbeat.
+Jobs whose heartbeat went stale (owner crashed or was killed) are put
+back in the queue and claimed again by exactly one process.
+"""
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from models import db
+
+DEFAULT_LEASE_SECONDS = 300
+
+# One id per process; a forked worker gets its own on first use
+_owner = {'pid': None, 'id': None}
+
+
+def owner_id():
+    if _owner['pid'] != os.getpid():
+        _owner['pid'] = os.getpid()
+        _owner['id'] = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    return _owner['id']
+
+
+def claim(model, job_id, statuses=('queued',)):
+    """Atomically take a job (UPDATE ... WHERE status IN statuses); True if this process owns it now"""
+    now = datetime.utcnow()
+    claimed = model.query.filter(model.id == job_id, model.status.in_(statuses)).update({
+        model.status: 'running',
+        model.owner: owner_id(),
+        model.heartbeat: now,
+    }, synchronize_session=False)
+    db.session.commit()
+    return claimed == 1
+
+
+def heartbeat(model, job_id):
+    """Renew the lease; False if another process took the job over"""
+    renewed = model.query.filter(model.id == job_id, model.owner == owner_id()).update({
+        model.heartbeat: datetime.utcnow(),
+    }, synchronize_session=False)
+    db.session.commit()
+    return renewed == 1
+
+
+class KeepAlive:
+    """
+    Renew a job's heartbeat from a background thread while one long step
+    runs (e.g. a whole /predict pipeline), so the job is not taken for
+    stale and run a second time by another process. Renews every third of
+    the lease and stops once the lease is lost.
+    """
+
+    def __init__(self, model, job_id, lease_seconds=DEFAULT_LEASE_SECONDS):
+        self.model = model
+        self.job_id = job_id
+        self.interval = lease_seconds / 3
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        app = current_app._get_current_object()
+        self._thread = threading.Thread(target=self._run, args=(app,), daemon=True,
+                                        name=f"heartbeat-{self.job_id}")
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+    def _run(self, app):
+        # Own app context, so the renewals use their own session
+        with app.app_context():
+            try:
+                while not self._stop.wait(self.interval):
+                    if not heartbeat(self.model, self.job_id):
+                        break
+            except Exception as e:
+                print(f"⚠️ Heartbeat for job {self.job_id} failed: {e}")
+            finally:
+                db.session.remove()
+
+
+def owned(model, job_id):
+    """Filter for updates that must only apply while this process holds the job"""
+    return model.query.filter(model.id == job_id, model.owner == owner_id())
+
+
+def requeue_stale(model, lease_seconds=DEFAULT_LEASE_SECONDS, statuses=('running',)):
+    """Put jobs whose owner stopped heartbeating back in the queue; returns how many"""
+    cutoff = datetime.utcnow() - timedelta(seconds=lease_seconds)
+    requeued = model.query.filter(
+        model.status.in_(statuses),
+        db.or_(model.heartbeat.is_(None), model.heartbeat < cutoff)
+    ).update({model.status: 'queued', model.owner: None}, synchronize_session=False)
+    db.session.commit()
+    return requeued
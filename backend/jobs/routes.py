@@ -0,0 +1,152 @@
+#backend/jobs/routes.py
+import json
+import re
+from datetime import datetime
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_cors import cross_origin
+from models import db, BulkJob
+from sqlalchemy import desc
+from jobs.bulk import start_bulk_job, retry_failed_issues, ACTIVE_STATUSES, RESUMABLE_STATUSES
+
+jobs_bp = Blueprint('jobs', __name__)
+
+REPO_PATTERN = re.compile(r'^[A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+$')
+ISSUE_STATES = ('open', 'closed', 'all')
+
+@jobs_bp.route('/bulk', methods=['POST'])
+@cross_origin()
+@jwt_required()
+def create_bulk_job():
+    """Classify every issue of a repository (optionally filtered by state, labels and dates)"""
+    try:
+        user_id = get_jwt_identity()
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "No data provided"}), 400
+
+        repo = (data.get('repo') or '').strip().strip('/')
+        model_name = data.get('model_name') or data.get('model')
+        if not REPO_PATTERN.match(repo) or not model_name:
+            return jsonify({"error": "repo (owner/repo) and model_name required"}), 400
+        from ml.routes import is_registered_model
+        if not is_registered_model(model_name):
+            return jsonify({"error": f"Unknown model: {model_name}"}), 404
+
+        state = data.get('state', 'all')
+        if state not in ISSUE_STATES:
+            return jsonify({"error": f"state must be one of {', '.join(ISSUE_STATES)}"}), 400
+
+        filters = {
+            'state': state,
+            'labels': data.get('labels'),
+            'since': data.get('since'),
+            'created_after': data.get('created_after'),
+            'created_before': data.get('created_before'),
+        }
+
+        job = BulkJob(
+            user_id=user_id,
+            repo=repo,
+            model_name=model_name,
+            filters_json=json.dumps({k: v for k, v in filters.items() if v}),
+            status='queued'
+        )
+        db.session.add(job)
+        db.session.commit()
+
+        start_bulk_job(current_app._get_current_object(), job.id)
+
+        return jsonify({"message": "Bulk job started", "job": job.to_dict()}), 202
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error creating bulk job: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@jobs_bp.route('/bulk', methods=['GET'])
+@cross_origin()
+@jwt_required()
+def list_bulk_jobs():
+    """List bulk jobs of the current user"""
+    try:
+        user_id = get_jwt_identity()
+        jobs = BulkJob.query.filter_by(user_id=user_id).order_by(desc(BulkJob.created_at)).all()
+        return jsonify({"jobs": [job.to_dict() for job in jobs], "total": len(jobs)}), 200
+
+    except Exception as e:
+        return jsonify({"error": f"Failed to list bulk jobs: {str(e)}"}), 500
+
+@jobs_bp.route('/bulk/<int:job_id>', methods=['GET'])
+@cross_origin()
+@jwt_required()
+def get_bulk_job(job_id):
+    """Get progress of a bulk job"""
+    try:
+        user_id = get_jwt_identity()
+        job = BulkJob.query.filter_by(id=job_id, user_id=user_id).first()
+        if not job:
+            return jsonify({"error": "Bulk job not found"}), 404
+
+        return jsonify(job.to_dict()), 200
+
+    except Exception as e:
+        return jsonify({"error": f"Failed to get bulk job: {str(e)}"}), 500
+
+@jobs_bp.route('/bulk/<int:job_id>/cancel', methods=['POST'])
+@cross_origin()
+@jwt_required()
+def cancel_bulk_job(job_id):
+    """Ask a running bulk job to stop after its current chunk"""
+    try:
+        user_id = get_jwt_identity()
+        job = BulkJob.query.filter_by(id=job_id, user_id=user_id).first()
+        if not job:
+            return jsonify({"error": "Bulk job not found"}), 404
+
+        if job.status not in ACTIVE_STATUSES:
+            return jsonify({"error": f"Bulk job is already {job.status}"}), 400
+
+        # A job nobody has claimed yet is cancelled right away, a running one stops after its chunk
+        if not BulkJob.query.filter_by(id=job.id, status='queued').update(
+                {BulkJob.status: 'cancelled', BulkJob.finished_at: datetime.utcnow()}, synchronize_session=False):
+            BulkJob.query.filter_by(id=job.id, status='running').update(
+                {BulkJob.status: 'cancelling'}, synchronize_session=False)
+        db.session.commit()
+        db.session.refresh(job)
+
+        return jsonify({"message": "Cancellation requested", "job": job.to_dict()}), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": f"Failed to cancel bulk job: {str(e)}"}), 500
+
+@jobs_bp.route('/bulk/<int:job_id>/resume', methods=['POST'])
+@cross_origin()
+@jwt_required()
+def resume_bulk_job(job_id):
+    """Continue a cancelled, failed or partly failed job: unfinished issues plus the ones that failed"""
+    try:
+        user_id = get_jwt_identity()
+        job = BulkJob.query.filter_by(id=job_id, user_id=user_id).first()
+        if not job:
+            return jsonify({"error": "Bulk job not found"}), 404
+
+        if job.status not in RESUMABLE_STATUSES or (job.status == 'completed' and not job.failed_issues):
+            return jsonify({"error": f"Bulk job is {job.status}"}), 400
+
+        if not BulkJob.query.filter(BulkJob.id == job.id, BulkJob.status.in_(RESUMABLE_STATUSES)).update(
+                {BulkJob.status: 'queued', BulkJob.finished_at: None}, synchronize_session=False):
+            db.session.rollback()
+            return jsonify({"error": "Bulk job was resumed by another request"}), 409
+        retried = retry_failed_issues(job.id)
+        db.session.commit()
+        db.session.refresh(job)
+
+        start_bulk_job(current_app._get_current_object(), job.id)
+
+        return jsonify({"message": "Bulk job resumed", "retried_issues": retried, "job": job.to_dict()}), 202
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": f"Failed to resume bulk job: {str(e)}"}), 500
@@ -0,0 +1,58 @@
+#backend/jobs/runner.py
+"""
+Resumes interrupted bulk and async prediction jobs. Web workers only run
+the jobs they create; recovery runs once, in its own process:
+
+    cd backend
+    python -m jobs.runner              # keeps sweeping every JOB_LEASE_SECONDS / 2
+    python -m jobs.runner --once
+
+Jobs are claimed atomically (jobs/lease.py), so a job whose owner is still
+heartbeating is never taken over and a requeued job runs exactly once.
+"""
+import argparse
+import time
+
+from dotenv import load_dotenv
+
+
+def resume_jobs(app):
+    """Requeue stale jobs and start every queued one in this process"""
+    from jobs.bulk import resume_bulk_jobs
+    from jobs.worker import resume_prediction_jobs
+
+    lease_seconds = app.config['JOB_LEASE_SECONDS']
+    with app.app_context():
+        if app.config['BULK_RESUME_ON_STARTUP']:
+            resume_bulk_jobs(app, lease_seconds)
+        resume_prediction_jobs(app, lease_seconds)
+
+
+def main(argv=None):
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Resume interrupted bulk/prediction jobs")
+    parser.add_argument('--once', action='store_true', help="sweep once and wait for the started jobs")
+    args = parser.parse_args(argv)
+
+    from app import create_app
+    app = create_app()
+    interval = max(1, app.config['JOB_LEASE_SECONDS'] // 2)
+    print(f"🔁 Job runner sweeping every {interval}s")
+    try:
+        while True:
+            resume_jobs(app)
+            if args.once:
+                break
+            time.sleep(interval)
+        # Started jobs run in daemon threads; keep the process alive until they finish
+        from jobs.bulk import _runners
+        from jobs.worker import prediction_workers
+        prediction_workers.shutdown()
+        while any(thread.is_alive() for thread in list(_runners.values())):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
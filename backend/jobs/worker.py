@@ -0,0 +1,108 @@
+#backend/jobs/worker.py
+import json
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from flask import current_app
+
+from jobs.lease import KeepAlive, claim, owned, requeue_stale, DEFAULT_LEASE_SECONDS
+from models import db, PredictionJob
+from utils.instrumentation import get_logger, traced
+
+logger = get_logger('jobs')
+
+DEFAULT_WORKERS = 2
+
+
+class PredictionWorkerPool:
+    """
+    Local worker threads running the fetch + classify pipeline for async
+    /predict jobs. Job state lives in the prediction_job table, so no
+    external broker is needed and queued jobs survive a restart.
+    """
+
+    def __init__(self, max_workers=DEFAULT_WORKERS):
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def configure(self, max_workers=None):
+        if max_workers:
+            self.max_workers = max_workers
+
+    def submit(self, app, job_id):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='predict-worker')
+            return self._executor.submit(self._run, app, job_id)
+
+    def shutdown(self):
+        """Wait for submitted jobs to finish"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _run(self, app, job_id):
+        with app.app_context():
+            try:
+                run_prediction_job(job_id)
+            except Exception as e:
+                print(f"❌ Prediction job {job_id} crashed: {e}")
+                traceback.print_exc()
+                db.session.rollback()
+            finally:
+                db.session.remove()
+
+
+def run_prediction_job(job_id):
+    """Execute one queued job and store its payload (or error) in the database"""
+    from ml.routes import classify_issue, PredictionError
+
+    # Only the process that wins the queued -> running claim runs the job
+    if not claim(PredictionJob, job_id):
+        return
+    job = db.session.get(PredictionJob, job_id)
+    db.session.refresh(job)
+    job.started_at = datetime.utcnow()
+    db.session.commit()
+
+    with traced('predict_job', job_id=job.id) as trace:
+        outcome = {PredictionJob.result_json: None, PredictionJob.error: None}
+        lease_seconds = current_app.config.get('JOB_LEASE_SECONDS', DEFAULT_LEASE_SECONDS)
+        try:
+            # The heartbeat is renewed in the background for as long as the pipeline runs
+            with KeepAlive(PredictionJob, job_id, lease_seconds):
+                payload = classify_issue(job.model_name, job.issue_url)
+            with trace.stage('serialize'):
+                outcome[PredictionJob.result_json] = json.dumps(payload, ensure_ascii=False)
+            outcome[PredictionJob.status] = 'completed'
+        except PredictionError as e:
+            outcome[PredictionJob.error] = e.message
+            outcome[PredictionJob.status] = 'failed'
+        except Exception as e:
+            logger.exception(f"Prediction job {job_id} failed: {e}")
+            db.session.rollback()
+            outcome[PredictionJob.error] = str(e)
+            outcome[PredictionJob.status] = 'failed'
+
+        # Written only while we still hold the lease
+        outcome[PredictionJob.finished_at] = datetime.utcnow()
+        stored = owned(PredictionJob, job_id).update(outcome, synchronize_session=False)
+        db.session.commit()
+        trace.finish(logger, status=outcome[PredictionJob.status] if stored else 'lease_lost')
+
+
+def resume_prediction_jobs(app, lease_seconds=DEFAULT_LEASE_SECONDS):
+    """Re-queue jobs whose owner stopped heartbeating and hand every queued job to the pool"""
+    requeued = requeue_stale(PredictionJob, lease_seconds)
+    if requeued:
+        print(f"🔄 Re-queued {requeued} stale prediction job(s)")
+
+    for (job_id,) in db.session.query(PredictionJob.id).filter_by(status='queued').all():
+        prediction_workers.submit(app, job_id)
+
+
+prediction_workers = PredictionWorkerPool()
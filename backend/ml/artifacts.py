@@ -0,0 +1,145 @@
+#backend/ml/artifacts.py
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+
+MANIFEST = 'manifest.json'
+TMP_MARKER = '.tmp-'
+
+
+class ArtifactStore:
+    """
+    Local copies of the registered models (safetensors weights + tokenizer
+    and config files), downloaded and checksummed once when an admin adds a
+    model. Loading from the store never touches the network and transformers
+    memory-maps the safetensors weights instead of unpickling them.
+    By default (``offline``) models missing from the store fail to load
+    instead of falling back to the Hugging Face hub.
+    """
+
+    def __init__(self, root='model_store', offline=True):
+        self.root = root
+        self.offline = offline
+        self._lock = threading.Lock()
+
+    def configure(self, root=None, offline=None):
+        if root:
+            self.root = root
+        if offline is not None:
+            self.offline = offline
+
+    def model_dir(self, model_name):
+        return os.path.join(self.root, re.sub(r'[^A-Za-z0-9_.-]+', '--', model_name))
+
+    def has(self, model_name):
+        return os.path.exists(os.path.join(self.model_dir(model_name), MANIFEST))
+
+    def manifest(self, model_name):
+        try:
+            with open(os.path.join(self.model_dir(model_name), MANIFEST)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def source(self, model_name):
+        """Where from_pretrained() should read a model: (path or hub name, extra kwargs)"""
+        if self.has(model_name):
+            return self.model_dir(model_name), {'local_files_only': True, 'use_safetensors': True}
+        if self.offline:
+            raise FileNotFoundError(f"{model_name} is not in the model store (set MODEL_STORE_OFFLINE=0 to allow hub downloads)")
+        return model_name, {}
+
+    def fetch(self, model_name, force=False):
+        """Download a model into the store once (re-download with ``force``); returns its manifest"""
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+        with self._lock:
+            if self.has(model_name) and not force:
+                return self.manifest(model_name)
+
+            path = self.model_dir(model_name)
+            tmp_path = f"{path}{TMP_MARKER}{os.getpid()}"
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            print(f"📦 Downloading {model_name} into the model store")
+            try:
+                tokenizer = AutoTokenizer.from_pretrained(model_name)
+                model = AutoModelForSequenceClassification.from_pretrained(model_name)
+                model.save_pretrained(tmp_path, safe_serialization=True)
+                tokenizer.save_pretrained(tmp_path)
+                del model
+
+                files = hash_files(tmp_path)
+                manifest = {
+                    'model_name': model_name,
+                    'fetched_at': time.time(),
+                    'size_bytes': sum(f['size'] for f in files.values()),
+                    'sha256': combined_checksum(files),
+                    'files': files,
+                }
+                with open(os.path.join(tmp_path, MANIFEST), 'w') as f:
+                    json.dump(manifest, f, indent=2)
+
+                shutil.rmtree(path, ignore_errors=True)
+                os.replace(tmp_path, path)
+            finally:
+                shutil.rmtree(tmp_path, ignore_errors=True)
+
+        print(f"✅ Stored {model_name}: {manifest['size_bytes'] / (1024 * 1024):.1f} MB, sha256 {manifest['sha256'][:12]}")
+        return manifest
+
+    def verify(self, model_name, expected_sha256=None):
+        """Re-hash a stored model against its manifest (and the checksum recorded in AIModel)"""
+        manifest = self.manifest(model_name)
+        if manifest is None:
+            return {'model_name': model_name, 'ok': False, 'error': 'not in the model store'}
+
+        files = hash_files(self.model_dir(model_name))
+        recorded = manifest.get('files', {})
+        report = {
+            'model_name': model_name,
+            'size_bytes': sum(f['size'] for f in files.values()),
+            'sha256': combined_checksum(files),
+            'missing': sorted(set(recorded) - set(files)),
+            'unexpected': sorted(set(files) - set(recorded)),
+            'mismatched': sorted(name for name in set(files) & set(recorded) if files[name] != recorded[name]),
+        }
+        report['ok'] = (not report['missing'] and not report['unexpected'] and not report['mismatched']
+                        and report['sha256'] == manifest.get('sha256')
+                        and (expected_sha256 is None or report['sha256'] == expected_sha256))
+        return report
+
+    def remove(self, model_name):
+        with self._lock:
+            shutil.rmtree(self.model_dir(model_name), ignore_errors=True)
+
+
+def hash_files(path, chunk_size=1024 * 1024):
+    """{relative path: {size, sha256}} for every file of a stored model except the manifest"""
+    files = {}
+    for directory, _, names in os.walk(path):
+        for name in names:
+            full = os.path.join(directory, name)
+            relative = os.path.relpath(full, path)
+            if relative == MANIFEST:
+                continue
+            digest = hashlib.sha256()
+            with open(full, 'rb') as f:
+                for chunk in iter(lambda: f.read(chunk_size), b''):
+                    digest.update(chunk)
+            files[relative] = {'size': os.path.getsize(full), 'sha256': digest.hexdigest()}
+    return files
+
+
+def combined_checksum(files):
+    """One checksum for a whole model directory (stored in AIModel.artifact_sha256)"""
+    digest = hashlib.sha256()
+    for name in sorted(files):
+        digest.update(f"{name}:{files[name]['sha256']}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+artifact_store = ArtifactStore()
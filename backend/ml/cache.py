@@ -0,0 +1,150 @@
+#backend/ml/cache.py
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+def normalize_text(text):
+    """Collapse whitespace so re-submitted comments hash the same"""
+    return " ".join((text or "").split())
+
+
+def text_hash(text):
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class PredictionCache:
+    """
+    Prediction cache keyed by (model namespace, hash of normalized comment
+    text). The namespace (LoadedModel.cache_key) includes the engine, the
+    inference mode and the checksum of the weights, so a model change misses
+    in every process; invalidate() only frees the old entries.
+
+    An in-memory LRU tier is always used; an optional SQLite file adds a
+    persistent tier shared across restarts. Values are (label, confidence).
+    """
+
+    def __init__(self, max_entries=50000, db_path=None):
+        self.max_entries = max_entries
+        self.db_path = None
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if db_path:
+            self._open_db(db_path)
+
+    def configure(self, max_entries=None, db_path=None):
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+                self._trim()
+        if db_path and db_path != self.db_path:
+            self._open_db(db_path)
+
+    def _open_db(self, db_path):
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS prediction_cache (
+                model_name TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                prediction TEXT NOT NULL,
+                confidence REAL NOT NULL,
+                PRIMARY KEY (model_name, text_hash)
+            )
+        """)
+        conn.commit()
+        with self._lock:
+            self._conn = conn
+            self.db_path = db_path
+
+    def get_many(self, model_name, texts):
+        """Return {index: (label, confidence)} for every text already cached"""
+        found = {}
+        missing = []
+        with self._lock:
+            for i, text in enumerate(texts):
+                key = (model_name, text_hash(text))
+                value = self._memory.get(key)
+                if value is not None:
+                    self._memory.move_to_end(key)
+                    found[i] = value
+                else:
+                    missing.append((i, key))
+
+            if missing and self._conn is not None:
+                for i, key in missing:
+                    row = self._conn.execute(
+                        "SELECT prediction, confidence FROM prediction_cache WHERE model_name = ? AND text_hash = ?",
+                        key
+                    ).fetchone()
+                    if row:
+                        found[i] = (row[0], row[1])
+                        self._memory[key] = found[i]
+                        self.disk_hits += 1
+                self._trim()
+
+            self.hits += len(found)
+            self.misses += len(texts) - len(found)
+        return found
+
+    def put_many(self, model_name, texts, predictions):
+        """Store (label, confidence) predictions for the given texts"""
+        rows = [(model_name, text_hash(text), label, float(confidence))
+                for text, (label, confidence) in zip(texts, predictions)]
+        with self._lock:
+            for model, digest, label, confidence in rows:
+                self._memory[(model, digest)] = (label, confidence)
+                self._memory.move_to_end((model, digest))
+            self._trim()
+            if self._conn is not None and rows:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO prediction_cache (model_name, text_hash, prediction, confidence) "
+                    "VALUES (?, ?, ?, ?)",
+                    rows
+                )
+                self._conn.commit()
+
+    def invalidate(self, model_name):
+        """Forget every cached prediction of a model, including its variants and older weights"""
+        prefixes = (f"{model_name}#", f"{model_name}@")
+        with self._lock:
+            for key in [k for k in self._memory if k[0] == model_name or k[0].startswith(prefixes)]:
+                del self._memory[key]
+            if self._conn is not None:
+                self._conn.execute(
+                    "DELETE FROM prediction_cache WHERE model_name = ? OR substr(model_name, 1, ?) IN (?, ?)",
+                    (model_name, len(prefixes[0]), *prefixes)
+                )
+                self._conn.commit()
+        print(f"🗑️ Prediction cache cleared for: {model_name}")
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            disk_entries = None
+            if self._conn is not None:
+                disk_entries = self._conn.execute("SELECT COUNT(*) FROM prediction_cache").fetchone()[0]
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'max_entries': self.max_entries,
+                'disk_entries': disk_entries,
+                'db_path': self.db_path,
+            }
+
+    def _trim(self):
+        while self.max_entries is not None and len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+
+prediction_cache = PredictionCache()
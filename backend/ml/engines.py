@@ -0,0 +1,235 @@
+#backend/ml/engines.py
+import os
+import re
+import threading
+import time
+
+
+class LoadedModel:
+    """Tokenizer/model pair held by the registry, already in eval mode (PyTorch engine)"""
+
+    engine = 'pytorch'
+    tensor_type = 'pt'
+    artifact_sha256 = None  # checksum of the stored weights it was loaded from (set by the registry loader)
+
+    def __init__(self, name, tokenizer, model, size_bytes, inference_mode='fp32', id2label=None):
+        self.name = name
+        self.inference_mode = inference_mode
+        self.tokenizer = tokenizer
+        self.model = model
+        self.id2label = id2label or getattr(getattr(model, 'config', None), 'id2label', None) or {0: "0", 1: "1", 2: "2"}
+        self.size_bytes = size_bytes
+        self.loaded_at = time.time()
+        self.last_used = self.loaded_at
+
+    @property
+    def cache_key(self):
+        """
+        Prediction cache namespace: other engines/quantized variants may
+        predict differently, and re-fetched weights get a new checksum, so
+        every process misses on the old predictions without an invalidate.
+        """
+        if self.engine == 'pytorch' and self.inference_mode == 'fp32':
+            key = self.name
+        elif self.engine == 'pytorch':
+            key = f"{self.name}#{self.inference_mode}"
+        else:
+            key = f"{self.name}#{self.engine}-{self.inference_mode}"
+        return f"{key}@{self.artifact_sha256[:16]}" if self.artifact_sha256 else key
+
+    def forward(self, inputs):
+        """Return the logits of a padded batch as a numpy array"""
+        import torch
+
+        # ✅ DETERMINISTIC PREDICTION
+        with torch.no_grad():
+            return self.model(**inputs).logits.numpy()
+
+    def to_dict(self):
+        return {
+            'model_name': self.name,
+            'engine': self.engine,
+            'inference_mode': self.inference_mode,
+            'artifact_sha256': self.artifact_sha256,
+            'size_mb': round(self.size_bytes / (1024 * 1024), 1),
+            'loaded_at': self.loaded_at,
+            'last_used': self.last_used,
+        }
+
+
+class OnnxLoadedModel(LoadedModel):
+    """Exported model served through an ONNX Runtime session"""
+
+    engine = 'onnx'
+    tensor_type = 'np'
+
+    def __init__(self, name, tokenizer, session, size_bytes, inference_mode='fp32', id2label=None, path=None):
+        super().__init__(name, tokenizer, session, size_bytes, inference_mode, id2label)
+        self.path = path
+        self.input_names = [i.name for i in session.get_inputs()]
+
+    def forward(self, inputs):
+        feed = {name: inputs[name].astype('int64') for name in self.input_names if name in inputs}
+        return self.model.run(['logits'], feed)[0]
+
+    def to_dict(self):
+        info = super().to_dict()
+        info['path'] = self.path
+        return info
+
+
+def estimate_model_bytes(model):
+    """Approximate resident size of a torch module (parameters + buffers)"""
+    total = 0
+    for tensor in list(model.parameters()) + list(model.buffers()):
+        total += tensor.numel() * tensor.element_size()
+    return total
+
+
+def load_hf_model(model_name):
+    """Load tokenizer and model (from the local artifact store if present) and put the model in eval mode"""
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+    from ml.artifacts import artifact_store
+
+    # ✅ SET DETERMINISTIC BEHAVIOR
+    torch.manual_seed(42)
+    if torch.cuda.is_available():
+        torch.cuda.manual_seed(42)
+
+    source, options = artifact_store.source(model_name)
+    tokenizer = AutoTokenizer.from_pretrained(source, **options)
+    model = AutoModelForSequenceClassification.from_pretrained(source, **options)
+    model.eval()
+    return tokenizer, model
+
+
+class TorchEngine:
+    """The original transformers/PyTorch path"""
+
+    name = 'pytorch'
+
+    def load(self, model_name, inference_mode='fp32'):
+        tokenizer, model = load_hf_model(model_name)
+
+        if inference_mode == 'int8':
+            from ml.quantization import quantize_model, serialized_model_bytes
+            model = quantize_model(model)
+            return LoadedModel(model_name, tokenizer, model, serialized_model_bytes(model), inference_mode)
+
+        return LoadedModel(model_name, tokenizer, model, estimate_model_bytes(model), inference_mode)
+
+
+class OnnxEngine:
+    """
+    Exports a Hugging Face model to ONNX once, caches the file under
+    ``cache_dir`` and serves it with ONNX Runtime.
+    """
+
+    name = 'onnx'
+
+    def __init__(self, cache_dir='onnx_models', intra_op_threads=None):
+        self.cache_dir = cache_dir
+        self.intra_op_threads = intra_op_threads
+        self._export_lock = threading.Lock()
+
+    def configure(self, cache_dir=None, intra_op_threads=None):
+        if cache_dir:
+            self.cache_dir = cache_dir
+        if intra_op_threads is not None:
+            self.intra_op_threads = intra_op_threads or None
+
+    def model_dir(self, model_name):
+        return os.path.join(self.cache_dir, re.sub(r'[^A-Za-z0-9_.-]+', '--', model_name))
+
+    def export(self, model_name):
+        """Export the fp32 graph if it is not cached yet; returns (path, tokenizer, id2label)"""
+        from transformers import AutoConfig, AutoTokenizer
+        from ml.artifacts import artifact_store
+
+        path = os.path.join(self.model_dir(model_name), 'model.onnx')
+        with self._export_lock:
+            if not os.path.exists(path):
+                self._export(model_name, path)
+        source, options = artifact_store.source(model_name)
+        options.pop('use_safetensors', None)
+        tokenizer = AutoTokenizer.from_pretrained(source, **options)
+        config = AutoConfig.from_pretrained(source, **options)
+        return path, tokenizer, getattr(config, 'id2label', None)
+
+    def _export(self, model_name, path):
+        import torch
+
+        print(f"📦 Exporting {model_name} to ONNX: {path}")
+        tokenizer, model = load_hf_model(model_name)
+        dummy = tokenizer(["Export sample comment"], return_tensors="pt")
+        input_names = [name for name in ('input_ids', 'attention_mask', 'token_type_ids') if name in dummy]
+
+        class LogitsOnly(torch.nn.Module):
+            # Map positional ONNX inputs back to keyword arguments of the HF model
+            def __init__(self, wrapped):
+                super().__init__()
+                self.wrapped = wrapped
+
+            def forward(self, *args):
+                return self.wrapped(**dict(zip(input_names, args))).logits
+
+        dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+        dynamic_axes['logits'] = {0: 'batch'}
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        torch.onnx.export(
+            LogitsOnly(model), tuple(dummy[name] for name in input_names), tmp_path,
+            input_names=input_names, output_names=['logits'],
+            dynamic_axes=dynamic_axes, opset_version=14
+        )
+        os.replace(tmp_path, path)
+
+    def quantized_path(self, fp32_path):
+        """int8 variant of an exported graph, quantized once with ONNX Runtime"""
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        path = fp32_path.replace('model.onnx', 'model.int8.onnx')
+        with self._export_lock:
+            if not os.path.exists(path):
+                tmp_path = f"{path}.tmp"
+                quantize_dynamic(fp32_path, tmp_path, weight_type=QuantType.QInt8)
+                os.replace(tmp_path, path)
+        return path
+
+    def load(self, model_name, inference_mode='fp32'):
+        import onnxruntime
+
+        path, tokenizer, id2label = self.export(model_name)
+        if inference_mode == 'int8':
+            path = self.quantized_path(path)
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self.intra_op_threads:
+            options.intra_op_num_threads = self.intra_op_threads
+        session = onnxruntime.InferenceSession(path, options, providers=['CPUExecutionProvider'])
+
+        return OnnxLoadedModel(model_name, tokenizer, session, os.path.getsize(path),
+                               inference_mode, id2label, path)
+
+    def remove(self, model_name):
+        """Delete the cached ONNX files of a model"""
+        import shutil
+        shutil.rmtree(self.model_dir(model_name), ignore_errors=True)
+
+
+torch_engine = TorchEngine()
+onnx_engine = OnnxEngine()
+
+ENGINES = {
+    'pytorch': torch_engine,
+    'onnx': onnx_engine,
+}
+
+
+def get_engine(name):
+    if name not in ENGINES:
+        raise ValueError(f"Unknown inference engine: {name}")
+    return ENGINES[name]
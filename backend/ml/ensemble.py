@@ -0,0 +1,177 @@
+#backend/ml/ensemble.py
+import hashlib
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from ml.inference import (tokenize_texts, plan_batches, padding_stats, run_batches,
+                          DEFAULT_BATCH_SIZE, DEFAULT_TOKEN_BUDGET)
+from ml.labels import map_prediction_to_research_labels
+from utils.instrumentation import current_trace
+
+MAX_COMPARE_MODELS = 5
+
+
+def tokenizer_key(loaded):
+    """
+    Fingerprint of a model's tokenizer (class, casing and vocabulary), so
+    models fine-tuned from the same base share one tokenization pass.
+    Computed once per loaded model.
+    """
+    key = getattr(loaded, '_tokenizer_key', None)
+    if key is None:
+        tokenizer = loaded.tokenizer
+        get_vocab = getattr(tokenizer, 'get_vocab', None)
+        if get_vocab is None:
+            key = f"instance:{id(tokenizer)}"
+        else:
+            digest = hashlib.sha256()
+            for token, index in sorted(get_vocab().items()):
+                digest.update(f"{token}\0{index}\n".encode('utf-8'))
+            lower = getattr(tokenizer, 'init_kwargs', {}).get('do_lower_case')
+            key = f"{type(tokenizer).__name__}:{lower}:{digest.hexdigest()}"
+        loaded._tokenizer_key = key
+    return key
+
+
+def subset_encodings(encodings, indices):
+    return {key: [values[i] for i in indices] for key, values in encodings.items()}
+
+
+def compare_workers(model_count, configured=None):
+    """Threads for the per-model passes: only parallel when each model can get two cores"""
+    if configured:
+        return max(1, min(model_count, int(configured)))
+    return max(1, min(model_count, (os.cpu_count() or 1) // 2))
+
+
+def compare_texts(loaded_models, texts, batch_size=DEFAULT_BATCH_SIZE, token_budget=DEFAULT_TOKEN_BUDGET,
+                  cache=None, max_workers=None):
+    """
+    Classify the same texts with several models. Cached texts are skipped per
+    model; texts still pending are tokenized once per distinct tokenizer and
+    the forward passes of the models run in parallel threads.
+    Returns ({model: [(label, confidence), ...]}, {model: stats}).
+    """
+    texts = list(texts)
+    trace = current_trace()
+
+    plans = {}
+    for loaded in loaded_models:
+        cached = cache.get_many(loaded.cache_key, texts) if cache is not None else {}
+        plans[loaded.name] = (loaded, cached, [i for i in range(len(texts)) if i not in cached])
+
+    # One tokenization per tokenizer, over the union of texts its models still need
+    shared = {}
+    for loaded, _, pending in plans.values():
+        if pending and not getattr(loaded, 'remote', False):
+            shared.setdefault(tokenizer_key(loaded), (loaded.tokenizer, set()))[1].update(pending)
+    sharing = Counter(tokenizer_key(loaded) for loaded, _, pending in plans.values()
+                      if pending and not getattr(loaded, 'remote', False))
+    encoded = {}
+    with trace.stage('tokenize'):
+        for key, (tokenizer, indices) in shared.items():
+            indices = sorted(indices)
+            encoded[key] = ({i: row for row, i in enumerate(indices)},
+                            tokenize_texts(tokenizer, [texts[i] for i in indices]))
+
+    def run(loaded, cached, pending):
+        started = time.perf_counter()
+        predictions = [cached.get(i) for i in range(len(texts))]
+        stats = padding_stats([], [])
+        if pending and getattr(loaded, 'remote', False):
+            computed, stats = loaded.predict([texts[i] for i in pending], batch_size, token_budget)
+        elif pending:
+            rows, encodings = encoded[tokenizer_key(loaded)]
+            encodings = subset_encodings(encodings, [rows[i] for i in pending])
+            lengths = [len(ids) for ids in encodings["input_ids"]]
+            batches = plan_batches(lengths, token_budget, batch_size)
+            computed = [
+                (map_prediction_to_research_labels(loaded.id2label.get(class_id, "0")), confidence)
+                for class_id, confidence in run_batches(loaded, encodings, batches)
+            ]
+            stats = padding_stats(lengths, batches)
+        else:
+            computed = []
+        for i, prediction in zip(pending, computed):
+            predictions[i] = prediction
+        if cache is not None and pending:
+            cache.put_many(loaded.cache_key, [texts[i] for i in pending], computed)
+        stats['cache_hits'] = len(cached)
+        stats['shared_tokenization'] = bool(pending) and not getattr(loaded, 'remote', False) \
+            and sharing[tokenizer_key(loaded)] > 1
+        stats['inference_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        return predictions, stats
+
+    workers = max_workers or compare_workers(len(plans))
+    with trace.stage('forward'):
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='compare') as pool:
+                futures = {name: pool.submit(run, *plan) for name, plan in plans.items()}
+                outcomes = {name: future.result() for name, future in futures.items()}
+        else:
+            outcomes = {name: run(*plan) for name, plan in plans.items()}
+
+    return ({name: outcome[0] for name, outcome in outcomes.items()},
+            {name: outcome[1] for name, outcome in outcomes.items()})
+
+
+def ensemble_vote(votes):
+    """
+    Majority label over [(label, confidence), ...]; ties go to the label with
+    the highest summed confidence. Confidence is the mean over its voters.
+    """
+    counts = Counter(label for label, _ in votes)
+    totals = Counter()
+    for label, confidence in votes:
+        totals[label] += confidence
+    label = max(counts, key=lambda l: (counts[l], totals[l]))
+    return {
+        "prediction": label,
+        "confidence": round(totals[label] / counts[label], 3),
+        "votes": counts[label],
+        "unanimous": counts[label] == len(votes)
+    }
+
+
+def agreement_matrix(predictions):
+    """Share of comments on which each pair of models gives the same label"""
+    names = list(predictions)
+    matrix = {}
+    for a in names:
+        matrix[a] = {}
+        for b in names:
+            pairs = list(zip(predictions[a], predictions[b]))
+            same = sum(1 for (label_a, _), (label_b, _) in pairs if label_a == label_b)
+            matrix[a][b] = round(same / len(pairs), 3) if pairs else None
+    return matrix
+
+
+def build_comparison(comments_data, predictions, issue_number, ensemble=False):
+    """Per-comment rows with every model's label (and the ensemble vote), plus summary tables"""
+    names = list(predictions)
+    rows = []
+    for index, comment_data in enumerate(comments_data):
+        votes = {name: predictions[name][index] for name in names}
+        row = {
+            "author": comment_data["author"],
+            "comment": comment_data["text"],
+            "issue_number": issue_number,
+            "comment_id": comment_data.get("comment_id"),
+            "predictions": {name: {"prediction": label, "confidence": round(confidence, 3)}
+                            for name, (label, confidence) in votes.items()},
+            "agree": len({label for label, _ in votes.values()}) == 1
+        }
+        if ensemble:
+            row["ensemble"] = ensemble_vote(list(votes.values()))
+        rows.append(row)
+
+    summary = {
+        "agreement": agreement_matrix(predictions),
+        "label_counts": {name: dict(Counter(label for label, _ in predictions[name])) for name in names},
+        "unanimous_comments": sum(1 for row in rows if row["agree"])
+    }
+    if ensemble:
+        summary["label_counts"]["ensemble"] = dict(Counter(row["ensemble"]["prediction"] for row in rows))
+    return rows, summary
@@ -0,0 +1,148 @@
+#backend/ml/inference.py
+from ml.labels import map_prediction_to_research_labels
+from ml.scheduler import micro_batcher
+from utils.instrumentation import current_trace, get_logger, is_debug
+
+logger = get_logger('inference')
+
+DEFAULT_BATCH_SIZE = 16
+DEFAULT_TOKEN_BUDGET = 8192
+MAX_LENGTH = 512
+
+
+def tokenize_texts(tokenizer, texts):
+    """Tokenize without padding so every row keeps its own length"""
+    return tokenizer(list(texts), truncation=True, max_length=MAX_LENGTH)
+
+
+def plan_batches(lengths, token_budget=DEFAULT_TOKEN_BUDGET, max_batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Group row indices into length-sorted batches.
+
+    Rows are sorted by token length and a batch is closed as soon as adding
+    the next row would make ``rows * longest_row`` exceed ``token_budget``
+    (or the batch reaches ``max_batch_size`` rows). Each batch is later padded
+    only to its own longest row.
+    """
+    token_budget = max(1, int(token_budget or DEFAULT_TOKEN_BUDGET))
+    max_batch_size = max(1, int(max_batch_size or DEFAULT_BATCH_SIZE))
+
+    batches = []
+    current, current_max = [], 0
+    for index in sorted(range(len(lengths)), key=lambda i: lengths[i]):
+        longest = max(current_max, lengths[index])
+        if current and (longest * (len(current) + 1) > token_budget or len(current) >= max_batch_size):
+            batches.append(current)
+            current, longest = [], lengths[index]
+        current.append(index)
+        current_max = longest
+    if current:
+        batches.append(current)
+    return batches
+
+
+def padding_stats(lengths, batches):
+    """Compare pad tokens of the bucketed plan against padding everything to the longest row"""
+    real_tokens = sum(lengths)
+    naive_pad = len(lengths) * max(lengths, default=0) - real_tokens
+    bucketed_pad = sum(len(batch) * max(lengths[i] for i in batch) for batch in batches) - real_tokens
+    return {
+        "batches": len(batches),
+        "tokens": real_tokens,
+        "pad_tokens": bucketed_pad,
+        "pad_tokens_saved": naive_pad - bucketed_pad
+    }
+
+
+def run_batches(loaded, encodings, batches):
+    """Run the planned batches and return (raw_label_id, confidence) per row in input order"""
+    import numpy as np
+
+    trace = current_trace()
+    outputs = [None] * len(encodings["input_ids"])
+    keys = list(encodings.keys())
+
+    for batch in batches:
+        with trace.stage('tokenize'):
+            features = [{key: encodings[key][i] for key in keys} for i in batch]
+            inputs = loaded.tokenizer.pad(features, return_tensors=loaded.tensor_type)
+        with trace.stage('forward'):
+            logits = loaded.forward(inputs)
+
+        # Softmax on the engine-independent numpy logits
+        exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        probabilities = exp / exp.sum(axis=-1, keepdims=True)
+
+        if is_debug():
+            trace.detail(logger, "batch tensors", rows=len(batch), logits=logits.tolist(),
+                         probabilities=probabilities.tolist(), id2label=loaded.id2label)
+        for i, class_id, confidence in zip(batch, probabilities.argmax(axis=-1).tolist(),
+                                           probabilities.max(axis=-1).tolist()):
+            outputs[i] = (class_id, float(confidence))
+
+    return outputs
+
+
+def predict_texts(loaded, texts, batch_size=DEFAULT_BATCH_SIZE, token_budget=DEFAULT_TOKEN_BUDGET):
+    """Tokenize and classify texts with a local model; returns (predictions, batching stats)"""
+    with current_trace().stage('tokenize'):
+        encodings = tokenize_texts(loaded.tokenizer, texts)
+    lengths = [len(ids) for ids in encodings["input_ids"]]
+    batches = plan_batches(lengths, token_budget, batch_size)
+
+    predictions = [
+        (map_prediction_to_research_labels(loaded.id2label.get(class_id, "0")), confidence)
+        for class_id, confidence in run_batches(loaded, encodings, batches)
+    ]
+    return predictions, padding_stats(lengths, batches)
+
+
+def classify_texts(loaded, texts, batch_size=DEFAULT_BATCH_SIZE, token_budget=DEFAULT_TOKEN_BUDGET, cache=None):
+    """
+    Classify raw texts with a registry model using length-bucketed batches.
+    Texts already in ``cache`` skip tokenization and the forward pass; a
+    remote model (inference server mode) classifies the rest out of process.
+    Returns ([(research_label, confidence), ...] in input order, batching stats).
+    """
+    texts = list(texts)
+    cached = cache.get_many(loaded.cache_key, texts) if cache is not None else {}
+    pending = [i for i in range(len(texts)) if i not in cached]
+
+    predictions = [cached.get(i) for i in range(len(texts))]
+    stats = padding_stats([], [])
+    if pending:
+        pending_texts = [texts[i] for i in pending]
+        if getattr(loaded, 'remote', False):
+            computed, stats = loaded.predict(pending_texts, batch_size, token_budget)
+        else:
+            # Concurrent requests for the same model share one batched pass
+            computed, stats = micro_batcher.submit(loaded, pending_texts, predict_texts, batch_size, token_budget)
+        for i, prediction in zip(pending, computed):
+            predictions[i] = prediction
+        if cache is not None:
+            cache.put_many(loaded.cache_key, pending_texts, computed)
+
+    stats["cache_hits"] = len(cached)
+    return predictions, stats
+
+
+def build_result_rows(comments_data, predictions, issue_number):
+    """Build the /predict result rows from comments and their predictions"""
+    return [
+        {
+            "author": comment_data["author"],
+            "comment": comment_data["text"],
+            "prediction": prediction,
+            "confidence": round(confidence, 3),
+            "issue_number": issue_number,
+            "comment_id": comment_data.get("comment_id")
+        }
+        for comment_data, (prediction, confidence) in zip(comments_data, predictions)
+    ]
+
+
+def classify_comments(loaded, comments_data, issue_number,
+                      batch_size=DEFAULT_BATCH_SIZE, token_budget=DEFAULT_TOKEN_BUDGET, cache=None):
+    """Classify every comment of an issue; returns (result rows, batching stats)"""
+    predictions, stats = classify_texts(loaded, [c["text"] for c in comments_data], batch_size, token_budget, cache)
+    return build_result_rows(comments_data, predictions, issue_number), stats
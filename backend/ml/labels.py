@@ -0,0 +1,25 @@
+#backend/ml/labels.py
+
+def map_prediction_to_research_labels(prediction):
+    """Map any prediction to research categories"""
+    
+    # ✅ CLEAN LABEL MAPPING
+    if "Feature Improvement Request" in str(prediction):
+        return "FIR"  
+    elif "New Feature Request" in str(prediction):
+        return "NFR"   
+    elif "Comment" in str(prediction):
+        return "Comment"  
+    
+    # ✅ CLEAN GENERIC MAPPING: 0=Comment, 1=FIR, 2=NFR
+    label_mapping = {
+        "LABEL_0": "Comment", "LABEL_1": "FIR", "LABEL_2": "NFR",
+        "0": "Comment", "1": "FIR", "2": "NFR", 
+        0: "Comment", 1: "FIR", 2: "NFR"
+    }
+    
+    # If already correct, keep it
+    if prediction in ["NFR", "FIR", "Comment"]:
+        return prediction
+    
+    return label_mapping.get(prediction, "Comment")
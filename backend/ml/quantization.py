@@ -0,0 +1,72 @@
+#backend/ml/quantization.py
+import io
+import time
+
+# Short, representative issue comments used when the admin does not send samples
+DEFAULT_SAMPLES = [
+    "It would be great to support exporting the report as PDF.",
+    "Please add an option to disable the automatic update check.",
+    "The search page is really slow when there are more than 1000 entries, can it be improved?",
+    "Thanks, this works for me now.",
+    "I can reproduce this on version 3.3 as well.",
+    "Could the editor remember the last used template instead of resetting it every time?",
+    "New feature idea: allow reviewers to upload annotated files directly.",
+    "Closing as duplicate of #1234.",
+]
+
+
+def quantize_model(model):
+    """Apply dynamic int8 quantization to the Linear layers of an eval-mode model"""
+    import torch
+
+    quantized = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    quantized.eval()
+    return quantized
+
+
+def serialized_model_bytes(model):
+    """Size of the state dict on disk; also counts packed int8 weights that parameters() misses"""
+    import torch
+
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell()
+
+
+def compare_inference_modes(fp32_loaded, int8_loaded, texts=None):
+    """
+    Run the same samples through the fp32 and int8 variants of a model and
+    report label agreement, confidence drift, latency and memory. Both
+    variants must be local models; the engine is called directly, so the
+    timings include no micro-batcher window or prediction cache.
+    """
+    from ml.inference import predict_texts
+
+    texts = list(texts or DEFAULT_SAMPLES)
+    timings = {}
+    predictions = {}
+    for mode, loaded in (('fp32', fp32_loaded), ('int8', int8_loaded)):
+        # One row per batch so latency is per comment, as in the old loop
+        started = time.perf_counter()
+        predictions[mode], _ = predict_texts(loaded, texts, batch_size=1)
+        timings[mode] = (time.perf_counter() - started) * 1000 / max(len(texts), 1)
+
+    agree = sum(1 for a, b in zip(predictions['fp32'], predictions['int8']) if a[0] == b[0])
+    drift = [abs(a[1] - b[1]) for a, b in zip(predictions['fp32'], predictions['int8'])]
+
+    return {
+        'samples': len(texts),
+        'label_agreement': round(agree / len(texts), 4) if texts else None,
+        'mean_confidence_diff': round(sum(drift) / len(drift), 4) if drift else None,
+        'max_confidence_diff': round(max(drift), 4) if drift else None,
+        'ms_per_comment': {mode: round(ms, 2) for mode, ms in timings.items()},
+        'speedup': round(timings['fp32'] / timings['int8'], 2) if timings['int8'] else None,
+        'size_mb': {
+            'fp32': round(fp32_loaded.size_bytes / (1024 * 1024), 1),
+            'int8': round(int8_loaded.size_bytes / (1024 * 1024), 1),
+        },
+        'mismatches': [
+            {'text': text[:200], 'fp32': a[0], 'int8': b[0]}
+            for text, a, b in zip(texts, predictions['fp32'], predictions['int8']) if a[0] != b[0]
+        ],
+    }
@@ -0,0 +1,162 @@
+#backend/ml/registry.py
+import threading
+import time
+from collections import OrderedDict
+
+
+class _PendingLoad:
+    """Single-flight slot shared by every caller waiting on the same cold model"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry = None
+        self.error = None
+        self.evicted = False  # evict() ran during the load: the result may be stale weights
+
+
+def load_model(model_name, inference_mode='fp32', engine='pytorch'):
+    """Load a model through the requested inference engine, tagged with the checksum of its stored weights"""
+    from ml.artifacts import artifact_store
+    from ml.engines import get_engine
+
+    # Read before loading: a concurrent re-fetch can only make the tag older than the weights, never newer
+    manifest = artifact_store.manifest(model_name)
+    loaded = get_engine(engine).load(model_name, inference_mode)
+    loaded.artifact_sha256 = manifest['sha256'] if manifest else None
+    return loaded
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded models.
+
+    Entries are keyed by (model name, engine, inference mode), kept in LRU order and
+    evicted once the total estimated size exceeds ``max_bytes``. Concurrent requests for a model that is not loaded
+    yet wait on a single load instead of each loading their own copy.
+    """
+
+    def __init__(self, max_bytes=None, loader=load_model):
+        self.max_bytes = max_bytes
+        self.loader = loader
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def configure(self, max_bytes=None):
+        """Set the memory budget (bytes, None = unlimited) and evict down to it"""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._enforce_budget()
+
+    def get(self, model_name, inference_mode='fp32', engine='pytorch'):
+        """Return the loaded model, loading it once if nobody else is already doing so"""
+        key = (model_name, inference_mode or 'fp32', engine or 'pytorch')
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry.last_used = time.time()
+                self.hits += 1
+                return entry
+
+            self.misses += 1
+            pending = self._pending.get(key)
+            owner = pending is None
+            if owner:
+                pending = _PendingLoad()
+                self._pending[key] = pending
+
+        if not owner:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.entry
+
+        try:
+            print(f"🤖 Loading model: {model_name} ({key[2]}, {key[1]})")
+            entry = self.loader(*key)
+            pending.entry = entry
+        except Exception as e:
+            pending.error = e
+            raise
+        else:
+            with self._lock:
+                if pending.evicted:
+                    # Serve the callers that asked before the evict, but don't cache it
+                    print(f"🗑️ Dropped model loaded during an evict: {model_name} ({key[2]}, {key[1]})")
+                    return entry
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                self._enforce_budget(keep=key)
+            print(f"✅ Model ready: {model_name} ({entry.size_bytes / (1024 * 1024):.0f} MB)")
+            return entry
+        finally:
+            with self._lock:
+                if self._pending.get(key) is pending:
+                    del self._pending[key]
+            pending.done.set()
+
+    def warm(self, model_name, inference_mode='fp32', engine='pytorch'):
+        """Load a model ahead of its first request (used by the admin flow)"""
+        return self.get(model_name, inference_mode, engine)
+
+    def evict(self, model_name):
+        """Drop every loaded variant of a model; returns True if any was loaded"""
+        with self._lock:
+            keys = [key for key in self._entries if key[0] == model_name]
+            for key in keys:
+                del self._entries[key]
+            # Loads in flight may read the old weights: they are not cached, the next get() loads again
+            for key in [key for key in self._pending if key[0] == model_name]:
+                self._pending.pop(key).evicted = True
+        if keys:
+            print(f"🗑️ Evicted model: {model_name}")
+        return bool(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            for pending in self._pending.values():
+                pending.evicted = True
+            self._pending.clear()
+
+    def is_loaded(self, model_name, inference_mode='fp32', engine='pytorch'):
+        with self._lock:
+            return (model_name, inference_mode, engine) in self._entries
+
+    def total_bytes(self):
+        with self._lock:
+            return sum(entry.size_bytes for entry in self._entries.values())
+
+    def stats(self):
+        with self._lock:
+            return {
+                'models': [entry.to_dict() for entry in self._entries.values()],
+                'loading': [f"{name} ({engine}, {mode})" for name, mode, engine in self._pending],
+                'total_mb': round(sum(e.size_bytes for e in self._entries.values()) / (1024 * 1024), 1),
+                'max_mb': round(self.max_bytes / (1024 * 1024), 1) if self.max_bytes else None,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def _enforce_budget(self, keep=None):
+        """Evict least recently used entries until the budget fits (caller holds the lock)"""
+        if not self.max_bytes:
+            return
+        total = sum(entry.size_bytes for entry in self._entries.values())
+        for key in list(self._entries.keys()):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            evicted = self._entries.pop(key)
+            total -= evicted.size_bytes
+            self.evictions += 1
+            print(f"🗑️ Evicted model (memory budget): {key[0]} ({key[2]}, {key[1]})")
+
+
+model_registry = ModelRegistry()
@@ -0,0 +1,145 @@
+#backend/ml/remote.py
+import ipaddress
+import threading
+from multiprocessing.connection import Client
+
+from ml.engines import LoadedModel
+from utils.instrumentation import current_trace
+
+
+def parse_address(address):
+    """'host:port' -> TCP tuple, anything else is a Unix socket path"""
+    host, sep, port = address.rpartition(':')
+    if sep and port.isdigit() and '/' not in address:
+        return (host or '127.0.0.1', int(port))
+    return address
+
+
+def is_loopback(address):
+    """True for Unix socket paths and TCP addresses on the local host only"""
+    if isinstance(address, str):
+        return True
+    host = address[0]
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def require_authkey(authkey):
+    """
+    The connection protocol unpickles messages, so anyone holding the key can
+    run code in the other process: it must be set explicitly, never derived
+    from another secret or left at a default.
+    """
+    if not authkey:
+        raise RuntimeError("INFERENCE_SERVER_AUTHKEY must be set to use the inference server")
+    return authkey.encode('utf-8') if isinstance(authkey, str) else authkey
+
+
+class RemoteModel(LoadedModel):
+    """Handle to a model held by the inference server; classify_texts() sends it the uncached texts"""
+
+    remote = True
+
+    def __init__(self, client, name, inference_mode='fp32', engine='pytorch', info=None, artifact_sha256=None):
+        super().__init__(name, None, None, (info or {}).get('size_bytes', 0), inference_mode)
+        self.engine = engine
+        self.client = client
+        self.artifact_sha256 = artifact_sha256 or (info or {}).get('artifact_sha256')
+
+    def predict(self, texts, batch_size, token_budget):
+        with current_trace().stage('inference_server'):
+            reply = self.client.call('classify', model=self.name, inference_mode=self.inference_mode,
+                                     engine=self.engine, texts=texts,
+                                     batch_size=batch_size, token_budget=token_budget)
+        return reply['predictions'], reply['stats']
+
+    def forward(self, inputs):
+        raise RuntimeError("Remote models are classified by the inference server")
+
+
+class InferenceClient:
+    """
+    Thin client used by Flask workers when INFERENCE_SERVER is set: models
+    live in the inference server process, workers only send texts.
+    Connections are pooled, one request in flight per connection.
+    """
+
+    def __init__(self, address=None, authkey=None):
+        self.address = address
+        self.authkey = authkey
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def configure(self, address=None, authkey=None):
+        with self._lock:
+            for conn in self._idle:
+                conn.close()
+            self._idle = []
+        self.address = parse_address(address) if address else None
+        if self.address is not None:
+            self.authkey = require_authkey(authkey)
+
+    @property
+    def enabled(self):
+        return self.address is not None
+
+    def _checkout(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return Client(self.address, authkey=self.authkey)
+
+    def _checkin(self, conn):
+        with self._lock:
+            self._idle.append(conn)
+
+    def call(self, op, **fields):
+        """Send one request; retries once on a fresh connection if a pooled one went stale"""
+        message = dict(fields, op=op)
+        for attempt in range(2):
+            conn = self._checkout()
+            try:
+                conn.send(message)
+                reply = conn.recv()
+            except (EOFError, OSError):
+                conn.close()
+                if attempt:
+                    raise
+                continue
+            self._checkin(conn)
+            if not reply.get('ok'):
+                raise RuntimeError(reply.get('error') or f"Inference server failed: {op}")
+            return reply
+
+    def model(self, model_name, inference_mode='fp32', engine='pytorch', artifact_sha256=None):
+        """Handle for a model; the server loads it on the first classify call"""
+        return RemoteModel(self, model_name, inference_mode, engine, artifact_sha256=artifact_sha256)
+
+    def load(self, model_name, inference_mode='fp32', engine='pytorch'):
+        """Make the server load a model now (admin add_model, startup warm-up)"""
+        reply = self.call('load', model=model_name, inference_mode=inference_mode, engine=engine)
+        return RemoteModel(self, model_name, inference_mode, engine, reply.get('model'))
+
+    def evict(self, model_name):
+        return self.call('evict', model=model_name).get('evicted', False)
+
+    def compare_modes(self, model_name, engine='pytorch', texts=None):
+        """fp32 vs int8 report computed next to the models (see ml.quantization.compare_inference_modes)"""
+        return self.call('compare_modes', model=model_name, engine=engine, texts=texts)['report']
+
+    def stats(self):
+        return self.call('stats')['stats']
+
+    def is_loaded(self, model_name, inference_mode='fp32', engine='pytorch'):
+        try:
+            return any(m['model_name'] == model_name and m['inference_mode'] == inference_mode
+                       and m['engine'] == engine for m in self.stats()['models'])
+        except Exception:
+            return False
+
+
+inference_client = InferenceClient()
@@ -1,16 +1,32 @@
 #backend/ml/routes.py
 import os
-import traceback
+import logging
 import json
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from flask_cors import cross_origin
-from flask import Blueprint, request, jsonify, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from transformers import AutoModelForSequenceClassification, AutoTokenizer
-import requests
-from urllib.parse import urlparse
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
+from utils.github_api import GitHubClient, GitHubError, parse_issue_url
+from utils.http_cache import github_cache
+from ml.registry import model_registry
+from ml.engines import onnx_engine
+from ml.artifacts import artifact_store
+from ml.cache import prediction_cache
+from ml.warmup import model_warmup
+from ml.remote import inference_client
+from ml.labels import map_prediction_to_research_labels
+from ml.inference import classify_comments, DEFAULT_BATCH_SIZE, DEFAULT_TOKEN_BUDGET
+from ml.ensemble import compare_texts, compare_workers, build_comparison, MAX_COMPARE_MODELS
+from jobs.worker import prediction_workers
+from utils.instrumentation import get_logger, current_trace, traced, is_debug, log_event
+from utils.metrics import GITHUB_FETCH_SECONDS, COMMENTS_CLASSIFIED, HISTORY_SECONDS
 
 ml_bp = Blueprint('ml', __name__)
+logger = get_logger('ml')
+
+ISSUE_BODY_ID = 0  # comment_id of the issue body row; GitHub comment ids are never 0
+SINCE_MARGIN = timedelta(minutes=10)  # re-fetch a little before the last run; duplicates are merged by id
 
 def load_available_models():
     """Load available models from database"""
@@ -32,25 +48,73 @@ def get_available_models():
     """Get available models (for admin system)"""
     return load_available_models()
 
-def add_model(model_name):
+def is_registered_model(model_name):
+    """True if an admin added the model (AIModel row)"""
+    from models.aimodels import AIModel
+    return AIModel.query.filter_by(huggingface_url=model_name).first() is not None
+
+def get_model_settings(model_name):
+    """Inference settings stored next to the model in AIModel"""
+    from models.aimodels import AIModel
+    model = AIModel.query.filter_by(huggingface_url=model_name).first()
+    if not model:
+        # Unregistered names never reach the loader (which could fall back to the hub)
+        raise PredictionError(f"Unknown model: {model_name}", 404)
+    return model.settings_dict()
+
+def get_loaded_model(model_name):
+    """Get the registry entry for a registered model using its configured engine and mode"""
+    settings = get_model_settings(model_name)
+    if inference_client.enabled:
+        return inference_client.model(model_name, settings['inference_mode'], settings['engine'],
+                                      settings['artifact_sha256'])
+    loaded = model_registry.get(model_name, settings['inference_mode'], settings['engine'])
+    if settings['artifact_sha256'] and loaded.artifact_sha256 not in (None, settings['artifact_sha256']):
+        # Weights were re-fetched (possibly by another worker): drop this process's stale copy
+        model_registry.evict(model_name)
+        loaded = model_registry.get(model_name, settings['inference_mode'], settings['engine'])
+    return loaded
+
+def evict_model(model_name):
+    """Drop a model from this process and, in inference server mode, from the server"""
+    model_registry.evict(model_name)
+    if inference_client.enabled:
+        try:
+            inference_client.evict(model_name)
+        except Exception as e:
+            print(f"⚠️ Inference server evict failed for {model_name}: {e}")
+
+def add_model(model_name, inference_mode='fp32', engine='pytorch'):
     """Add model to database (for admin system)"""
     try:
         db = current_app.extensions['sqlalchemy']
-        from models.aimodels import AIModel
+        from models.aimodels import AIModel, INFERENCE_MODES, INFERENCE_ENGINES
+        
+        if inference_mode not in INFERENCE_MODES or engine not in INFERENCE_ENGINES:
+            return False
         
         # Check if exists
         if AIModel.query.filter_by(huggingface_url=model_name).first():
             return False
         
-        # Test model
-        tokenizer = AutoTokenizer.from_pretrained(model_name)
-        model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        # Download once into the local artifact store; every later load is offline
+        manifest = artifact_store.fetch(model_name)
+        
+        # Test model (and keep it warm in the registry for the first request)
+        if inference_client.enabled:
+            inference_client.load(model_name, inference_mode, engine)
+        else:
+            model_registry.warm(model_name, inference_mode, engine)
         
         # Add to DB
         new_model = AIModel(
             name=model_name.split('/')[-1],
             huggingface_url=model_name,
-            uploaded_by="admin"
+            uploaded_by="admin",
+            inference_mode=inference_mode,
+            engine=engine,
+            artifact_size_bytes=manifest['size_bytes'],
+            artifact_sha256=manifest['sha256']
         )
         
         db.session.add(new_model)
@@ -59,6 +123,7 @@ def add_model(model_name):
         
     except Exception as e:
         print(f"Error adding model: {e}")
+        artifact_store.remove(model_name)
         return False
 
 def remove_model(model_name):
@@ -73,102 +138,156 @@ def remove_model(model_name):
         
         db.session.delete(model_to_delete)
         db.session.commit()
+        evict_model(model_name)
+        prediction_cache.invalidate(model_name)
+        onnx_engine.remove(model_name)
+        
+        # Only this model's stored weights: other unregistered directories may be fetches in flight
+        artifact_store.remove(model_name)
         return True
         
     except Exception as e:
         print(f"Error removing model: {e}")
         return False
 
-def map_prediction_to_research_labels(prediction):
-    """Map any prediction to research categories"""
-    
-    # ✅ CLEAN LABEL MAPPING
-    if "Feature Improvement Request" in str(prediction):
-        return "FIR"  
-    elif "New Feature Request" in str(prediction):
-        return "NFR"   
-    elif "Comment" in str(prediction):
-        return "Comment"  
-    
-    # ✅ CLEAN GENERIC MAPPING: 0=Comment, 1=FIR, 2=NFR
-    label_mapping = {
-        "LABEL_0": "Comment", "LABEL_1": "FIR", "LABEL_2": "NFR",
-        "0": "Comment", "1": "FIR", "2": "NFR", 
-        0: "Comment", 1: "FIR", 2: "NFR"
-    }
+def prefetch_model(model_name, force=False):
+    """Download a registered model into the artifact store and record its size/checksum (for admin system)"""
+    db = current_app.extensions['sqlalchemy']
+    from models.aimodels import AIModel
+    
+    model = AIModel.query.filter_by(huggingface_url=model_name).first()
+    if not model:
+        return None
+    
+    previous_sha256 = model.artifact_sha256
+    manifest = artifact_store.fetch(model_name, force=force)
+    model.artifact_size_bytes = manifest['size_bytes']
+    model.artifact_sha256 = manifest['sha256']
+    db.session.commit()
     
-    # If already correct, keep it
-    if prediction in ["NFR", "FIR", "Comment"]:
-        return prediction
+    # Reload from the store on the next request (every inference server process)
+    evict_model(model_name)
+    if force or manifest['sha256'] != previous_sha256:
+        # New weights: predictions and the ONNX export of the old ones are stale
+        prediction_cache.invalidate(model_name)
+        onnx_engine.remove(model_name)
+    return model.artifact_dict()
+
+def verify_model_artifacts(model_name=None):
+    """Re-hash stored models against the checksums recorded in AIModel (for admin system)"""
+    from models.aimodels import AIModel
     
-    return label_mapping.get(prediction, "Comment")
+    query = AIModel.query
+    if model_name:
+        query = query.filter_by(huggingface_url=model_name)
+    return [artifact_store.verify(model.huggingface_url, model.artifact_sha256) for model in query.all()]
 
-def get_issue_data(issue_url, token=None):
-    """Extract comments from GitHub issue URL"""
+def set_model_settings(model_name, inference_mode=None, engine=None):
+    """Switch a model's inference mode (fp32/int8) and/or engine (pytorch/onnx) (for admin system)"""
     try:
-        print(f"🔍 Extracting from: {issue_url}")
-        
-        # Parse URL
-        parsed_url = urlparse(issue_url)
-        path = parsed_url.path.strip('/').split('/')
+        db = current_app.extensions['sqlalchemy']
+        from models.aimodels import AIModel, INFERENCE_MODES, INFERENCE_ENGINES
+        
+        model = AIModel.query.filter_by(huggingface_url=model_name).first()
+        if not model:
+            return None
+        if inference_mode is not None and inference_mode not in INFERENCE_MODES:
+            return None
+        if engine is not None and engine not in INFERENCE_ENGINES:
+            return None
+        
+        if inference_mode is not None:
+            model.inference_mode = inference_mode
+        if engine is not None:
+            model.engine = engine
+        db.session.commit()
         
-        if len(path) < 4 or path[-2] != 'issues':
-            return None, [], None
+        # Drop the old variant; the next request loads the new one
+        evict_model(model_name)
+        return model.settings_dict()
         
-        owner, repo, issue_number = path[-4], path[-3], path[-1]
+    except Exception as e:
+        print(f"Error updating model settings: {e}")
+        db.session.rollback()
+        return None
+
+def check_quantization(model_name, samples=None):
+    """Compare int8 labels/confidences against the fp32 path (for admin system)"""
+    from ml.quantization import compare_inference_modes
+    engine = get_model_settings(model_name)['engine']
+    if inference_client.enabled:
+        # Both variants are loaded by the inference server, never in this web worker
+        return inference_client.compare_modes(model_name, engine, samples)
+    return compare_inference_modes(
+        model_registry.get(model_name, 'fp32', engine),
+        model_registry.get(model_name, 'int8', engine),
+        samples
+    )
+
+def build_comments_data(issue_data, comments):
+    """Issue body (as first comment) plus every non-empty comment as {author, text, comment_id}"""
+    comments_data = []
+    
+    # Add issue body as first comment
+    issue_body = issue_data.get('body') or ''
+    if issue_body.strip():
+        comments_data.append({
+            'author': (issue_data.get('user') or {}).get('login', 'Unknown'),
+            'text': issue_body.strip(),
+            'comment_id': ISSUE_BODY_ID
+        })
+    
+    # Add comments
+    for comment in comments or []:
+        comment_text = (comment.get('body') or '').strip()
+        if comment_text:
+            comments_data.append({
+                'author': (comment.get('user') or {}).get('login', 'Unknown'),
+                'text': comment_text,
+                'comment_id': comment.get('id')
+            })
+    
+    return comments_data
+
+def get_github_token():
+    return os.getenv('GH_PAT') or os.getenv('GITHUB_TOKEN')
+
+def get_issue_data(issue_url, token=None, since=None):
+    """Extract comments from GitHub issue URL (only comments updated at or after ``since`` if given)"""
+    trace = current_trace()
+    try:
+        trace.detail(logger, "extracting issue", issue_url=issue_url)
         
-        # API URLs
-        api_url = f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}"
-        comments_url = f"{api_url}/comments"
+        # Parse URL
+        parsed = parse_issue_url(issue_url)
+        if not parsed:
+            return None, [], None
         
-        # Headers
-        headers = {'Accept': 'application/vnd.github.v3+json', 'User-Agent': 'Issue-Classifier'}
-        if token and token.startswith('ghp_'):
-            headers['Authorization'] = f'token {token}'
+        owner, repo, issue_number = parsed
         
-        # Get issue
-        response = requests.get(api_url, headers=headers)
-        if response.status_code == 401 and token:
-            headers.pop('Authorization', None)
-            response = requests.get(api_url, headers=headers)
+        # Issue and every comment page (per_page=100) fetched concurrently
+        client = GitHubClient(token)
+        started = time.perf_counter()
+        with trace.stage('fetch'):
+            issue_data, comments = client.fetch_issue_with_comments(owner, repo, issue_number, since=since)
+        GITHUB_FETCH_SECONDS.observe(time.perf_counter() - started,
+                                     outcome='ok' if issue_data is not None else 'not_found')
         
-        if response.status_code != 200:
+        if issue_data is None:
             return None, [], issue_number
         
-        issue_data = response.json()
         issue_title = issue_data.get('title', 'No Title')
-        issue_body = issue_data.get('body', '')
+        comments_data = build_comments_data(issue_data, comments)
         
-        # Get comments
-        comments_response = requests.get(comments_url, headers=headers)
-        if comments_response.status_code == 401 and 'Authorization' in headers:
-            headers.pop('Authorization', None)
-            comments_response = requests.get(comments_url, headers=headers)
-        
-        comments_data = []
-        
-        # Add issue body as first comment
-        if issue_body and issue_body.strip():
-            comments_data.append({
-                'author': issue_data.get('user', {}).get('login', 'Unknown'),
-                'text': issue_body.strip()
-            })
-        
-        # Add comments
-        if comments_response.status_code == 200:
-            for comment in comments_response.json():
-                comment_text = comment.get('body', '').strip()
-                if comment_text:
-                    comments_data.append({
-                        'author': comment.get('user', {}).get('login', 'Unknown'),
-                        'text': comment_text
-                    })
-        
-        print(f"📊 Found {len(comments_data)} comments")
+        trace.detail(logger, "issue fetched", comments=len(comments_data))
         return issue_title, comments_data, issue_number
         
+    except GitHubError as e:
+        # Never classify a partial thread: report the failed fetch instead
+        GITHUB_FETCH_SECONDS.observe(time.perf_counter() - started, outcome='error')
+        raise PredictionError(str(e), 502)
     except Exception as e:
-        print(f"❌ Error: {e}")
+        logger.exception(f"Error extracting {issue_url}: {e}")
         return None, [], None
 
 @ml_bp.route("/available-models", methods=["GET"])
@@ -182,122 +301,514 @@ def get_available_models_endpoint():
         print(f"Error: {e}")
         return jsonify([]), 500
 
-test_values = ["LABEL_0", "LABEL_1", "LABEL_2", "0", "1", "2", 0, 1, 2]
-for val in test_values:
-    result = map_prediction_to_research_labels(val)
-    print(f"{val} ({type(val)}) → {result}")
-print("="*50)
+@ml_bp.route("/model-registry", methods=["GET"])
+@cross_origin(origins=["https://obscure-memory-w47jq5jx6p92g95x-8080.app.github.dev"], supports_credentials=True)
+def get_model_registry():
+    """Get models currently held in memory (by the inference server in server mode)"""
+    if inference_client.enabled:
+        try:
+            return jsonify(inference_client.stats())
+        except Exception as e:
+            return jsonify({"error": f"Inference server unavailable: {e}"}), 503
+    return jsonify(model_registry.stats())
+
+@ml_bp.route("/ready", methods=["GET"])
+@cross_origin(origins=["https://obscure-memory-w47jq5jx6p92g95x-8080.app.github.dev"], supports_credentials=True)
+def get_readiness():
+    """Readiness probe: 200 once every preloaded model is hot, 503 while warming or if any failed"""
+    status = model_warmup.status()
+    return jsonify(status), 200 if status['ready'] else 503
+
+@ml_bp.route("/cache-stats", methods=["GET"])
+@cross_origin(origins=["https://obscure-memory-w47jq5jx6p92g95x-8080.app.github.dev"], supports_credentials=True)
+def get_cache_stats():
+    """Get prediction cache hit/miss counters"""
+    return jsonify(prediction_cache.stats())
+
+@ml_bp.route("/github-cache-stats", methods=["GET"])
+@cross_origin(origins=["https://obscure-memory-w47jq5jx6p92g95x-8080.app.github.dev"], supports_credentials=True)
+def get_github_cache_stats():
+    """Get GitHub response cache hit ratio and remaining rate limit"""
+    return jsonify(github_cache.stats())
+
+def log_label_mapping_selftest():
+    """Log how raw labels map to research labels (debug mode only)"""
+    if not is_debug():
+        return
+    test_values = ["LABEL_0", "LABEL_1", "LABEL_2", "0", "1", "2", 0, 1, 2]
+    for val in test_values:
+        result = map_prediction_to_research_labels(val)
+        logger.debug(f"label mapping self-test: {val!r} ({type(val).__name__}) -> {result}")
+
+class PredictionError(Exception):
+    """Client-side problem with a prediction request (bad URL, no comments, ...)"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+def classify_issue(model_name, issue_url):
+    """Fetch and classify an issue; returns the /predict response payload"""
+    trace = current_trace()
+    trace.set(model=model_name)
+    
+    # Get issue data
+    github_token = get_github_token()
+    issue_title, comments_data, issue_number = get_issue_data(issue_url, github_token)
+    
+    if not comments_data:
+        raise PredictionError("No comments found or invalid URL")
+    
+    # Load model (shared across requests, already in eval mode)
+    with trace.stage('model_load'):
+        loaded = get_loaded_model(model_name)
+    
+    # Classify all comments in length-bucketed batches
+    batch_size = current_app.config.get('INFERENCE_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    token_budget = current_app.config.get('INFERENCE_TOKEN_BUDGET', DEFAULT_TOKEN_BUDGET)
+    result, batching = classify_comments(loaded, comments_data, issue_number, batch_size, token_budget,
+                                         cache=prediction_cache)
+    
+    trace.set(comments=len(result), batches=batching['batches'], cache_hits=batching['cache_hits'],
+              pad_tokens_saved=batching['pad_tokens_saved'])
+    COMMENTS_CLASSIFIED.inc(len(result), model=model_name)
+    
+    return {
+        "result": result,
+        "issue_title": issue_title,
+        "issue_number": issue_number,
+        "total_comments": len(result),
+        "batching": batching
+    }
+
+def classify_issue_incremental(model_name, issue_url, user_id):
+    """
+    Re-classify an issue for a user, touching only what changed on GitHub
+    since their last run: comments updated since then are fetched (``since``)
+    and classified, everything else is reused from the stored rows. Rows
+    relabelled by hand are never overwritten. The newest history entry is
+    updated in place (a new one is created on the first run).
+    """
+    db = current_app.extensions['sqlalchemy']
+    from models.classification_history import ClassificationHistory
+    from models.classification_result import ClassificationResult
+    from models.classification_stat import ClassificationStat
+    from ml.cache import text_hash
+    
+    trace = current_trace()
+    trace.set(model=model_name, incremental=True)
+    
+    base = ClassificationHistory.query.filter_by(
+        user_id=user_id, issue_url=issue_url, model_name=model_name
+    ).order_by(ClassificationHistory.timestamp.desc()).first()
+    rows = base.results if base is not None else []
+    # Rows saved before comment ids were stored can only be matched by text: fetch everything once
+    legacy = any(row.comment_id is None for row in rows)
+    
+    if not rows:
+        payload = classify_issue(model_name, issue_url)
+        history = ClassificationHistory(
+            user_id=user_id,
+            model_name=model_name,
+            model_type='system',
+            source_type='github',
+            issue_url=issue_url,
+            issue_title=payload['issue_title'],
+            issue_number=payload['issue_number'],
+            status='completed'
+        )
+        history.set_results(payload['result'])
+        db.session.add(history)
+        ClassificationStat.apply(user_id, ClassificationStat.tally(history))
+        db.session.commit()
+        payload['history_id'] = history.id
+        payload['incremental'] = {'base_history_id': None, 'since': None, 'fetched': len(payload['result']),
+                                  'classified': len(payload['result']), 'reused': 0, 'preserved_edits': 0}
+        return payload
+    
+    since = None
+    if not legacy:
+        since = (base.timestamp - SINCE_MARGIN).strftime('%Y-%m-%dT%H:%M:%SZ')
+    issue_title, fetched, issue_number = get_issue_data(issue_url, get_github_token(), since=since)
+    if issue_title is None:
+        raise PredictionError("No comments found or invalid URL")
+    
+    by_id = {row.comment_id: row for row in rows if row.comment_id is not None}
+    by_hash = {}
+    for row in rows:
+        by_hash.setdefault(row.text_hash, row)
+    
+    updates, appends, kept = [], [], []  # (row, comment), comment, (row, comment)
+    preserved = 0
+    for comment in fetched:
+        digest = text_hash(comment['text'])
+        row = by_hash.get(digest) if legacy else by_id.get(comment['comment_id'])
+        if row is None:
+            appends.append(comment)
+        elif row.edited or row.text_hash == digest:
+            preserved += int(row.edited and row.text_hash != digest)
+            kept.append((row, comment))
+        else:
+            updates.append((row, comment))
+    
+    pending = [comment for _, comment in updates] + appends
+    if pending:
+        with trace.stage('model_load'):
+            loaded = get_loaded_model(model_name)
+        batch_size = current_app.config.get('INFERENCE_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+        token_budget = current_app.config.get('INFERENCE_TOKEN_BUDGET', DEFAULT_TOKEN_BUDGET)
+        classified, batching = classify_comments(loaded, pending, issue_number, batch_size, token_budget,
+                                                 cache=prediction_cache)
+    else:
+        classified, batching = [], {'batches': 0, 'cache_hits': 0, 'pad_tokens_saved': 0}
+    
+    with trace.stage('merge'):
+        before = ClassificationStat.tally(base)
+        if legacy:
+            # Rebuild in GitHub order, carrying labels over by text; rows come out with comment ids
+            known = {id(comment): row for row, comment in kept}
+            fresh = iter(classified[len(updates):])
+            merged = []
+            for comment in fetched:
+                row = known.get(id(comment))
+                if row is not None:
+                    item = row.to_dict()
+                    item.update(author=comment['author'], comment_id=comment['comment_id'])
+                    merged.append(item)
+                else:
+                    merged.append(next(fresh))
+            base.set_results(merged)
+        else:
+            for (row, comment), item in zip(updates, classified):
+                row.author = comment['author']
+                row.comment = comment['text']
+                row.text_hash = text_hash(comment['text'])
+                row.prediction = item['prediction']
+                row.confidence = item['confidence']
+            position = max(row.position for row in rows) + 1
+            for item in classified[len(updates):]:
+                base.results.append(ClassificationResult.from_result(item, position, model_name))
+                position += 1
+            base.refresh_mirror()
+        base.issue_title = issue_title
+        base.timestamp = datetime.utcnow()
+        ClassificationStat.replace(user_id, before, base)
+        db.session.commit()
+    
+    result = base.results_list()
+    trace.set(comments=len(result), classified=len(pending), batches=batching['batches'])
+    COMMENTS_CLASSIFIED.inc(len(pending), model=model_name)
+    
+    return {
+        "result": result,
+        "issue_title": issue_title,
+        "issue_number": issue_number,
+        "total_comments": len(result),
+        "batching": batching,
+        "history_id": base.id,
+        "incremental": {
+            "base_history_id": base.id,
+            "since": since,
+            "fetched": len(fetched),
+            "classified": len(pending),
+            "updated": len(updates),
+            "appended": len(appends),
+            "reused": len(result) - len(pending),
+            "preserved_edits": preserved
+        }
+    }
+
+def get_optional_user_id():
+    """JWT identity if the request carries a valid token, else None"""
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except Exception:
+        return None
+
+def enqueue_prediction(model_name, issue_url):
+    """Store an async prediction job and hand it to the worker pool"""
+    db = current_app.extensions['sqlalchemy']
+    from models.prediction_job import PredictionJob
+    
+    job = PredictionJob(user_id=get_optional_user_id(), model_name=model_name, issue_url=issue_url)
+    db.session.add(job)
+    db.session.commit()
+    
+    prediction_workers.submit(current_app._get_current_object(), job.id)
+    return job
 
 @ml_bp.route("/predict", methods=["POST"])
 @cross_origin(origins=["https://obscure-memory-w47jq5jx6p92g95x-8080.app.github.dev"], supports_credentials=True)
 def predict():
-    try:
-        # Get request data
-        data = request.get_json() if request.is_json else request.form
-        print(f"🔍 Received data: {data}")
-        
-        model_name = data.get("model_name") or data.get("model") or data.get("modelName")
-        issue_url = data.get("issue_url") or data.get("github_url") or data.get("issueUrl")
-        
-        print(f"🔍 Extracted - model_name: {model_name}, issue_url: {issue_url}")
-        
-        if not issue_url or not model_name:
-            return jsonify({"error": "issue_url and model_name required"}), 400
-        
-        print(f"🤖 Using model: {model_name}")
-        
-        # Get issue data
-        github_token = os.getenv('GH_PAT') or os.getenv('GITHUB_TOKEN')
-        issue_title, comments_data, issue_number = get_issue_data(issue_url, github_token)
-        
-        if not comments_data:
-            return jsonify({"error": "No comments found or invalid URL"}), 400
-        
-        # Load model
-        print(f"🤖 Loading model: {model_name}")
-        tokenizer = AutoTokenizer.from_pretrained(model_name)
-        model = AutoModelForSequenceClassification.from_pretrained(model_name)
-        
-        # ✅ SET DETERMINISTIC BEHAVIOR
-        import torch
-        torch.manual_seed(42)
-        if torch.cuda.is_available():
-            torch.cuda.manual_seed(42)
-        model.eval()  # Set to evaluation mode
-        
-        # Process each comment
-        result = []
-        for i, comment_data in enumerate(comments_data):
-            print(f"\n🔍 PROCESSING COMMENT {i+1}:")
-            print(f"📝 Text: {comment_data['text'][:100]}...")
+    with traced('predict') as trace:
+        try:
+            # Get request data
+            data = request.get_json() if request.is_json else request.form
+            trace.detail(logger, "received payload", payload=dict(data))
             
-            # Tokenize and predict
-            inputs = tokenizer(comment_data["text"], return_tensors="pt", truncation=True, padding=True, max_length=512)
+            model_name = data.get("model_name") or data.get("model") or data.get("modelName")
+            issue_url = data.get("issue_url") or data.get("github_url") or data.get("issueUrl")
+            trace.set(model=model_name, issue_url=issue_url)
             
-            # ✅ DETERMINISTIC PREDICTION
-            with torch.no_grad():
-                outputs = model(**inputs)
+            if not issue_url or not model_name:
+                trace.finish(logger, status=400)
+                return jsonify({"error": "issue_url and model_name required"}), 400
+            if not is_registered_model(model_name):
+                raise PredictionError(f"Unknown model: {model_name}", 404)
             
-            # Get prediction and confidence
-            predictions = outputs.logits.argmax(dim=-1)
-            confidence_scores = outputs.logits.softmax(dim=-1)
-            confidence = float(confidence_scores.max().item())
+            # Async mode: return a job id right away, a worker runs the pipeline
+            run_async = str(data.get("async") or request.args.get("async") or "").lower() in ("1", "true", "yes")
+            if run_async:
+                job = enqueue_prediction(model_name, issue_url)
+                trace.finish(logger, status=202, job_id=job.id)
+                return jsonify({
+                    "job_id": job.id,
+                    "status": job.status,
+                    "status_url": f"/api/ml/jobs/{job.id}",
+                    "stream_url": f"/api/ml/jobs/{job.id}/stream"
+                }), 202
             
-            # ✅ DEBUG OUTPUT
-            print(f"🔍 Raw logits: {outputs.logits}")
-            print(f"🔍 Predicted class: {predictions.cpu().numpy()[0]}")
-            print(f"🔍 All class probabilities: {confidence_scores}")
+            # Incremental mode: only comments changed since the user's last run are classified
+            incremental = str(data.get("incremental") or request.args.get("incremental") or "").lower() in ("1", "true", "yes")
+            if incremental:
+                user_id = get_optional_user_id()
+                if not user_id:
+                    raise PredictionError("Incremental mode requires login", 401)
+                payload = classify_issue_incremental(model_name, issue_url, user_id)
+            else:
+                payload = classify_issue(model_name, issue_url)
+            with trace.stage('serialize'):
+                response = jsonify(payload)
+            trace.finish(logger, status=200)
+            return response
             
-            # Get raw prediction
-            id2label = getattr(model.config, 'id2label', {0: "0", 1: "1", 2: "2"})
-            raw_prediction = id2label.get(predictions.cpu().numpy()[0], "0")
+        except PredictionError as e:
+            trace.finish(logger, status=e.status_code, error=e.message)
+            return jsonify({"error": e.message}), e.status_code
+        except Exception as e:
+            logger.exception(f"Prediction failed: {e}")
+            trace.finish(logger, logging.ERROR, status=500, error=str(e))
+            return jsonify({"error": str(e)}), 500
+
+def compare_issue(model_names, issue_url, ensemble=False):
+    """Fetch an issue once and classify it with every model; returns the /compare payload"""
+    trace = current_trace()
+    trace.set(models=','.join(model_names))
+    
+    issue_title, comments_data, issue_number = get_issue_data(issue_url, get_github_token())
+    if not comments_data:
+        raise PredictionError("No comments found or invalid URL")
+    
+    with trace.stage('model_load'):
+        loaded_models = [get_loaded_model(name) for name in model_names]
+    
+    batch_size = current_app.config.get('INFERENCE_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    token_budget = current_app.config.get('INFERENCE_TOKEN_BUDGET', DEFAULT_TOKEN_BUDGET)
+    workers = compare_workers(len(loaded_models), current_app.config.get('COMPARE_MAX_WORKERS'))
+    predictions, batching = compare_texts(loaded_models, [c["text"] for c in comments_data],
+                                          batch_size, token_budget, cache=prediction_cache, max_workers=workers)
+    
+    result, summary = build_comparison(comments_data, predictions, issue_number, ensemble)
+    for name in model_names:
+        COMMENTS_CLASSIFIED.inc(len(result), model=name)
+    trace.set(comments=len(result), workers=workers)
+    
+    payload = {
+        "result": result,
+        "models": model_names,
+        "issue_title": issue_title,
+        "issue_number": issue_number,
+        "total_comments": len(result),
+        "batching": batching,
+        "parallel_workers": workers
+    }
+    payload.update(summary)
+    return payload
+
+@ml_bp.route("/compare", methods=["POST"])
+@cross_origin(origins=["https://obscure-memory-w47jq5jx6p92g95x-8080.app.github.dev"], supports_credentials=True)
+def compare():
+    """Side-by-side classification of one issue with several models (optional ensemble vote)"""
+    with traced('compare') as trace:
+        try:
+            data = request.get_json() if request.is_json else request.form
             
-            print(f"🔍 id2label: {id2label}")
-            print(f"🔍 Raw prediction: {raw_prediction}")
+            model_names = data.get("model_names") or data.get("models") or []
+            if isinstance(model_names, str):
+                model_names = model_names.split(',')
+            model_names = list(dict.fromkeys(name.strip() for name in model_names if name and name.strip()))
+            issue_url = data.get("issue_url") or data.get("github_url") or data.get("issueUrl")
+            trace.set(issue_url=issue_url)
             
-            # ✅ MAP TO RESEARCH CATEGORIES
-            final_prediction = map_prediction_to_research_labels(raw_prediction)
+            if not issue_url or len(model_names) < 2:
+                trace.finish(logger, status=400)
+                return jsonify({"error": "issue_url and at least two model_names required"}), 400
+            if len(model_names) > MAX_COMPARE_MODELS:
+                trace.finish(logger, status=400)
+                return jsonify({"error": f"At most {MAX_COMPARE_MODELS} models can be compared"}), 400
+            unknown = [name for name in model_names if not is_registered_model(name)]
+            if unknown:
+                raise PredictionError(f"Unknown model: {', '.join(unknown)}", 404)
             
-            print(f"🔍 Final prediction: {final_prediction}")
-            print("="*50)
+            ensemble = str(data.get("ensemble") or "").lower() in ("1", "true", "yes")
+            payload = compare_issue(model_names, issue_url, ensemble)
+            with trace.stage('serialize'):
+                response = jsonify(payload)
+            trace.finish(logger, status=200)
+            return response
             
-            result.append({
-                "author": comment_data["author"],
-                "comment": comment_data["text"],
-                "prediction": final_prediction,  # ✅ Now returns NFR/FIR/Komen
-                "confidence": round(confidence, 3),  # ✅ Keep as decimal (0.0-1.0)
-                "issue_number": issue_number
-            })
-        
-        print(f"✅ Processed {len(result)} comments")
-        
-        return jsonify({
-            "result": result,
-            "issue_title": issue_title,
-            "issue_number": issue_number,
-            "total_comments": len(result)
-        })
+        except PredictionError as e:
+            trace.finish(logger, status=e.status_code, error=e.message)
+            return jsonify({"error": e.message}), e.status_code
+        except Exception as e:
+            logger.exception(f"Comparison failed: {e}")
+            trace.finish(logger, logging.ERROR, status=500, error=str(e))
+            return jsonify({"error": str(e)}), 500
+
+def stream_issue_predictions(model_name, issue_url, batch_size, token_budget):
+    """
+    Yield the issue metadata, then every classified comment as soon as its
+    micro-batch is done, then a summary. Comments are pulled from GitHub one
+    page at a time, so memory stays bounded by the page size.
+    """
+    parsed = parse_issue_url(issue_url)
+    if not parsed:
+        yield {"type": "error", "error": "No comments found or invalid URL"}
+        return
+    owner, repo, issue_number = parsed
+    
+    client = GitHubClient(get_github_token())
+    issue_data = client.fetch_issue(owner, repo, issue_number)
+    if issue_data is None:
+        yield {"type": "error", "error": "No comments found or invalid URL"}
+        return
+    
+    yield {"type": "meta", "issue_title": issue_data.get('title', 'No Title'), "issue_number": issue_number}
+    
+    loaded = get_loaded_model(model_name)
+    total = 0
+    
+    def classify_chunk(comments_data):
+        nonlocal total
+        for start in range(0, len(comments_data), batch_size):
+            rows, _ = classify_comments(loaded, comments_data[start:start + batch_size], issue_number,
+                                        batch_size, token_budget, cache=prediction_cache)
+            for row in rows:
+                row["index"] = total
+                total += 1
+                yield dict(row, type="comment")
+    
+    # Issue body first, then each page of comments
+    yield from classify_chunk(build_comments_data(issue_data, []))
+    for page in client.iter_comment_pages(owner, repo, issue_number):
+        yield from classify_chunk(build_comments_data({}, page))
+    
+    log_event(logger, logging.INFO, "predict_stream", model=model_name, issue_url=issue_url, comments=total)
+    yield {"type": "done", "total_comments": total, "issue_number": issue_number}
+
+@ml_bp.route("/predict/stream", methods=["POST"])
+@cross_origin(origins=["https://obscure-memory-w47jq5jx6p92g95x-8080.app.github.dev"], supports_credentials=True)
+def predict_stream():
+    """Streaming /predict: NDJSON lines (default) or Server-Sent Events with ?format=sse"""
+    data = request.get_json() if request.is_json else request.form
+    
+    model_name = data.get("model_name") or data.get("model") or data.get("modelName")
+    issue_url = data.get("issue_url") or data.get("github_url") or data.get("issueUrl")
+    if not issue_url or not model_name:
+        return jsonify({"error": "issue_url and model_name required"}), 400
+    if not is_registered_model(model_name):
+        return jsonify({"error": f"Unknown model: {model_name}"}), 404
+    
+    stream_format = (data.get("format") or request.args.get("format") or "ndjson").lower()
+    batch_size = current_app.config.get('INFERENCE_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    token_budget = current_app.config.get('INFERENCE_TOKEN_BUDGET', DEFAULT_TOKEN_BUDGET)
+    
+    def generate():
+        try:
+            for event in stream_issue_predictions(model_name, issue_url, batch_size, token_budget):
+                line = json.dumps(event, ensure_ascii=False)
+                yield f"event: {event['type']}\ndata: {line}\n\n" if stream_format == "sse" else line + "\n"
+        except Exception as e:
+            logger.exception(f"Streaming prediction failed: {e}")
+            error = json.dumps({"type": "error", "error": str(e)})
+            yield f"event: error\ndata: {error}\n\n" if stream_format == "sse" else error + "\n"
+    
+    mimetype = 'text/event-stream' if stream_format == "sse" else 'application/x-ndjson'
+    return Response(stream_with_context(generate()), mimetype=mimetype,
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def find_prediction_job(job_id):
+    """Job visible to the caller (jobs created with a token are private to that user)"""
+    from models.prediction_job import PredictionJob
+    
+    job = PredictionJob.query.get(job_id)
+    if job is None:
+        return None
+    if job.user_id is not None and str(job.user_id) != str(get_optional_user_id()):
+        return None
+    return job
+
+@ml_bp.route("/jobs/<int:job_id>", methods=["GET"])
+@cross_origin(origins=["https://obscure-memory-w47jq5jx6p92g95x-8080.app.github.dev"], supports_credentials=True)
+def get_prediction_job(job_id):
+    """Get status (and result once completed) of an async prediction job"""
+    try:
+        job = find_prediction_job(job_id)
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+        return jsonify(job.to_dict())
         
     except Exception as e:
-        print(f"❌ Error: {e}")
-        traceback.print_exc()
+        print(f"Error getting job: {e}")
         return jsonify({"error": str(e)}), 500
 
+@ml_bp.route("/jobs/<int:job_id>/stream", methods=["GET"])
+@cross_origin(origins=["https://obscure-memory-w47jq5jx6p92g95x-8080.app.github.dev"], supports_credentials=True)
+def stream_prediction_job(job_id):
+    """Server-Sent Events: status updates until the job finishes, then the result"""
+    job = find_prediction_job(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    
+    db = current_app.extensions['sqlalchemy']
+    from models.prediction_job import PredictionJob
+    poll_interval = current_app.config.get('JOB_POLL_INTERVAL', 0.5)
+    
+    def events():
+        last_status = None
+        while True:
+            # Fresh read every poll; the worker commits from another thread
+            db.session.expire_all()
+            job = db.session.get(PredictionJob, job_id)
+            if job.status != last_status:
+                last_status = job.status
+                yield f"event: status\ndata: {json.dumps({'job_id': job.id, 'status': job.status})}\n\n"
+            if job.done:
+                yield f"event: result\ndata: {json.dumps(job.to_dict(), ensure_ascii=False)}\n\n"
+                return
+            time.sleep(poll_interval)
+    
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @ml_bp.route("/save-history", methods=["POST"])
 @cross_origin(origins=["https://obscure-memory-w47jq5jx6p92g95x-8080.app.github.dev"], supports_credentials=True)
 @jwt_required()
+@HISTORY_SECONDS.time(route='save_history')
 def save_history():
     try:
         db = current_app.extensions['sqlalchemy']
         from models.classification_history import ClassificationHistory
+        from models.classification_result import parse_results_json
+        from models.classification_stat import ClassificationStat
         
         user_id = get_jwt_identity()
         data = request.get_json()
         
-        # Convert result to JSON string for database
-        results_json = data.get("result_json")
-        if isinstance(results_json, (dict, list)):
-            results_json = json.dumps(results_json, ensure_ascii=False)
+        # One row per classified comment (results_json kept as a mirror)
+        results = parse_results_json(data.get("result_json"))
         
         history = ClassificationHistory(
             user_id=user_id,
@@ -307,12 +818,12 @@ def save_history():
             issue_url=data.get("issue_url"),
             issue_title=data.get("issue_title"),
             issue_number=data.get("issue_number"),
-            result_count=len(json.loads(results_json)) if isinstance(results_json, str) else len(results_json),
-            results_json=results_json,
             status='completed'
         )
+        history.set_results(results)
 
         db.session.add(history)
+        ClassificationStat.apply(user_id, ClassificationStat.tally(history))
         db.session.commit()
 
         return jsonify({"message": "History saved", "history_id": history.id})
@@ -324,29 +835,25 @@ def save_history():
 @ml_bp.route("/my-history", methods=["GET"])
 @cross_origin(origins=["https://obscure-memory-w47jq5jx6p92g95x-8080.app.github.dev"], supports_credentials=True)
 @jwt_required()
+@HISTORY_SECONDS.time(route='my_history')
 def get_my_history():
     try:
         db = current_app.extensions['sqlalchemy']
         from models.classification_history import ClassificationHistory
         
         user_id = get_jwt_identity()
-        histories = ClassificationHistory.query.filter_by(user_id=user_id).order_by(
-            ClassificationHistory.timestamp.desc()
-        ).all()
-
-        result = []
-        for h in histories:
-            try:
-                result_data = json.loads(h.results_json) if isinstance(h.results_json, str) else h.results_json
-                history_dict = h.to_dict()
-                history_dict['results'] = result_data
-                result.append(history_dict)
-            except json.JSONDecodeError:
-                history_dict = h.to_dict()
-                history_dict['results'] = []
-                result.append(history_dict)
-
-        return jsonify({"histories": result, "total": len(result)})
+        limit = min(request.args.get('limit', 50, type=int), 200)
+        try:
+            histories, next_cursor = ClassificationHistory.keyset_page(
+                ClassificationHistory.summary_query(user_id), request.args.get('cursor'), limit
+            )
+        except ValueError:
+            return jsonify({"error": "Invalid cursor"}), 400
+
+        # Summaries only; full results come from /api/history/<id>
+        result = [h.summary_dict() for h in histories]
+
+        return jsonify({"histories": result, "total": len(result), "next_cursor": next_cursor})
 
     except Exception as e:
         print(f"Error getting history: {e}")
@@ -0,0 +1,115 @@
+#backend/ml/scheduler.py
+import threading
+import time
+
+from utils.instrumentation import current_trace
+from utils.metrics import metrics
+
+BATCH_GROUP_REQUESTS = metrics.histogram(
+    'batch_group_requests', 'Requests coalesced into one scheduler group', ('model',),
+    buckets=(1, 2, 4, 8, 16, 32, 64)
+)
+
+
+class _Group:
+    """Texts from concurrent requests for one model, classified together"""
+
+    def __init__(self, loaded, deadline):
+        self.loaded = loaded
+        self.deadline = deadline
+        self.texts = []
+        self.requests = 0
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.results = None
+        self.stats = None
+        self.error = None
+
+
+class MicroBatchScheduler:
+    """
+    Cross-request micro-batching. While another request for the same model
+    is in flight, the first new request opens a group and waits up to
+    ``window_ms`` (or until ``max_texts`` texts have joined); it then
+    classifies every text of the group in one batched pass and hands each
+    request its own slice. A request with nothing else in flight runs at
+    once, so the window only costs latency under concurrent load.
+    No extra thread: the opener does the work.
+    """
+
+    def __init__(self, window_ms=0, max_texts=64):
+        self.window_ms = window_ms
+        self.max_texts = max_texts
+        self._groups = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def configure(self, window_ms=None, max_texts=None):
+        if window_ms is not None:
+            self.window_ms = window_ms
+        if max_texts is not None:
+            self.max_texts = max_texts
+
+    @property
+    def enabled(self):
+        return self.window_ms > 0
+
+    def submit(self, loaded, texts, predict, batch_size, token_budget):
+        """Classify ``texts`` with ``predict(loaded, texts, batch_size, token_budget)``, sharing the pass"""
+        if not self.enabled or len(texts) >= self.max_texts:
+            return predict(loaded, texts, batch_size, token_budget)
+
+        key = (loaded.cache_key, loaded.engine, batch_size, token_budget)
+        with self._lock:
+            self._in_flight[key] = self._in_flight.get(key, 0) + 1
+            alone = self._in_flight[key] == 1
+        try:
+            if alone:
+                return predict(loaded, texts, batch_size, token_budget)
+            return self._submit_grouped(key, loaded, texts, predict, batch_size, token_budget)
+        finally:
+            with self._lock:
+                self._in_flight[key] -= 1
+                if not self._in_flight[key]:
+                    del self._in_flight[key]
+
+    def _submit_grouped(self, key, loaded, texts, predict, batch_size, token_budget):
+        with self._lock:
+            group = self._groups.get(key)
+            opener = group is None
+            if opener:
+                group = self._groups[key] = _Group(loaded, time.perf_counter() + self.window_ms / 1000)
+            offset = len(group.texts)
+            group.texts.extend(texts)
+            group.requests += 1
+            if len(group.texts) >= self.max_texts:
+                del self._groups[key]
+                group.full.set()
+
+        trace = current_trace()
+        with trace.stage('batch_wait'):
+            if opener:
+                group.full.wait(max(0.0, group.deadline - time.perf_counter()))
+                with self._lock:
+                    if self._groups.get(key) is group:
+                        del self._groups[key]
+            else:
+                group.done.wait()
+
+        if opener:
+            try:
+                group.results, group.stats = predict(group.loaded, group.texts, batch_size, token_budget)
+                group.stats['coalesced_requests'] = group.requests
+            except Exception as e:
+                group.error = e
+            finally:
+                BATCH_GROUP_REQUESTS.observe(group.requests, model=loaded.name)
+                group.done.set()
+
+        if group.error is not None:
+            raise group.error
+        trace.set(coalesced_requests=group.requests)
+        return group.results[offset:offset + len(texts)], dict(group.stats)
+
+
+micro_batcher = MicroBatchScheduler()
@@ -0,0 +1,296 @@
+#backend/ml/server.py
+"""
+Inference server: one process (or a small forked pool) owns the models and
+classifies texts for every Flask worker over a local socket.
+
+    cd backend
+    export INFERENCE_SERVER_AUTHKEY=$(python -c 'import secrets; print(secrets.token_hex(32))')
+    python -m ml.server --address instance/inference.sock --workers 2
+    INFERENCE_SERVER=instance/inference.sock gunicorn -w 8 'app:create_app()'
+
+Messages are pickled, so the socket is only as safe as its key: the server
+refuses to start without INFERENCE_SERVER_AUTHKEY, creates the Unix socket
+with mode 0600 and only listens on loopback TCP addresses unless
+--allow-remote is given.
+
+Models are loaded once in the parent before the pool is forked, so their
+weights are shared copy-on-write by the pool processes; memory grows with
+the number of models, not with the number of web workers.
+"""
+import argparse
+import gc
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+import traceback
+import uuid
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener
+
+from dotenv import load_dotenv
+
+from ml.registry import model_registry
+from ml.artifacts import artifact_store
+from ml.inference import classify_texts, DEFAULT_BATCH_SIZE, DEFAULT_TOKEN_BUDGET
+from ml.quantization import compare_inference_modes
+from ml.remote import parse_address, is_loopback, require_authkey
+from ml.scheduler import micro_batcher
+from ml.warmup import WARMUP_TEXTS, model_warmup
+from utils.instrumentation import configure_logging, get_logger, log_event
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+logger = get_logger('inference_server')
+
+
+class PoolPeers:
+    """
+    Control channel between the forked pool processes. The processes share
+    one listener, so a client request reaches only one of them: an evict is
+    relayed to every sibling and answered once all of them dropped the model.
+    Queues are created before the fork; process 0 is the parent.
+    """
+
+    def __init__(self, size, timeout=30):
+        self.inboxes = [multiprocessing.Queue() for _ in range(size)]
+        self.acks = [multiprocessing.Queue() for _ in range(size)]
+        self.timeout = timeout
+        self.index = 0
+        self.registry = None
+        self._lock = threading.Lock()
+
+    def start(self, index, registry=model_registry):
+        """Called in each process after the fork: answer evicts relayed by the siblings"""
+        self.index = index
+        self.registry = registry
+        threading.Thread(target=self._listen, daemon=True).start()
+
+    def _listen(self):
+        while True:
+            model_name, origin, request_id = self.inboxes[self.index].get()
+            self.acks[origin].put((request_id, self.registry.evict(model_name)))
+
+    def evict(self, model_name):
+        """Evict a model from every other pool process; True if any of them had it loaded"""
+        others = [i for i in range(len(self.inboxes)) if i != self.index]
+        with self._lock:
+            request_id = uuid.uuid4().hex
+            for i in others:
+                self.inboxes[i].put((model_name, self.index, request_id))
+            evicted = False
+            pending = len(others)
+            deadline = time.monotonic() + self.timeout
+            while pending:
+                try:
+                    ack_id, sibling_evicted = self.acks[self.index].get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    raise RuntimeError(f"Evict of {model_name} not confirmed by {pending} pool process(es)")
+                if ack_id == request_id:  # late acks of a timed-out evict are dropped
+                    pending -= 1
+                    evicted = evicted or sibling_evicted
+            return evicted
+
+
+class InferenceServer:
+    """Answers client requests ({'op': ...} dicts) from a model registry"""
+
+    def __init__(self, registry=model_registry, peers=None):
+        self.registry = registry
+        self.peers = peers
+
+    def handle(self, message):
+        op = message.get('op')
+        if op == 'classify':
+            loaded = self.registry.get(message['model'], message.get('inference_mode', 'fp32'),
+                                       message.get('engine', 'pytorch'))
+            predictions, stats = classify_texts(
+                loaded, message['texts'],
+                message.get('batch_size') or DEFAULT_BATCH_SIZE,
+                message.get('token_budget') or DEFAULT_TOKEN_BUDGET
+            )
+            return {'ok': True, 'predictions': predictions, 'stats': stats}
+        if op == 'load':
+            loaded = self.registry.get(message['model'], message.get('inference_mode', 'fp32'),
+                                       message.get('engine', 'pytorch'))
+            info = loaded.to_dict()
+            info['size_bytes'] = loaded.size_bytes
+            return {'ok': True, 'model': info}
+        if op == 'compare_modes':
+            engine = message.get('engine', 'pytorch')
+            report = compare_inference_modes(self.registry.get(message['model'], 'fp32', engine),
+                                             self.registry.get(message['model'], 'int8', engine),
+                                             message.get('texts'))
+            return {'ok': True, 'report': report}
+        if op == 'evict':
+            evicted = self.registry.evict(message['model'])
+            if self.peers is not None:
+                evicted = self.peers.evict(message['model']) or evicted
+            return {'ok': True, 'evicted': evicted}
+        if op == 'stats':
+            stats = self.registry.stats()
+            stats['pid'] = os.getpid()
+            return {'ok': True, 'stats': stats}
+        return {'ok': False, 'error': f"Unknown operation: {op}"}
+
+    def serve_connection(self, conn):
+        with conn:
+            while True:
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    reply = self.handle(message)
+                except Exception as e:
+                    traceback.print_exc()
+                    reply = {'ok': False, 'error': str(e)}
+                try:
+                    conn.send(reply)
+                except (EOFError, OSError):
+                    return
+
+    def serve_forever(self, listener):
+        """Accept clients on a (possibly shared) listener, one thread per connection"""
+        while True:
+            try:
+                conn = listener.accept()
+            except AuthenticationError:
+                print("⚠️ Inference server: rejected client with a wrong authkey")
+                continue
+            except OSError:
+                return
+            threading.Thread(target=self.serve_connection, args=(conn,), daemon=True).start()
+
+
+def limit_threads(threads):
+    """Split the cores between pool processes instead of oversubscribing them"""
+    if 'torch' in sys.modules:
+        sys.modules['torch'].set_num_threads(max(1, threads))
+
+
+def create_server_app():
+    """Bare Flask app, only used to read the AIModel table for preloading"""
+    from flask import Flask
+    from models import db
+    from models.engine import engine_options
+
+    app = Flask('app', root_path=BACKEND_DIR, instance_path=os.path.join(BACKEND_DIR, 'instance'))
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///db.sqlite3')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
+    db.init_app(app)
+    return app
+
+
+def preload(app, models):
+    """Load (but do not run) the selected models; forward passes happen after the fork"""
+    if not (models or '').strip():
+        return []
+    model_warmup.configure(models=models)
+    loaded = []
+    with app.app_context():
+        selected = model_warmup.selected_models()
+    for model_name, settings in selected:
+        try:
+            loaded.append(model_registry.get(model_name, settings['inference_mode'], settings['engine']))
+        except Exception as e:
+            print(f"❌ Preload failed for {model_name}: {e}")
+    return loaded
+
+
+def warm(loaded_models, passes):
+    for loaded in loaded_models:
+        for _ in range(passes):
+            classify_texts(loaded, WARMUP_TEXTS)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Model-owning inference server for the Flask workers")
+    parser.add_argument('--address', default=os.environ.get('INFERENCE_SERVER') or os.path.join('instance', 'inference.sock'),
+                        help="Unix socket path or host:port")
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('INFERENCE_SERVER_WORKERS', 1)),
+                        help="processes forked after preloading (share weights copy-on-write)")
+    parser.add_argument('--preload', default=os.environ.get('PRELOAD_MODELS', 'all'),
+                        help="'all', '' or comma-separated model names from AIModel")
+    parser.add_argument('--warmup-passes', type=int, default=int(os.environ.get('WARMUP_PASSES', 3)))
+    parser.add_argument('--allow-remote', action='store_true',
+                        default=os.environ.get('INFERENCE_SERVER_ALLOW_REMOTE', '0') == '1',
+                        help="allow listening on a non-loopback TCP address")
+    parser.add_argument('--max-mb', type=int, default=int(os.environ.get('MODEL_REGISTRY_MAX_MB', 4096)),
+                        help="model memory budget per process (0 = unlimited)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    load_dotenv()
+    args = parse_args(argv)
+    configure_logging(level=os.environ.get('LOG_LEVEL', 'INFO'))
+    model_registry.configure(max_bytes=args.max_mb * 1024 * 1024 or None)
+    artifact_store.configure(root=os.environ.get('MODEL_STORE_DIR') or os.path.join(BACKEND_DIR, 'instance', 'models'),
+                             offline=os.environ.get('MODEL_STORE_OFFLINE', '1') == '1')
+    micro_batcher.configure(window_ms=float(os.environ.get('INFERENCE_BATCH_WINDOW_MS', 5)),
+                            max_texts=int(os.environ.get('INFERENCE_BATCH_MAX_TEXTS', 64)))
+
+    try:
+        authkey = require_authkey(os.environ.get('INFERENCE_SERVER_AUTHKEY'))
+    except RuntimeError as e:
+        sys.exit(f"❌ {e}")
+    address = parse_address(args.address)
+    if not is_loopback(address) and not args.allow_remote:
+        sys.exit(f"❌ Refusing to listen on {args.address}: not a loopback address (use --allow-remote)")
+    if isinstance(address, str) and os.path.exists(address):
+        os.remove(address)  # stale socket from a previous run
+
+    # Socket file readable/writable by the server's user only
+    old_umask = os.umask(0o077)
+    try:
+        listener = Listener(address, authkey=authkey)
+    finally:
+        os.umask(old_umask)
+    if isinstance(address, str):
+        os.chmod(address, 0o600)
+
+    loaded = preload(create_server_app(), args.preload)
+    print(f"🧠 Inference server: {len(loaded)} model(s) preloaded, listening on {args.address}")
+
+    # Keep the preloaded objects out of the collector so children don't dirty shared pages
+    gc.freeze()
+    workers = max(1, args.workers) if hasattr(os, 'fork') else 1
+    peers = PoolPeers(workers) if workers > 1 else None
+    children = []
+    for index in range(1, workers):
+        pid = os.fork()
+        if pid == 0:
+            peers.start(index)
+            limit_threads((os.cpu_count() or 1) // workers)
+            warm(loaded, args.warmup_passes)
+            InferenceServer(peers=peers).serve_forever(listener)
+            os._exit(0)
+        children.append(pid)
+    if peers is not None:
+        peers.start(0)
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    limit_threads((os.cpu_count() or 1) // workers)
+    warm(loaded, args.warmup_passes)
+    log_event(logger, logging.INFO, "inference server ready", pid=os.getpid(), workers=workers, models=len(loaded))
+    try:
+        InferenceServer(peers=peers).serve_forever(listener)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, 15)
+            except OSError:
+                pass
+        listener.close()
+
+
+if __name__ == '__main__':
+    main()
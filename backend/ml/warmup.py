@@ -0,0 +1,145 @@
+#backend/ml/warmup.py
+import logging
+import threading
+import time
+import traceback
+from datetime import datetime
+
+from ml.registry import model_registry
+from ml.remote import inference_client
+from ml.inference import classify_texts
+from utils.instrumentation import get_logger, log_event
+
+logger = get_logger('warmup')
+
+DEFAULT_PASSES = 3
+
+# Short, medium and long inputs so each padded shape the kernels see is warmed once
+WARMUP_TEXTS = [
+    "Thanks, works now.",
+    "The login page freezes for a few seconds after submitting the form on slow connections.",
+    " ".join(["The export job runs out of memory when the report contains many large attachments."] * 25),
+]
+
+
+class ModelWarmup:
+    """
+    Startup phase that loads the models listed in AIModel into the registry
+    and runs a few dummy forward passes, in a background thread so the
+    server accepts traffic immediately. Per-model state backs /api/ml/ready.
+    """
+
+    def __init__(self, models='', passes=DEFAULT_PASSES):
+        self.models = models
+        self.passes = passes
+        self.started_at = None
+        self.finished_at = None
+        self.error = None
+        self._status = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def configure(self, models=None, passes=None):
+        if models is not None:
+            self.models = models
+        if passes is not None:
+            self.passes = passes
+
+    @property
+    def enabled(self):
+        return bool((self.models or '').strip())
+
+    def _set(self, model_name, **fields):
+        with self._lock:
+            self._status.setdefault(model_name, {}).update(fields)
+
+    def selected_models(self):
+        """(model_name, settings) pairs chosen by PRELOAD_MODELS ('all' or a comma-separated list)"""
+        from models.aimodels import AIModel
+
+        rows = AIModel.query.order_by(AIModel.id).all()
+        if self.models.strip().lower() != 'all':
+            wanted = {name.strip() for name in self.models.split(',') if name.strip()}
+            rows = [row for row in rows if row.huggingface_url in wanted or row.name in wanted]
+        return [(row.huggingface_url, row.settings_dict()) for row in rows]
+
+    def warm_model(self, model_name, inference_mode='fp32', engine='pytorch', batch_size=16, token_budget=8192):
+        self._set(model_name, status='loading', inference_mode=inference_mode, engine=engine)
+        started = time.perf_counter()
+        if inference_client.enabled:
+            loaded = inference_client.load(model_name, inference_mode, engine)
+        else:
+            loaded = model_registry.get(model_name, inference_mode, engine)
+        load_ms = (time.perf_counter() - started) * 1000
+
+        self._set(model_name, status='warming', load_ms=round(load_ms, 1))
+        started = time.perf_counter()
+        for _ in range(self.passes):
+            classify_texts(loaded, WARMUP_TEXTS, batch_size, token_budget, cache=None)
+        warmup_ms = (time.perf_counter() - started) * 1000
+
+        self._set(model_name, status='hot', warmup_ms=round(warmup_ms, 1), ready_at=datetime.utcnow().isoformat())
+        log_event(logger, logging.INFO, "model warm", model=model_name, mode=inference_mode, engine=engine,
+                  load_ms=load_ms, warmup_ms=warmup_ms)
+
+    def run(self, app):
+        with app.app_context():
+            try:
+                selected = self.selected_models()
+                for model_name, settings in selected:
+                    self._set(model_name, status='pending')
+
+                for model_name, settings in selected:
+                    try:
+                        self.warm_model(model_name, settings['inference_mode'], settings['engine'],
+                                        app.config.get('INFERENCE_BATCH_SIZE', 16),
+                                        app.config.get('INFERENCE_TOKEN_BUDGET', 8192))
+                    except Exception as e:
+                        print(f"❌ Warm-up failed for {model_name}: {e}")
+                        self._set(model_name, status='failed', error=str(e))
+            except Exception as e:
+                print(f"❌ Model warm-up failed: {e}")
+                traceback.print_exc()
+                self.error = str(e)
+            finally:
+                self.finished_at = datetime.utcnow()
+                app.extensions['sqlalchemy'].session.remove()
+                hot = sum(1 for state in self.status()['models'].values() if state.get('status') == 'hot')
+                print(f"🔥 Model warm-up finished: {hot} model(s) hot")
+
+    def start(self, app):
+        """Preload in a daemon thread (no-op when disabled or already running)"""
+        if not self.enabled or (self._thread is not None and self._thread.is_alive()):
+            return False
+        self.started_at = datetime.utcnow()
+        self.finished_at = None
+        self.error = None
+        self._thread = threading.Thread(target=self.run, args=(app,), name='model-warmup', daemon=True)
+        self._thread.start()
+        return True
+
+    def status(self):
+        with self._lock:
+            models = {name: dict(state) for name, state in self._status.items()}
+        # Models evicted since warm-up are no longer hot
+        is_loaded = inference_client.is_loaded if inference_client.enabled else model_registry.is_loaded
+        for name, state in models.items():
+            if state.get('status') == 'hot' and not is_loaded(
+                    name, state.get('inference_mode', 'fp32'), state.get('engine', 'pytorch')):
+                state['status'] = 'evicted'
+        done = not self.enabled or self.finished_at is not None
+        failed = sorted(name for name, state in models.items() if state.get('status') == 'failed')
+        return {
+            # Not ready while warming, nor when any selected model failed to load
+            'ready': done and not failed and self.error is None,
+            'enabled': self.enabled,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'hot_models': sorted(name for name, state in models.items() if state.get('status') == 'hot'),
+            'failed_models': failed,
+            'error': self.error,
+            'models': models,
+        }
+
+
+model_warmup = ModelWarmup()
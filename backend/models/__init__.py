@@ -7,4 +7,8 @@ db = SQLAlchemy()
 # Import all models here
 from .user import User
 from .classification_history import ClassificationHistory
-from .aimodels import AIModel  
\ No newline at end of file
+from .classification_result import ClassificationResult
+from .classification_stat import ClassificationStat
+from .aimodels import AIModel  
+from .bulk_job import BulkJob, BulkJobIssue
+from .prediction_job import PredictionJob
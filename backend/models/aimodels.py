@@ -2,9 +2,35 @@
 from models import db
 from datetime import datetime
 
+INFERENCE_MODES = ('fp32', 'int8')
+INFERENCE_ENGINES = ('pytorch', 'onnx')
+
 class AIModel(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     huggingface_url = db.Column(db.String(200), nullable=False)
     uploaded_by = db.Column(db.String(100), nullable=False)
-    uploaded_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
\ No newline at end of file
+    uploaded_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    # Inference settings
+    inference_mode = db.Column(db.String(20), nullable=False, default='fp32', server_default='fp32')  # fp32 or int8
+    engine = db.Column(db.String(20), nullable=False, default='pytorch', server_default='pytorch')  # pytorch or onnx
+    
+    # Local artifact store entry (ml/artifacts.py), recorded when the model is fetched
+    artifact_size_bytes = db.Column(db.BigInteger, nullable=True)
+    artifact_sha256 = db.Column(db.String(64), nullable=True)
+    
+    def settings_dict(self):
+        return {
+            'model_name': self.huggingface_url,
+            'inference_mode': self.inference_mode or 'fp32',
+            'engine': self.engine or 'pytorch',
+            'artifact_sha256': self.artifact_sha256,
+        }
+    
+    def artifact_dict(self):
+        return {
+            'model_name': self.huggingface_url,
+            'size_bytes': self.artifact_size_bytes,
+            'sha256': self.artifact_sha256,
+        }
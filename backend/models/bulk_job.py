@@ -0,0 +1,75 @@
+# models/bulk_job.py
+
+from models import db
+from datetime import datetime
+import json
+
+class BulkJob(db.Model):
+    __tablename__ = 'bulk_job'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+    
+    # What to classify
+    repo = db.Column(db.String(200), nullable=False)  # owner/repo
+    model_name = db.Column(db.String(255), nullable=False)
+    filters_json = db.Column(db.Text, nullable=False, default='{}')  # state, labels, since, created_after, created_before
+    
+    # Progress
+    status = db.Column(db.String(50), default='queued', nullable=False)  # queued, running, cancelling, cancelled, completed, failed
+    enumerated = db.Column(db.Boolean, default=False, nullable=False)  # issue list stored in bulk_job_issue
+    total_issues = db.Column(db.Integer, default=0, nullable=False)
+    processed_issues = db.Column(db.Integer, default=0, nullable=False)
+    failed_issues = db.Column(db.Integer, default=0, nullable=False)
+    classified_comments = db.Column(db.Integer, default=0, nullable=False)
+    error = db.Column(db.Text, nullable=True)
+    
+    # Lease of the process running the job (jobs/lease.py)
+    owner = db.Column(db.String(100), nullable=True)
+    heartbeat = db.Column(db.DateTime, nullable=True)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    
+    issues = db.relationship('BulkJobIssue', backref='job', lazy='dynamic', cascade='all, delete-orphan')
+    
+    @property
+    def filters(self):
+        return json.loads(self.filters_json) if self.filters_json else {}
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'repo': self.repo,
+            'model_name': self.model_name,
+            'filters': self.filters,
+            'status': self.status,
+            'total_issues': self.total_issues,
+            'processed_issues': self.processed_issues,
+            'failed_issues': self.failed_issues,
+            'classified_comments': self.classified_comments,
+            'progress': round(self.processed_issues / self.total_issues, 4) if self.total_issues else 0.0,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class BulkJobIssue(db.Model):
+    __tablename__ = 'bulk_job_issue'
+    __table_args__ = (
+        db.UniqueConstraint('job_id', 'issue_number', name='uq_bulk_job_issue'),
+        db.Index('ix_bulk_job_issue_job_status', 'job_id', 'status'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('bulk_job.id'), nullable=False)
+    issue_number = db.Column(db.String(50), nullable=False)
+    issue_url = db.Column(db.Text, nullable=False)
+    issue_title = db.Column(db.Text, nullable=True)
+    status = db.Column(db.String(50), default='pending', nullable=False)  # pending, done, failed
+    comment_count = db.Column(db.Integer, default=0, nullable=False)
+    history_id = db.Column(db.Integer, db.ForeignKey('classification_history.id'), nullable=True)
@@ -2,6 +2,9 @@
 
 from models import db
 from datetime import datetime
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import load_only
+import base64
 import json
 
 class ClassificationHistory(db.Model):
@@ -23,18 +26,37 @@ class ClassificationHistory(db.Model):
     
     # Results
     result_count = db.Column(db.Integer, nullable=False)
-    results_json = db.Column(db.Text, nullable=False)  # JSON string of classification results
+    results_json = db.deferred(db.Column(db.Text, nullable=False))  # JSON mirror of the rows; loaded only on access
     
     # Status
     status = db.Column(db.String(50), default='completed', nullable=False)  # completed, failed, partial
     
     # Relationships
     user = db.relationship('User', backref=db.backref('classification_history', lazy=True))
+    results = db.relationship('ClassificationResult', backref='history', order_by='ClassificationResult.position',
+                              cascade='all, delete-orphan')
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
     
-    def to_dict(self):
+    def set_results(self, results):
+        """Replace the per-comment rows (results_json is kept as a mirror for older clients)"""
+        from models.classification_result import ClassificationResult
+        self.results = [ClassificationResult.from_result(item, position, self.model_name)
+                        for position, item in enumerate(results)]
+        # Mirror the normalized rows, never the raw payload
+        self.refresh_mirror()
+    
+    def refresh_mirror(self):
+        """Recompute result_count and results_json after rows were changed in place"""
+        self.result_count = len(self.results)
+        self.results_json = json.dumps(self.results_list(), ensure_ascii=False)
+    
+    def results_list(self):
+        return [row.to_dict() for row in self.results]
+    
+    def summary_dict(self):
+        """Metadata only - what list views need; never touches the results"""
         return {
         'id': self.id,
         'user_id': self.user_id,
@@ -46,12 +68,54 @@ class ClassificationHistory(db.Model):
         'issue_title': self.issue_title,
         'issue_number': self.issue_number,
         'result_count': self.result_count,
-        'results_json': self.results_json,  # ← ADD THIS LINE
-        'results': json.loads(self.results_json) if self.results_json else [],
         'status': self.status,
         'total_comments': self.result_count,
     }
     
+    def to_dict(self):
+        results = self.results_list()
+        data = self.summary_dict()
+        data['results_json'] = results  # the frontend accepts the list as well as a JSON string
+        data['results'] = results
+        return data
+    
+    @classmethod
+    def summary_query(cls, user_id):
+        """A user's histories, newest first, selecting only the summary columns"""
+        return cls.query.filter_by(user_id=user_id).options(load_only(
+            cls.id, cls.user_id, cls.timestamp, cls.model_name, cls.model_type, cls.source_type,
+            cls.issue_url, cls.issue_title, cls.issue_number, cls.result_count, cls.status
+        ))
+    
+    @staticmethod
+    def encode_cursor(item):
+        raw = f"{item.timestamp.isoformat()}|{item.id}"
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+    
+    @staticmethod
+    def decode_cursor(cursor):
+        """(timestamp, id) from a cursor; raises ValueError if it is malformed"""
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        timestamp, _, item_id = raw.partition('|')
+        return datetime.fromisoformat(timestamp), int(item_id)
+    
+    @classmethod
+    def keyset_page(cls, query, cursor=None, limit=20):
+        """
+        Page through ``query`` by (timestamp, id) descending, starting after ``cursor``.
+        No OFFSET and no COUNT, so deep pages cost the same as the first one.
+        Returns (items, next_cursor or None).
+        """
+        if cursor:
+            timestamp, item_id = cls.decode_cursor(cursor)
+            query = query.filter(or_(
+                cls.timestamp < timestamp,
+                and_(cls.timestamp == timestamp, cls.id < item_id)
+            ))
+        items = query.order_by(cls.timestamp.desc(), cls.id.desc()).limit(limit + 1).all()
+        next_cursor = cls.encode_cursor(items[limit - 1]) if len(items) > limit else None
+        return items[:limit], next_cursor
+    
     @classmethod
     def create_from_classification(cls, model_name, model_type, issue_url, issue_title, 
                                  classification_results, user_id=None):
@@ -68,13 +132,13 @@ class ClassificationHistory(db.Model):
         
         
         
-        return cls(
+        history = cls(
             user_id=user_id,
             model_name=model_name,
             model_type=model_type,
             issue_url=issue_url,
             issue_title=issue_title,
             issue_number=issue_number,
-            result_count=len(classification_results),
-            results_json=json.dumps(classification_results, ensure_ascii=False),
-        )
\ No newline at end of file
+        )
+        history.set_results(classification_results)
+        return history
\ No newline at end of file
@@ -0,0 +1,92 @@
+# models/classification_result.py
+
+import json
+from models import db
+from ml.cache import text_hash
+
+
+def _first(item, *keys):
+    for key in keys:
+        if item.get(key) not in (None, ''):
+            return item[key]
+    return None
+
+
+def normalize_confidence(value):
+    """
+    Confidence as a 0..1 float. The frontend sends percentages (0..100) and
+    legacy results_json blobs store them, so anything above 1 is scaled down.
+    """
+    if value is None:
+        return None
+    try:
+        confidence = float(str(value).rstrip('%')) if isinstance(value, str) else float(value)
+    except ValueError:
+        return None
+    return confidence / 100.0 if confidence > 1 else confidence
+
+
+def parse_results_json(results_json):
+    """Result rows from a stored results_json blob (list, or {'predictions'|'results': [...]})"""
+    try:
+        items = json.loads(results_json) if isinstance(results_json, str) else results_json
+    except ValueError:
+        return []
+    if isinstance(items, dict):
+        items = items.get('predictions') or items.get('results') or []
+    return [item for item in items or [] if isinstance(item, dict)]
+
+
+class ClassificationResult(db.Model):
+    """One classified comment of a ClassificationHistory entry"""
+    __tablename__ = 'classification_result'
+
+    id = db.Column(db.Integer, primary_key=True)
+    history_id = db.Column(db.Integer, db.ForeignKey('classification_history.id', ondelete='CASCADE'),
+                           nullable=False, index=True)
+    position = db.Column(db.Integer, nullable=False)  # order of the comment in the issue thread
+
+    # Copied from the parent so "all NFR comments of model X" needs no join
+    model_name = db.Column(db.String(255), nullable=False)
+    issue_number = db.Column(db.String(50), nullable=True)
+
+    comment_id = db.Column(db.BigInteger, nullable=True)  # GitHub comment id (0 = issue body), None for old rows
+    author = db.Column(db.String(255), nullable=True)
+    comment = db.Column(db.Text, nullable=True)
+    text_hash = db.Column(db.String(64), nullable=True)
+    prediction = db.Column(db.String(100), nullable=False, index=True)
+    confidence = db.Column(db.Float, nullable=True)
+    edited = db.Column(db.Boolean, default=False, nullable=False)  # changed by hand via /history/<id>/update
+
+    __table_args__ = (
+        db.Index('ix_classification_result_model_prediction', 'model_name', 'prediction'),
+    )
+
+    @classmethod
+    def from_result(cls, item, position, model_name):
+        """Build a row from a /predict result (or an edited row sent back by the frontend)"""
+        comment = _first(item, 'comment', 'text', 'body')
+        return cls(
+            position=position,
+            model_name=model_name or '',
+            issue_number=str(item['issue_number']) if item.get('issue_number') is not None else None,
+            comment_id=item.get('comment_id') if isinstance(item.get('comment_id'), int) else None,
+            author=_first(item, 'author'),
+            comment=comment,
+            text_hash=text_hash(comment) if comment else None,
+            prediction=_first(item, 'prediction', 'top_prediction', 'label') or 'unknown',
+            confidence=normalize_confidence(_first(item, 'confidence')),
+            edited=bool(item.get('edited', False)),
+        )
+
+    def to_dict(self):
+        return {
+            'id': f"comment_{self.position}",
+            'author': self.author,
+            'comment': self.comment,
+            'prediction': self.prediction,
+            'confidence': self.confidence,
+            'issue_number': self.issue_number,
+            'comment_id': self.comment_id,
+            'edited': self.edited,
+        }
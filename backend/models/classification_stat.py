@@ -0,0 +1,67 @@
+# models/classification_stat.py
+
+from datetime import datetime
+from models import db
+from utils.github_api import parse_issue_url
+
+
+def history_key(history):
+    """(model, 'owner/repo', day) a history is counted under"""
+    parsed = parse_issue_url(history.issue_url or '')
+    repository = f"{parsed[0]}/{parsed[1]}" if parsed else ''
+    return history.model_name, repository, (history.timestamp or datetime.utcnow()).date()
+
+
+class ClassificationStat(db.Model):
+    """
+    Running per-user label counters, one row per (model, repository, day,
+    label). Kept up to date by every write to a history so /history/stats
+    aggregates a few counter rows instead of every classified comment.
+    """
+    __tablename__ = 'classification_stat'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    model_name = db.Column(db.String(255), nullable=False)
+    repository = db.Column(db.String(255), nullable=False, default='')
+    day = db.Column(db.Date, nullable=False)
+    prediction = db.Column(db.String(100), nullable=False)
+    comment_count = db.Column(db.Integer, nullable=False, default=0)
+    confidence_sum = db.Column(db.Float, nullable=False, default=0.0)
+
+    __table_args__ = (
+        db.Index('ix_classification_stat_key', 'user_id', 'model_name', 'repository', 'day', 'prediction'),
+        db.Index('ix_classification_stat_user_day', 'user_id', 'day'),
+    )
+
+    @staticmethod
+    def tally(history):
+        """Counter key of a history and its {label: [comments, confidence sum]}, from the rows in memory"""
+        labels = {}
+        for row in history.results:
+            entry = labels.setdefault(row.prediction, [0, 0.0])
+            entry[0] += 1
+            entry[1] += row.confidence or 0.0
+        return history_key(history), labels
+
+    @classmethod
+    def apply(cls, user_id, tally, sign=1):
+        """Add (sign=1) or remove (sign=-1) a tally; part of the caller's transaction"""
+        if user_id is None:
+            return
+        (model_name, repository, day), labels = tally
+        for prediction, (count, confidence_sum) in labels.items():
+            key = dict(user_id=int(user_id), model_name=model_name, repository=repository,
+                       day=day, prediction=prediction)
+            updated = cls.query.filter_by(**key).update({
+                cls.comment_count: cls.comment_count + sign * count,
+                cls.confidence_sum: cls.confidence_sum + sign * confidence_sum,
+            }, synchronize_session=False)
+            if not updated:
+                db.session.add(cls(comment_count=sign * count, confidence_sum=sign * confidence_sum, **key))
+
+    @classmethod
+    def replace(cls, user_id, before, history):
+        """Swap a history's old tally for its current one (relabels, incremental runs)"""
+        cls.apply(user_id, before, -1)
+        cls.apply(user_id, cls.tally(history))
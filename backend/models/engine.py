@@ -0,0 +1,38 @@
+# models/engine.py
+
+from sqlalchemy import event
+
+
+def engine_options(database_uri, busy_timeout_ms=5000, pool_size=10, max_overflow=20, pool_recycle=1800):
+    """SQLALCHEMY_ENGINE_OPTIONS for the configured database"""
+    if database_uri.startswith('sqlite'):
+        # sqlite3 waits this long for a write lock instead of failing with "database is locked"
+        return {'connect_args': {'timeout': busy_timeout_ms / 1000}}
+    return {
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'pool_pre_ping': True,  # drop connections the server closed while idle
+        'pool_recycle': pool_recycle,
+    }
+
+
+def configure_engine(db, busy_timeout_ms=5000, journal_mode='WAL'):
+    """
+    Per-connection SQLite settings: WAL lets history reads run while a
+    save-history write is in progress, busy_timeout makes writers queue
+    instead of failing. Must run before the first connection is opened.
+    """
+    engine = db.engine
+    if engine.dialect.name != 'sqlite':
+        return
+    in_memory = engine.url.database in (None, '', ':memory:')
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if journal_mode and not in_memory:
+            cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+            if journal_mode.upper() == 'WAL':
+                cursor.execute("PRAGMA synchronous=NORMAL")  # safe with WAL, one fsync per checkpoint
+        cursor.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        cursor.close()
@@ -0,0 +1,200 @@
+# models/migrations.py
+
+import time
+from datetime import datetime
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import load_only
+
+
+def _column_names(db, table):
+    return [column['name'] for column in inspect(db.engine).get_columns(table)]
+
+
+def _add_column(db, table, column, ddl):
+    """ALTER TABLE ... ADD COLUMN unless db.create_all() already created it"""
+    if column not in _column_names(db, table):
+        db.session.execute(text(f"ALTER TABLE {table} ADD COLUMN {ddl}"))
+
+
+def add_ai_model_inference_mode(db):
+    _add_column(db, 'ai_model', 'inference_mode', "inference_mode VARCHAR(20) NOT NULL DEFAULT 'fp32'")
+
+
+def add_ai_model_engine(db):
+    _add_column(db, 'ai_model', 'engine', "engine VARCHAR(20) NOT NULL DEFAULT 'pytorch'")
+
+
+def backfill_classification_results(db, chunk_size=200):
+    """Split every existing results_json blob into classification_result rows"""
+    from models import ClassificationHistory, ClassificationResult
+    from models.classification_result import parse_results_json
+
+    done = {row[0] for row in db.session.query(ClassificationResult.history_id).distinct()}
+    ids = [row[0] for row in db.session.query(ClassificationHistory.id).order_by(ClassificationHistory.id)
+           if row[0] not in done]
+
+    for start in range(0, len(ids), chunk_size):
+        histories = db.session.query(
+            ClassificationHistory.id, ClassificationHistory.model_name, ClassificationHistory.results_json
+        ).filter(ClassificationHistory.id.in_(ids[start:start + chunk_size])).all()
+
+        rows = []
+        for history_id, model_name, results_json in histories:
+            for position, item in enumerate(parse_results_json(results_json)):
+                row = ClassificationResult.from_result(item, position, model_name)
+                row.history_id = history_id
+                rows.append(row)
+        db.session.bulk_save_objects(rows)
+        db.session.flush()
+    print(f"📦 Backfilled classification results for {len(ids)} histories")
+
+
+def add_classification_result_comment_id(db):
+    _add_column(db, 'classification_result', 'comment_id', "comment_id BIGINT")
+
+
+def add_ai_model_artifact_columns(db):
+    _add_column(db, 'ai_model', 'artifact_size_bytes', "artifact_size_bytes BIGINT")
+    _add_column(db, 'ai_model', 'artifact_sha256', "artifact_sha256 VARCHAR(64)")
+
+
+def add_classification_history_indexes(db):
+    # Every history list filters by user and orders by time; incremental runs look up (issue, model)
+    for name, columns in (
+        ('ix_classification_history_user_timestamp', 'user_id, timestamp'),
+        ('ix_classification_history_user_model', 'user_id, model_name'),
+        ('ix_classification_history_issue_model', 'issue_url, model_name'),
+    ):
+        db.session.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON classification_history ({columns})"))
+
+
+def backfill_classification_stats(db):
+    """Counters for the histories saved before /history/stats existed"""
+    from sqlalchemy import func
+    from models.classification_history import ClassificationHistory
+    from models.classification_result import ClassificationResult
+    from models.classification_stat import ClassificationStat, history_key
+
+    if ClassificationStat.query.first() is not None:
+        return
+    rows = db.session.query(
+        ClassificationHistory, ClassificationResult.prediction,
+        func.count(ClassificationResult.id), func.sum(func.coalesce(ClassificationResult.confidence, 0.0))
+    ).join(ClassificationResult, ClassificationResult.history_id == ClassificationHistory.id).filter(
+        ClassificationHistory.user_id.isnot(None)
+    ).group_by(ClassificationHistory.id, ClassificationResult.prediction).options(load_only(
+        ClassificationHistory.user_id, ClassificationHistory.model_name,
+        ClassificationHistory.issue_url, ClassificationHistory.timestamp
+    ))
+
+    counters = {}
+    for history, prediction, count, confidence_sum in rows:
+        key = (history.user_id,) + history_key(history) + (prediction,)
+        entry = counters.setdefault(key, [0, 0.0])
+        entry[0] += count
+        entry[1] += confidence_sum or 0.0
+    for (user_id, model_name, repository, day, prediction), (count, confidence_sum) in counters.items():
+        db.session.add(ClassificationStat(user_id=user_id, model_name=model_name, repository=repository, day=day,
+                                          prediction=prediction, comment_count=count, confidence_sum=confidence_sum))
+    print(f"📦 Built {len(counters)} history stat counters")
+
+
+def add_job_lease_columns(db):
+    _add_column(db, 'bulk_job', 'owner', "owner VARCHAR(100)")
+    _add_column(db, 'bulk_job', 'heartbeat', "heartbeat TIMESTAMP")
+
+
+def add_prediction_job_lease_columns(db):
+    _add_column(db, 'prediction_job', 'owner', "owner VARCHAR(100)")
+    _add_column(db, 'prediction_job', 'heartbeat', "heartbeat TIMESTAMP")
+
+
+def normalize_result_confidences(db):
+    """Percent confidences (frontend saves, legacy blobs) stored before ingest normalized them"""
+    from models.classification_stat import ClassificationStat
+
+    updated = db.session.execute(text(
+        "UPDATE classification_result SET confidence = confidence / 100.0 WHERE confidence > 1"
+    )).rowcount
+    # The counters summed the raw values: rebuild them from the corrected rows
+    ClassificationStat.query.delete(synchronize_session=False)
+    backfill_classification_stats(db)
+    print(f"📦 Normalized {updated} percent confidences")
+
+
+# (version, name, upgrade function) - append only, never reorder
+MIGRATIONS = [
+    (1, 'ai_model.inference_mode', add_ai_model_inference_mode),
+    (2, 'ai_model.engine', add_ai_model_engine),
+    (3, 'classification_result backfill', backfill_classification_results),
+    (4, 'classification_result.comment_id', add_classification_result_comment_id),
+    (5, 'ai_model artifact size/checksum', add_ai_model_artifact_columns),
+    (6, 'classification_history composite indexes', add_classification_history_indexes),
+    (7, 'classification_stat backfill', backfill_classification_stats),
+    (8, 'bulk_job owner/heartbeat lease', add_job_lease_columns),
+    (9, 'prediction_job owner/heartbeat lease', add_prediction_job_lease_columns),
+    (10, 'classification_result confidence 0..1', normalize_result_confidences),
+]
+
+
+# Arbitrary key for the Postgres advisory lock serializing migrations
+MIGRATION_LOCK_KEY = 72_105_001
+
+
+def _lock_migrations(db, wait_seconds=600):
+    """
+    Hold a database-wide lock until the current transaction ends, so gunicorn
+    workers starting together apply each migration once. SQLite: BEGIN
+    IMMEDIATE takes the write lock (must be the transaction's first statement);
+    Postgres: a transaction-scoped advisory lock.
+    """
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        db.session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {'key': MIGRATION_LOCK_KEY})
+        return
+    if dialect != 'sqlite':
+        return
+    deadline = time.monotonic() + wait_seconds
+    while True:
+        try:
+            db.session.execute(text("BEGIN IMMEDIATE"))
+            return
+        except OperationalError as e:
+            # busy_timeout ran out while another worker runs a long data migration
+            db.session.rollback()
+            if 'locked' not in str(e) or time.monotonic() > deadline:
+                raise
+
+
+def run_migrations(db):
+    """Apply every migration newer than the recorded schema version (safe to run from parallel workers)"""
+    db.session.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "version INTEGER PRIMARY KEY, name VARCHAR(200) NOT NULL, applied_at VARCHAR(50) NOT NULL)"
+    ))
+    db.session.commit()
+
+    applied = {row[0] for row in db.session.execute(text("SELECT version FROM schema_migrations"))}
+    db.session.commit()
+    for version, name, upgrade in MIGRATIONS:
+        if version in applied:
+            continue
+        try:
+            # One transaction per migration, under the lock; another worker may
+            # have applied it while we waited
+            _lock_migrations(db)
+            if db.session.execute(text("SELECT 1 FROM schema_migrations WHERE version = :v"),
+                                  {'v': version}).first():
+                db.session.commit()
+                continue
+            upgrade(db)
+            db.session.execute(
+                text("INSERT INTO schema_migrations (version, name, applied_at) VALUES (:v, :n, :t)"),
+                {'v': version, 'n': name, 't': datetime.utcnow().isoformat()}
+            )
+            db.session.commit()
+            print(f"✅ Applied migration {version}: {name}")
+        except Exception:
+            db.session.rollback()
+            raise
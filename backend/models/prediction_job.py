@@ -0,0 +1,47 @@
+# models/prediction_job.py
+
+from models import db
+from datetime import datetime
+import json
+
+class PredictionJob(db.Model):
+    __tablename__ = 'prediction_job'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)  # Optional for guest users
+    
+    # Request
+    model_name = db.Column(db.String(255), nullable=False)
+    issue_url = db.Column(db.Text, nullable=False)
+    
+    # State
+    status = db.Column(db.String(50), default='queued', nullable=False, index=True)  # queued, running, completed, failed
+    result_json = db.Column(db.Text, nullable=True)  # same payload the synchronous /predict returns
+    error = db.Column(db.Text, nullable=True)
+    
+    # Lease of the process running the job (jobs/lease.py)
+    owner = db.Column(db.String(100), nullable=True)
+    heartbeat = db.Column(db.DateTime, nullable=True)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    
+    @property
+    def done(self):
+        return self.status in ('completed', 'failed')
+    
+    def to_dict(self, include_result=True):
+        data = {
+            'job_id': self.id,
+            'model_name': self.model_name,
+            'issue_url': self.issue_url,
+            'status': self.status,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+        if include_result and self.result_json:
+            data['result'] = json.loads(self.result_json)
+        return data
@@ -0,0 +1,51 @@
+# backend/tests/conftest.py
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """App on a throwaway SQLite file, no caches on disk, no preloading, no inference server"""
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'test.sqlite3'}")
+    monkeypatch.setenv('GITHUB_CACHE_DB', '')
+    monkeypatch.setenv('PREDICTION_CACHE_DB', '')
+    monkeypatch.setenv('PRELOAD_MODELS', '')
+    monkeypatch.setenv('INFERENCE_SERVER', '')
+    monkeypatch.setenv('INFERENCE_BATCH_WINDOW_MS', '0')
+    monkeypatch.setenv('LOG_LEVEL', 'WARNING')
+    monkeypatch.setenv('JWT_SECRET_KEY', 'test-jwt-secret-key-of-at-least-32-bytes')
+
+    from app import create_app
+    from ml.cache import prediction_cache
+    from models import db
+
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        yield app
+        db.session.remove()
+    with prediction_cache._lock:
+        prediction_cache._memory.clear()
+
+
+@pytest.fixture
+def user(app):
+    from models import db, User
+
+    user = User(name='tester', email='tester@example.com', password='x', role='USER')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def auth_headers(app, user):
+    from flask_jwt_extended import create_access_token
+
+    return {'Authorization': f"Bearer {create_access_token(identity=str(user.id))}"}
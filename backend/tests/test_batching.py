@@ -0,0 +1,58 @@
+# backend/tests/test_batching.py
+import pytest
+
+from ml.inference import plan_batches, padding_stats
+
+
+def assert_valid_plan(lengths, batches, token_budget, max_batch_size):
+    assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+    for batch in batches:
+        assert len(batch) <= max_batch_size
+        # A single row longer than the budget still gets a batch of its own
+        assert len(batch) == 1 or len(batch) * max(lengths[i] for i in batch) <= token_budget
+
+
+def test_rows_are_bucketed_by_length():
+    lengths = [500, 10, 12, 480, 11, 490]
+
+    batches = plan_batches(lengths, token_budget=1000, max_batch_size=16)
+
+    assert batches == [[1, 4, 2], [3, 5], [0]]
+    assert_valid_plan(lengths, batches, 1000, 16)
+
+
+def test_batches_respect_the_row_limit():
+    lengths = [5] * 10
+
+    batches = plan_batches(lengths, token_budget=10000, max_batch_size=4)
+
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+
+
+def test_row_over_budget_is_alone():
+    lengths = [20, 3000, 25]
+
+    batches = plan_batches(lengths, token_budget=512, max_batch_size=16)
+
+    assert batches == [[0, 2], [1]]
+
+
+@pytest.mark.parametrize('token_budget, max_batch_size', [(64, 2), (512, 8), (8192, 16), (100000, 64)])
+def test_plan_is_valid_for_mixed_lengths(token_budget, max_batch_size):
+    lengths = [(i * 37) % 509 + 1 for i in range(200)]
+
+    batches = plan_batches(lengths, token_budget, max_batch_size)
+
+    assert_valid_plan(lengths, batches, token_budget, max_batch_size)
+
+
+def test_bucketing_pads_less_than_one_batch():
+    lengths = [4, 400, 6, 380, 5]
+
+    stats = padding_stats(lengths, plan_batches(lengths, token_budget=1000, max_batch_size=16))
+
+    assert stats['pad_tokens_saved'] > 0
+
+
+def test_empty_input():
+    assert plan_batches([], 8192, 16) == []
@@ -0,0 +1,96 @@
+# backend/tests/test_bulk_jobs.py
+import pytest
+
+import jobs.bulk as bulk
+import jobs.routes as job_routes
+import ml.routes as ml_routes
+from fakes import WordCountModel
+from models import db, BulkJob, BulkJobIssue, ClassificationHistory
+from utils.github_api import GitHubError
+
+
+class FlakyGitHub:
+    """GitHubClient stand-in: every issue has two comments, the listed issues fail once"""
+
+    failures = set()
+
+    def __init__(self, token=None):
+        pass
+
+    def fetch_issue_with_comments(self, owner, repo, number):
+        if number in self.failures:
+            self.failures.discard(number)
+            raise GitHubError(f"HTTP 502 for issue {number}")
+        issue = {'number': int(number), 'title': f"Issue {number}", 'body': f"body of issue {number}",
+                 'user': {'login': 'author'}}
+        comments = [{'id': int(number) * 100 + i, 'body': f"comment {i} of issue {number}",
+                     'user': {'login': 'someone'}} for i in range(2)]
+        return issue, comments
+
+
+@pytest.fixture
+def job(app, user, monkeypatch):
+    monkeypatch.setattr(bulk, 'GitHubClient', FlakyGitHub)
+    monkeypatch.setattr(ml_routes, 'get_loaded_model', lambda model_name: WordCountModel(model_name))
+    monkeypatch.setattr(job_routes, 'start_bulk_job', lambda app, job_id: True)
+    FlakyGitHub.failures = {'2'}
+
+    job = BulkJob(user_id=user.id, repo='octo/repo', model_name='test/word-count-model', enumerated=True,
+                  total_issues=3, status='queued')
+    db.session.add(job)
+    db.session.flush()
+    for number in ('1', '2', '3'):
+        db.session.add(BulkJobIssue(job_id=job.id, issue_number=number,
+                                    issue_url=f"https://github.com/octo/repo/issues/{number}"))
+    db.session.commit()
+    return job
+
+
+def issue_statuses(job):
+    return {row.issue_number: row.status for row in BulkJobIssue.query.filter_by(job_id=job.id)}
+
+
+def test_failed_fetch_marks_only_that_issue(job):
+    bulk.run_bulk_job(job.id)
+    db.session.refresh(job)
+
+    assert job.status == 'completed'
+    assert (job.processed_issues, job.failed_issues) == (3, 1)
+    assert issue_statuses(job) == {'1': 'done', '2': 'failed', '3': 'done'}
+    assert ClassificationHistory.query.count() == 2
+
+
+def test_resume_retries_failed_issues(app, job, auth_headers):
+    bulk.run_bulk_job(job.id)
+
+    response = app.test_client().post(f'/api/jobs/bulk/{job.id}/resume', headers=auth_headers)
+    assert response.status_code == 202
+    assert response.get_json()['retried_issues'] == 1
+    db.session.refresh(job)
+    assert job.status == 'queued'
+    assert (job.processed_issues, job.failed_issues) == (2, 0)
+    assert issue_statuses(job)['2'] == 'pending'
+
+    bulk.run_bulk_job(job.id)
+    db.session.refresh(job)
+
+    assert job.status == 'completed'
+    assert (job.processed_issues, job.failed_issues, job.classified_comments) == (3, 0, 9)
+    assert set(issue_statuses(job).values()) == {'done'}
+    assert ClassificationHistory.query.count() == 3
+
+
+def test_completed_job_without_failures_is_not_resumable(app, job, auth_headers):
+    FlakyGitHub.failures = set()
+    bulk.run_bulk_job(job.id)
+
+    response = app.test_client().post(f'/api/jobs/bulk/{job.id}/resume', headers=auth_headers)
+
+    assert response.status_code == 400
+
+
+def test_job_runs_once_per_claim(job):
+    bulk.run_bulk_job(job.id)
+    bulk.run_bulk_job(job.id)  # already completed: the claim fails, nothing is classified again
+
+    assert ClassificationHistory.query.count() == 2
@@ -0,0 +1,95 @@
+# backend/tests/test_classification_result.py
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from models import db, ClassificationHistory, ClassificationResult, ClassificationStat
+from models.classification_result import normalize_confidence, parse_results_json
+from models.migrations import backfill_classification_results, normalize_result_confidences
+
+ISSUE_URL = 'https://github.com/octo/repo/issues/7'
+
+
+def add_history(user, results_json=None):
+    history = ClassificationHistory(user_id=user.id, model_name='model-a', model_type='system',
+                                    source_type='github', issue_url=ISSUE_URL, issue_title='Issue',
+                                    issue_number='7', status='completed', timestamp=datetime(2024, 5, 1),
+                                    result_count=0, results_json=results_json or '[]')
+    db.session.add(history)
+    db.session.commit()
+    return history
+
+
+@pytest.mark.parametrize('value, expected', [
+    (None, None), (0.42, 0.42), (1, 1.0), (95.5, 0.955), ('80%', 0.8), ('0.3', 0.3), ('n/a', None),
+])
+def test_normalize_confidence(value, expected):
+    if expected is None:
+        assert normalize_confidence(value) is None
+    else:
+        assert normalize_confidence(value) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('blob', [
+    '[{"comment": "a", "prediction": "FR"}]',
+    '{"predictions": [{"comment": "a", "prediction": "FR"}]}',
+    '{"results": [{"comment": "a", "prediction": "FR"}, "junk"]}',
+])
+def test_parse_results_json_shapes(blob):
+    assert parse_results_json(blob) == [{'comment': 'a', 'prediction': 'FR'}]
+
+
+def test_from_result_maps_frontend_and_predict_rows():
+    predict_row = ClassificationResult.from_result(
+        {'comment': 'Please add it', 'prediction': 'NFR', 'confidence': 0.9, 'issue_number': 7, 'comment_id': 11},
+        0, 'model-a')
+    frontend_row = ClassificationResult.from_result(
+        {'text': 'Please add it', 'top_prediction': 'FIR', 'confidence': 90, 'edited': True}, 1, 'model-a')
+
+    assert (predict_row.prediction, predict_row.confidence, predict_row.comment_id) == ('NFR', 0.9, 11)
+    assert (frontend_row.prediction, frontend_row.confidence, frontend_row.edited) == ('FIR', 0.9, True)
+    assert predict_row.text_hash == frontend_row.text_hash
+
+
+def test_set_results_stores_fractions(user):
+    history = add_history(user)
+    history.set_results([
+        {'comment': 'a', 'prediction': 'FR', 'confidence': 95.0},
+        {'comment': 'b', 'prediction': 'FR', 'confidence': 0.5},
+        {'comment': 'c', 'prediction': 'FR', 'confidence': '80%'},
+    ])
+    db.session.commit()
+
+    assert [row.confidence for row in history.results] == [0.95, 0.5, 0.8]
+    assert [item['confidence'] for item in json.loads(history.results_json)] == [0.95, 0.5, 0.8]
+
+
+def test_backfill_normalizes_legacy_percentages(user):
+    history = add_history(user, json.dumps([
+        {'comment': 'a', 'prediction': 'FR', 'confidence': 97.0},
+        {'comment': 'b', 'prediction': 'NFR', 'confidence': 0.6},
+    ]))
+
+    backfill_classification_results(db)
+    db.session.commit()
+
+    rows = ClassificationResult.query.filter_by(history_id=history.id).order_by(ClassificationResult.position)
+    assert [(row.prediction, row.confidence) for row in rows] == [('FR', 0.97), ('NFR', 0.6)]
+
+
+def test_migration_fixes_stored_percentages_and_counters(user):
+    history = add_history(user)
+    history.set_results([{'comment': 'a', 'prediction': 'FR', 'confidence': 0.9}])
+    db.session.commit()
+    db.session.execute(text("UPDATE classification_result SET confidence = 90.0"))
+    db.session.execute(text("DELETE FROM classification_stat"))
+    db.session.commit()
+
+    normalize_result_confidences(db)
+    db.session.commit()
+
+    assert db.session.get(ClassificationResult, history.results[0].id).confidence == pytest.approx(0.9)
+    stat = ClassificationStat.query.filter_by(user_id=user.id, prediction='FR').one()
+    assert (stat.comment_count, stat.confidence_sum) == (1, pytest.approx(0.9))
@@ -0,0 +1,72 @@
+# backend/tests/test_history_listing.py
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import db, ClassificationHistory
+
+ISSUE_URL = 'https://github.com/octo/repo/issues/7'
+
+
+def add_history(user, timestamp, results=None, model_name='model-a'):
+    history = ClassificationHistory(user_id=user.id, model_name=model_name, model_type='system',
+                                    source_type='github', issue_url=ISSUE_URL, issue_title='Issue',
+                                    issue_number='7', status='completed', timestamp=timestamp)
+    history.set_results(results or [])
+    db.session.add(history)
+    db.session.commit()
+    return history
+
+
+def test_cursor_round_trip(user):
+    history = add_history(user, datetime(2024, 5, 1, 12, 30, 15, 123456))
+
+    assert ClassificationHistory.decode_cursor(ClassificationHistory.encode_cursor(history)) == \
+        (history.timestamp, history.id)
+
+
+def test_malformed_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        ClassificationHistory.decode_cursor('not-a-cursor')
+
+
+def test_keyset_pages_cover_ties_exactly_once(user):
+    tied = datetime(2024, 5, 1, 12, 0, 0)
+    for offset in (0, 0, 0, 0, 0, 1, 1, -1, -1, -1):
+        add_history(user, tied + timedelta(seconds=offset))
+    expected = [h.id for h in ClassificationHistory.query.order_by(
+        ClassificationHistory.timestamp.desc(), ClassificationHistory.id.desc())]
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        items, cursor = ClassificationHistory.keyset_page(ClassificationHistory.summary_query(user.id), cursor, 3)
+        seen.extend(item.id for item in items)
+        pages += 1
+        if cursor is None:
+            break
+
+    assert seen == expected
+    assert pages == 4
+
+
+def test_history_endpoint_pages_with_cursor(app, user, auth_headers):
+    tied = datetime(2024, 5, 1, 12, 0, 0)
+    ids = sorted((add_history(user, tied).id for _ in range(5)), reverse=True)
+    client = app.test_client()
+
+    first = client.get('/api/history?per_page=2', headers=auth_headers).get_json()
+    second = client.get(f"/api/history?per_page=2&cursor={first['pagination']['next_cursor']}",
+                        headers=auth_headers).get_json()
+
+    assert [item['id'] for item in first['history'] + second['history']] == ids[:4]
+    assert client.get('/api/history?cursor=%%%', headers=auth_headers).status_code == 400
+
+
+def test_listing_returns_summaries_only(app, user, auth_headers):
+    add_history(user, datetime(2024, 5, 1), [{'comment': 'Please add it', 'prediction': 'NFR', 'confidence': 0.9}])
+
+    listing = app.test_client().get('/api/history', headers=auth_headers).get_json()
+
+    item, = listing['history']
+    assert item['result_count'] == 1
+    assert 'results' not in item and 'results_json' not in item
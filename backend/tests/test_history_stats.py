@@ -0,0 +1,62 @@
+# backend/tests/test_history_stats.py
+from models import ClassificationStat
+
+ISSUE_URL = 'https://github.com/octo/repo/issues/7'
+
+
+def counters(user):
+    """{label: (comments, confidence sum)} over every counter row of a user"""
+    totals = {}
+    for stat in ClassificationStat.query.filter_by(user_id=user.id):
+        count, confidence_sum = totals.get(stat.prediction, (0, 0.0))
+        totals[stat.prediction] = (count + stat.comment_count, round(confidence_sum + stat.confidence_sum, 6))
+    return {label: value for label, value in totals.items() if value[0]}
+
+
+def test_counters_follow_save_update_and_delete(app, user, auth_headers):
+    client = app.test_client()
+    results = [
+        {'comment': 'Please add dark mode', 'prediction': 'FR', 'confidence': 0.9, 'comment_id': 1},
+        {'comment': 'It is too slow', 'prediction': 'NFR', 'confidence': 0.8, 'comment_id': 2},
+        {'comment': 'Thanks!', 'prediction': 'Comment', 'confidence': 0.7, 'comment_id': 3},
+    ]
+
+    saved = client.post('/api/ml/save-history', headers=auth_headers, json={
+        'model_name': 'model-a', 'issue_url': ISSUE_URL, 'issue_title': 'Issue', 'issue_number': '7',
+        'result_json': results,
+    })
+    history_id = saved.get_json()['history_id']
+    assert counters(user) == {'FR': (1, 0.9), 'NFR': (1, 0.8), 'Comment': (1, 0.7)}
+
+    # Relabel one comment, as the frontend sends it (percent confidences)
+    edited = [{'top_prediction': item['prediction'], 'confidence': item['confidence'] * 100} for item in results]
+    edited[2]['top_prediction'] = 'FR'
+    response = client.put(f'/api/history/{history_id}/update', headers=auth_headers, json={'predictions': edited})
+    assert response.status_code == 200
+    assert counters(user) == {'FR': (2, 1.6), 'NFR': (1, 0.8)}
+
+    stats = client.get('/api/history/stats', headers=auth_headers).get_json()
+    assert stats['totals']['comments'] == 3
+    assert 0 <= stats['totals']['avg_confidence'] <= 1
+
+    assert client.delete(f'/api/history/{history_id}', headers=auth_headers).status_code == 200
+    assert counters(user) == {}
+
+
+def test_stats_group_by_model_and_filter(app, user, auth_headers):
+    client = app.test_client()
+    for model_name, labels in (('model-a', ['FR', 'FR', 'NFR']), ('model-b', ['Comment'])):
+        client.post('/api/ml/save-history', headers=auth_headers, json={
+            'model_name': model_name, 'issue_url': ISSUE_URL,
+            'result_json': [{'comment': f'c{i}', 'prediction': label, 'confidence': 0.5}
+                            for i, label in enumerate(labels)],
+        })
+
+    stats = client.get('/api/history/stats', headers=auth_headers).get_json()
+    assert stats['totals']['comments'] == 4
+    assert stats['by_model']['model-a']['labels']['FR']['count'] == 2
+    assert stats['by_repository']['octo/repo']['comments'] == 4
+
+    filtered = client.get('/api/history/stats?model_name=model-b', headers=auth_headers).get_json()
+    assert filtered['totals']['comments'] == 1
+    assert list(filtered['by_model']) == ['model-b']
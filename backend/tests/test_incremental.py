@@ -0,0 +1,103 @@
+# backend/tests/test_incremental.py
+import pytest
+
+import ml.routes as ml_routes
+from fakes import WordCountModel, label_of
+from models import ClassificationStat
+
+MODEL = 'test/word-count-model'
+ISSUE_URL = 'https://github.com/octo/repo/issues/7'
+
+
+class FakeIssue:
+    """Stands in for get_issue_data(): the thread as GitHub returns it, honouring ``since``"""
+
+    def __init__(self, comments):
+        self.comments = dict(comments)  # comment_id -> text
+        self.updated = set(self.comments)
+        self.since_calls = []
+
+    def edit(self, comment_id, text):
+        self.comments[comment_id] = text
+        self.updated.add(comment_id)
+
+    def __call__(self, issue_url, token=None, since=None):
+        self.since_calls.append(since)
+        ids = sorted(self.comments) if since is None else sorted(self.updated)
+        self.updated = set()
+        return 'Issue', [{'author': 'someone', 'text': self.comments[i], 'comment_id': i} for i in ids], '7'
+
+
+@pytest.fixture
+def issue(app, monkeypatch):
+    issue = FakeIssue({0: 'issue body text', 101: 'one two three four', 102: 'please add it'})
+    model = WordCountModel(MODEL)
+    monkeypatch.setattr(ml_routes, 'get_issue_data', issue)
+    monkeypatch.setattr(ml_routes, 'get_loaded_model', lambda model_name: model)
+    return issue
+
+
+def rows_by_comment(payload):
+    return {row['comment_id']: row for row in payload['result']}
+
+
+def assert_counters_match_rows(user, payload):
+    expected = {}
+    for row in payload['result']:
+        expected[row['prediction']] = expected.get(row['prediction'], 0) + 1
+    actual = {}
+    for stat in ClassificationStat.query.filter_by(user_id=user.id):
+        actual[stat.prediction] = actual.get(stat.prediction, 0) + stat.comment_count
+    assert {label: count for label, count in actual.items() if count} == expected
+
+
+def test_first_run_classifies_the_whole_issue(user, issue):
+    payload = ml_routes.classify_issue_incremental(MODEL, ISSUE_URL, user.id)
+
+    assert issue.since_calls == [None]
+    assert payload['incremental']['classified'] == 3
+    assert {i: row['prediction'] for i, row in rows_by_comment(payload).items()} == {
+        i: label_of(text) for i, text in issue.comments.items()}
+    assert_counters_match_rows(user, payload)
+
+
+def test_rerun_reclassifies_only_changed_comments_and_keeps_manual_edits(app, user, auth_headers, issue):
+    first = ml_routes.classify_issue_incremental(MODEL, ISSUE_URL, user.id)
+
+    # The user relabels comment 101 by hand
+    edited = [dict(row) for row in first['result']]
+    position = [row['comment_id'] for row in edited].index(101)
+    edited[position]['prediction'] = 'NFR'
+    response = app.test_client().put(f"/api/history/{first['history_id']}/update", headers=auth_headers,
+                                     json={'predictions': edited})
+    assert response.status_code == 200
+
+    # On GitHub: 101 and 102 are edited, 103 is new, the issue body is unchanged
+    issue.edit(101, 'one two three four five')
+    issue.edit(102, 'please add it to the export')
+    issue.edit(103, 'this is a brand new comment')
+
+    second = ml_routes.classify_issue_incremental(MODEL, ISSUE_URL, user.id)
+    rows = rows_by_comment(second)
+
+    assert issue.since_calls[-1] is not None
+    assert second['history_id'] == first['history_id']
+    assert second['incremental']['classified'] == 2  # 102 updated, 103 appended
+    assert second['incremental']['preserved_edits'] == 1
+    assert rows[101]['prediction'] == 'NFR' and rows[101]['edited']
+    assert rows[102]['prediction'] == label_of(issue.comments[102])
+    assert rows[103]['prediction'] == label_of(issue.comments[103])
+    assert rows[0]['prediction'] == first['result'][0]['prediction']
+    assert_counters_match_rows(user, second)
+
+
+def test_rerun_without_changes_classifies_nothing(user, issue):
+    first = ml_routes.classify_issue_incremental(MODEL, ISSUE_URL, user.id)
+
+    second = ml_routes.classify_issue_incremental(MODEL, ISSUE_URL, user.id)
+
+    assert second['incremental']['classified'] == 0
+    assert second['incremental']['reused'] == len(first['result'])
+    assert {i: (row['prediction'], row['confidence']) for i, row in rows_by_comment(second).items()} == \
+        {i: (row['prediction'], row['confidence']) for i, row in rows_by_comment(first).items()}
+    assert_counters_match_rows(user, second)
@@ -0,0 +1,42 @@
+# backend/tests/test_migrations.py
+import threading
+import time
+
+from sqlalchemy import text
+
+import models.migrations as migrations
+from models import db
+
+
+def test_parallel_workers_apply_each_migration_once(app, monkeypatch):
+    calls = []
+
+    def slow_upgrade(db):
+        calls.append(threading.current_thread().name)
+        time.sleep(0.2)  # long enough for the other workers to reach the same version
+
+    monkeypatch.setattr(migrations, 'MIGRATIONS', migrations.MIGRATIONS + [
+        (101, 'test slow migration', slow_upgrade),
+        (102, 'test second slow migration', slow_upgrade),
+    ])
+    errors = []
+
+    def worker():
+        with app.app_context():
+            try:
+                migrations.run_migrations(db)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                db.session.remove()
+
+    threads = [threading.Thread(target=worker, name=f"worker-{i}") for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(calls) == 2
+    versions = [row[0] for row in db.session.execute(text("SELECT version FROM schema_migrations ORDER BY version"))]
+    assert versions == [version for version, _, _ in migrations.MIGRATIONS]
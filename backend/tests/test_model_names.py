@@ -0,0 +1,68 @@
+# backend/tests/test_model_names.py
+import pytest
+
+import ml.routes as ml_routes
+from fakes import WordCountModel
+from ml.artifacts import ArtifactStore
+from models import db, AIModel, BulkJob, PredictionJob
+
+ISSUE_URL = 'https://github.com/octo/repo/issues/1'
+REGISTERED = 'octo/registered-model'
+
+
+@pytest.fixture
+def loads(app, monkeypatch):
+    """Every model load, by name; the GitHub fetch is never reached for unknown models"""
+    loads = []
+
+    def get(model_name, inference_mode='fp32', engine='pytorch'):
+        loads.append(model_name)
+        return WordCountModel(model_name)
+
+    def no_github(*args, **kwargs):
+        raise AssertionError("GitHub fetched for an unknown model")
+
+    monkeypatch.setattr(ml_routes.model_registry, 'get', get)
+    monkeypatch.setattr(ml_routes, 'get_issue_data', no_github)
+    db.session.add(AIModel(name='registered-model', huggingface_url=REGISTERED, uploaded_by='admin'))
+    db.session.commit()
+    return loads
+
+
+@pytest.mark.parametrize('path, payload', [
+    ('/api/ml/predict', {'model_name': 'someone/else', 'issue_url': ISSUE_URL}),
+    ('/api/ml/predict', {'model_name': 'someone/else', 'issue_url': ISSUE_URL, 'async': True}),
+    ('/api/ml/predict/stream', {'model_name': 'someone/else', 'issue_url': ISSUE_URL}),
+    ('/api/ml/compare', {'model_names': [REGISTERED, 'someone/else'], 'issue_url': ISSUE_URL}),
+])
+def test_unknown_model_is_rejected_before_loading(app, loads, path, payload):
+    response = app.test_client().post(path, json=payload)
+
+    assert response.status_code == 404
+    assert 'someone/else' in response.get_json()['error']
+    assert loads == []
+    assert PredictionJob.query.count() == 0
+
+
+def test_unknown_model_is_rejected_for_bulk_jobs(app, loads, auth_headers):
+    response = app.test_client().post('/api/jobs/bulk', headers=auth_headers,
+                                      json={'repo': 'octo/repo', 'model_name': 'someone/else'})
+
+    assert response.status_code == 404
+    assert BulkJob.query.count() == 0
+
+
+def test_loader_only_accepts_registered_models(loads):
+    with pytest.raises(ml_routes.PredictionError) as error:
+        ml_routes.get_loaded_model('someone/else')
+
+    assert error.value.status_code == 404
+    assert ml_routes.get_loaded_model(REGISTERED).name == REGISTERED
+    assert loads == [REGISTERED]
+
+
+def test_store_only_by_default(tmp_path):
+    store = ArtifactStore(root=str(tmp_path))
+
+    with pytest.raises(FileNotFoundError):
+        store.source('someone/else')
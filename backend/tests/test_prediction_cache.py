@@ -0,0 +1,79 @@
+# backend/tests/test_prediction_cache.py
+import ml.routes as ml_routes
+from fakes import WordCountModel
+from ml.cache import PredictionCache
+from ml.inference import classify_texts
+from ml.registry import ModelRegistry
+from models import db, AIModel
+
+MODEL = 'test/word-count-model'
+OLD_SHA = 'a' * 64
+NEW_SHA = 'b' * 64
+TEXTS = ["first comment", "a second, longer comment"]
+
+
+class CountingModel(WordCountModel):
+    def __init__(self, artifact_sha256=None):
+        super().__init__(MODEL)
+        self.artifact_sha256 = artifact_sha256
+        self.forwarded = 0
+
+    def forward(self, inputs):
+        self.forwarded += len(inputs['input_ids'])
+        return super().forward(inputs)
+
+
+def test_refetched_weights_miss_without_an_invalidate(tmp_path):
+    # Two workers sharing the persistent tier; only the first one saw the old weights
+    first = PredictionCache(db_path=str(tmp_path / 'cache.sqlite3'))
+    second = PredictionCache(db_path=str(tmp_path / 'cache.sqlite3'))
+    old = CountingModel(OLD_SHA)
+    classify_texts(old, TEXTS, cache=first)
+
+    new = CountingModel(NEW_SHA)
+    _, stats = classify_texts(new, TEXTS, cache=first)
+    classify_texts(new, TEXTS, cache=second)
+
+    assert stats['cache_hits'] == 0
+    assert new.forwarded == len(TEXTS)  # the second worker reads the new predictions from disk
+    assert classify_texts(old, TEXTS, cache=first)[1]['cache_hits'] == len(TEXTS)
+
+
+def test_cache_key_covers_engine_mode_and_weights():
+    keys = set()
+    for mode in ('fp32', 'int8'):
+        for sha in (None, OLD_SHA, NEW_SHA):
+            model = CountingModel(sha)
+            model.inference_mode = mode
+            keys.add(model.cache_key)
+
+    assert len(keys) == 6
+    assert CountingModel(OLD_SHA).cache_key == f"{MODEL}@{OLD_SHA[:16]}"
+
+
+def test_invalidate_drops_every_namespace_of_the_model(tmp_path):
+    cache = PredictionCache(db_path=str(tmp_path / 'cache.sqlite3'))
+    for namespace in (MODEL, f"{MODEL}@{OLD_SHA[:16]}", f"{MODEL}#int8@{OLD_SHA[:16]}", 'test/other-model'):
+        cache.put_many(namespace, TEXTS, [('Comment', 0.9)] * len(TEXTS))
+
+    cache.invalidate(MODEL)
+
+    assert cache.stats()['memory_entries'] == cache.stats()['disk_entries'] == len(TEXTS)
+    assert len(cache.get_many('test/other-model', TEXTS)) == len(TEXTS)
+
+
+def test_worker_reloads_weights_refetched_elsewhere(app, monkeypatch):
+    stored = {'sha256': OLD_SHA}
+    registry = ModelRegistry(loader=lambda name, mode, engine: CountingModel(stored['sha256']))
+    monkeypatch.setattr(ml_routes, 'model_registry', registry)
+    model = AIModel(name='word-count-model', huggingface_url=MODEL, uploaded_by='admin', artifact_sha256=OLD_SHA)
+    db.session.add(model)
+    db.session.commit()
+    assert ml_routes.get_loaded_model(MODEL).artifact_sha256 == OLD_SHA
+
+    # Another worker re-fetched the model: new files in the store, new checksum in AIModel
+    stored['sha256'] = model.artifact_sha256 = NEW_SHA
+    db.session.commit()
+
+    assert ml_routes.get_loaded_model(MODEL).artifact_sha256 == NEW_SHA
+    assert registry.misses == 2
@@ -0,0 +1,40 @@
+# backend/tests/test_prediction_jobs.py
+import json
+import time
+
+import ml.routes as ml_routes
+from jobs.lease import requeue_stale
+from jobs.worker import run_prediction_job
+from models import db, PredictionJob
+
+
+def queue_job():
+    job = PredictionJob(model_name='test/word-count-model', issue_url='https://github.com/octo/repo/issues/1')
+    db.session.add(job)
+    db.session.commit()
+    return job.id
+
+
+def test_heartbeat_is_renewed_while_the_pipeline_runs(app, monkeypatch):
+    app.config['JOB_LEASE_SECONDS'] = 0.3
+    job_id = queue_job()
+    seen = {}
+
+    def slow_classify(model_name, issue_url):
+        claimed_at = db.session.get(PredictionJob, job_id).heartbeat
+        time.sleep(0.5)  # longer than the lease
+        db.session.expire_all()
+        seen['renewed'] = db.session.get(PredictionJob, job_id).heartbeat > claimed_at
+        # Another process looking for stale jobs must leave this one alone
+        seen['requeued'] = requeue_stale(PredictionJob, lease_seconds=0.3)
+        return {'ok': True}
+
+    monkeypatch.setattr(ml_routes, 'classify_issue', slow_classify)
+
+    run_prediction_job(job_id)
+
+    assert seen == {'renewed': True, 'requeued': 0}
+    job = db.session.get(PredictionJob, job_id)
+    db.session.refresh(job)
+    assert job.status == 'completed'
+    assert json.loads(job.result_json) == {'ok': True}
@@ -0,0 +1,83 @@
+# backend/tests/test_registry.py
+import threading
+
+from fakes import WordCountModel
+from ml.registry import ModelRegistry
+
+MODEL = 'test/word-count-model'
+
+
+class GatedLoader:
+    """Loader whose loads block until released; records every load"""
+
+    def __init__(self):
+        self.loads = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, model_name, inference_mode, engine):
+        self.loads.append(model_name)
+        self.started.set()
+        self.release.wait(5)
+        return WordCountModel(model_name)
+
+
+def get_in_background(registry):
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(entry=registry.get(MODEL)))
+    thread.start()
+    return thread, result
+
+
+def test_concurrent_gets_share_one_load():
+    loader = GatedLoader()
+    registry = ModelRegistry(loader=loader)
+    first, first_result = get_in_background(registry)
+    loader.started.wait(5)
+    second, second_result = get_in_background(registry)
+
+    loader.release.set()
+    first.join()
+    second.join()
+
+    assert loader.loads == [MODEL]
+    assert first_result['entry'] is second_result['entry']
+    assert registry.is_loaded(MODEL)
+
+
+def test_evict_during_load_drops_the_stale_result():
+    loader = GatedLoader()
+    registry = ModelRegistry(loader=loader)
+    thread, result = get_in_background(registry)
+    loader.started.wait(5)
+
+    registry.evict(MODEL)
+    loader.release.set()
+    thread.join()
+
+    # The caller that asked before the evict is served, but the old weights are not cached
+    assert result['entry'].name == MODEL
+    assert not registry.is_loaded(MODEL)
+    fresh = registry.get(MODEL)
+    assert fresh is not result['entry']
+    assert loader.loads == [MODEL, MODEL]
+    assert registry.is_loaded(MODEL)
+
+
+def test_get_after_evict_does_not_wait_on_the_stale_load():
+    loader = GatedLoader()
+    registry = ModelRegistry(loader=loader)
+    stale, stale_result = get_in_background(registry)
+    loader.started.wait(5)
+
+    registry.evict(MODEL)
+    loader.started.clear()
+    fresh, fresh_result = get_in_background(registry)
+    loader.started.wait(5)
+    loader.release.set()
+    stale.join()
+    fresh.join()
+
+    assert len(loader.loads) == 2
+    assert fresh_result['entry'] is not stale_result['entry']
+    assert registry.get(MODEL) is fresh_result['entry']
@@ -0,0 +1,160 @@
+# backend/tests/test_scheduler.py
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from ml.scheduler import MicroBatchScheduler
+
+
+def fake_model(name='model'):
+    return SimpleNamespace(name=name, cache_key=name, engine='pytorch')
+
+
+class RecordingPredict:
+    """predict() stand-in: labels every text with itself so each caller can check its own slice"""
+
+    def __init__(self, error=None):
+        self.calls = []
+        self.error = error
+        self.release = threading.Event()
+        self.holding = threading.Event()
+        self._lock = threading.Lock()
+
+    def __call__(self, loaded, texts, batch_size, token_budget):
+        if texts == ['hold']:
+            # Keeps one request of the model in flight until released
+            self.holding.set()
+            self.release.wait(10)
+            return [('held', 0.0)], {'batches': 1}
+        with self._lock:
+            self.calls.append(list(texts))
+        if self.error is not None:
+            raise self.error
+        return [(f"label:{text}", float(len(text))) for text in texts], {'batches': 1}
+
+
+class InFlight:
+    """Runs a request that stays in flight, so later requests for the model are coalesced"""
+
+    def __init__(self, scheduler, predict, loaded):
+        self.predict = predict
+        self.thread = threading.Thread(target=scheduler.submit, args=(loaded, ['hold'], predict, 16, 8192))
+
+    def __enter__(self):
+        self.thread.start()
+        assert self.predict.holding.wait(5)
+        return self
+
+    def __exit__(self, *exc):
+        self.predict.release.set()
+        self.thread.join(10)
+
+
+def submit_concurrently(scheduler, requests, predict, loaded=None):
+    """Submit every list of texts from its own thread at the same time; returns {index: outcome}"""
+    loaded = loaded or fake_model()
+    barrier = threading.Barrier(len(requests))
+    outcomes = {}
+
+    def run(index, texts):
+        barrier.wait()
+        try:
+            outcomes[index] = scheduler.submit(loaded, texts, predict, 16, 8192)
+        except Exception as e:
+            outcomes[index] = e
+
+    threads = [threading.Thread(target=run, args=item) for item in enumerate(requests)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return outcomes
+
+
+def test_concurrent_requests_share_one_pass_and_get_their_own_results():
+    scheduler = MicroBatchScheduler(window_ms=500, max_texts=64)
+    predict = RecordingPredict()
+    loaded = fake_model()
+    requests = [[f"r{r}-t{t}" for t in range(r + 1)] for r in range(4)]
+
+    with InFlight(scheduler, predict, loaded):
+        outcomes = submit_concurrently(scheduler, requests, predict, loaded)
+
+    assert len(predict.calls) == 1
+    assert sorted(predict.calls[0]) == sorted(text for texts in requests for text in texts)
+    for index, texts in enumerate(requests):
+        results, stats = outcomes[index]
+        assert results == [(f"label:{text}", float(len(text))) for text in texts]
+        assert stats['coalesced_requests'] == len(requests)
+
+
+def test_request_with_nothing_in_flight_does_not_wait():
+    scheduler = MicroBatchScheduler(window_ms=60000, max_texts=64)
+    predict = RecordingPredict()
+
+    started = time.perf_counter()
+    results, stats = scheduler.submit(fake_model(), ['a'], predict, 16, 8192)
+
+    assert time.perf_counter() - started < 1
+    assert results == [('label:a', 1.0)]
+    assert 'coalesced_requests' not in stats
+
+
+def test_group_closes_early_once_max_texts_joined():
+    scheduler = MicroBatchScheduler(window_ms=60000, max_texts=4)
+    predict = RecordingPredict()
+    loaded = fake_model()
+
+    with InFlight(scheduler, predict, loaded):
+        outcomes = submit_concurrently(scheduler, [['a', 'b'], ['c', 'd']], predict, loaded)
+
+    assert len(outcomes) == 2  # did not wait for the 60 s window
+    assert [len(call) for call in predict.calls] == [4]
+
+
+def test_different_models_are_not_coalesced():
+    scheduler = MicroBatchScheduler(window_ms=200, max_texts=64)
+    predict = RecordingPredict()
+    first, second = fake_model('first'), fake_model('second')
+    outcomes = {}
+
+    def run(loaded, text):
+        outcomes[loaded.name] = scheduler.submit(loaded, [text], predict, 16, 8192)
+
+    with InFlight(scheduler, predict, first), InFlight(scheduler, RecordingPredict(), second):
+        threads = [threading.Thread(target=run, args=(first, 'x')), threading.Thread(target=run, args=(second, 'y'))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+    assert sorted(predict.calls) == [['x'], ['y']]
+    assert outcomes['first'][0] == [('label:x', 1.0)]
+    assert outcomes['second'][0] == [('label:y', 1.0)]
+
+
+def test_error_reaches_every_caller_of_the_group():
+    scheduler = MicroBatchScheduler(window_ms=300, max_texts=64)
+    predict = RecordingPredict(error=RuntimeError("forward failed"))
+    loaded = fake_model()
+
+    with InFlight(scheduler, predict, loaded):
+        outcomes = submit_concurrently(scheduler, [['a'], ['b'], ['c']], predict, loaded)
+
+    assert len(predict.calls) == 1
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes.values())
+
+
+@pytest.mark.parametrize('window_ms, texts', [(0, ['a']), (500, ['t'] * 8)])
+def test_disabled_or_large_requests_bypass_the_scheduler(window_ms, texts):
+    scheduler = MicroBatchScheduler(window_ms=window_ms, max_texts=8)
+    predict = RecordingPredict()
+    loaded = fake_model()
+
+    with InFlight(scheduler, predict, loaded):
+        results, stats = scheduler.submit(loaded, texts, predict, 16, 8192)
+
+    assert predict.calls == [texts]
+    assert 'coalesced_requests' not in stats
@@ -0,0 +1,60 @@
+# backend/tests/test_warmup.py
+import pytest
+
+import ml.routes as ml_routes
+import ml.warmup as warmup
+from fakes import WordCountModel
+from ml.registry import ModelRegistry
+from models import db, AIModel
+
+GOOD = 'octo/good-model'
+BROKEN = 'octo/broken-model'
+
+
+def load(model_name, inference_mode, engine):
+    if model_name == BROKEN:
+        raise FileNotFoundError(f"{model_name} is not in the model store")
+    return WordCountModel(model_name)
+
+
+@pytest.fixture
+def model_warmup(app, monkeypatch):
+    monkeypatch.setattr(warmup, 'model_registry', ModelRegistry(loader=load))
+    model_warmup = warmup.ModelWarmup(passes=1)
+    monkeypatch.setattr(ml_routes, 'model_warmup', model_warmup)
+    for name in (GOOD, BROKEN):
+        db.session.add(AIModel(name=name.split('/')[-1], huggingface_url=name, uploaded_by='admin'))
+    db.session.commit()
+    return model_warmup
+
+
+def readiness(app):
+    response = app.test_client().get('/api/ml/ready')
+    return response.status_code, response.get_json()
+
+
+def test_ready_once_every_selected_model_is_hot(app, model_warmup):
+    model_warmup.configure(models=GOOD)
+    model_warmup.run(app)
+
+    status_code, status = readiness(app)
+    assert status_code == 200
+    assert status['ready'] is True
+    assert status['hot_models'] == [GOOD]
+    assert status['failed_models'] == []
+
+
+def test_not_ready_when_a_selected_model_failed(app, model_warmup):
+    model_warmup.configure(models='all')
+    model_warmup.run(app)
+
+    status_code, status = readiness(app)
+    assert status_code == 503
+    assert status['ready'] is False
+    assert status['finished_at'] is not None
+    assert status['hot_models'] == [GOOD]
+    assert status['failed_models'] == [BROKEN]
+
+
+def test_ready_without_preloading(app, model_warmup):
+    assert readiness(app)[0] == 200
@@ -0,0 +1,221 @@
+# backend/utils/github_api.py
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, parse_qs
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.http_cache import github_cache
+
+PER_PAGE = 100
+MAX_WORKERS = 8
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5  # seconds, doubled after every attempt
+MAX_RETRY_WAIT = 30  # never sleep longer than this for Retry-After / rate-limit reset
+RETRY_STATUSES = (403, 429, 500, 502, 503, 504)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_api_url():
+    """Base URL of the GitHub API (override with GITHUB_API_URL, e.g. for a local stub server)"""
+    return os.environ.get('GITHUB_API_URL', 'https://api.github.com').rstrip('/')
+
+
+def get_session():
+    """Process-wide pooled session so fetches reuse TCP/TLS connections"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS * 2)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+        return _session
+
+
+def parse_issue_url(issue_url):
+    """Return (owner, repo, issue_number) from a GitHub issue URL, or None"""
+    path = urlparse(issue_url).path.strip('/').split('/')
+    if len(path) < 4 or path[-2] != 'issues':
+        return None
+    return path[-4], path[-3], path[-1]
+
+
+class GitHubError(RuntimeError):
+    """A page GitHub kept failing on; raised instead of returning a truncated list"""
+
+
+def retry_delay(response, attempt):
+    """Seconds to wait before retrying: Retry-After / rate-limit reset if GitHub sent one, else backoff"""
+    if response is not None:
+        retry_after = response.headers.get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            return min(int(retry_after), MAX_RETRY_WAIT)
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            reset = response.headers.get('X-RateLimit-Reset')
+            if reset and reset.isdigit():
+                return min(max(0, int(reset) - time.time()), MAX_RETRY_WAIT)
+    return RETRY_BACKOFF * (2 ** attempt)
+
+
+def last_page_number(response):
+    """Total page count from the Link header (1 when there is no 'last' link)"""
+    last = response.links.get('last', {}).get('url')
+    if not last:
+        return 1
+    try:
+        return int(parse_qs(urlparse(last).query).get('page', ['1'])[0])
+    except ValueError:
+        return 1
+
+
+class GitHubClient:
+    """
+    Small GitHub REST client: pooled session, ETag response cache,
+    Link-header pagination and concurrent page fetches
+    """
+
+    def __init__(self, token=None, base_url=None, max_workers=MAX_WORKERS, session=None, cache=github_cache):
+        self.base_url = (base_url or get_api_url()).rstrip('/')
+        self.max_workers = max_workers
+        self.session = session or get_session()
+        self.cache = cache
+        self.token = token if token and token.startswith('ghp_') else None
+
+    def request_headers(self, authenticated=True):
+        """Fresh headers for one request (the client is shared by page-fetching threads)"""
+        headers = {'Accept': 'application/vnd.github.v3+json', 'User-Agent': 'Issue-Classifier'}
+        if authenticated and self.token:
+            headers['Authorization'] = f'token {self.token}'
+        return headers
+
+    def _send(self, url, params=None, authenticated=True):
+        headers = self.request_headers(authenticated)
+        if self.cache is not None and self.cache.enabled:
+            return self.cache.get(self.session, url, params=params, headers=headers)
+        return self.session.get(url, headers=headers, params=params, timeout=30)
+
+    def get(self, url, params=None):
+        """GET with the client headers; retries once without a rejected token"""
+        response = self._send(url, params)
+        if response.status_code == 401 and self.token:
+            response = self._send(url, params, authenticated=False)
+        return response
+
+    def get_page(self, url, params=None):
+        """
+        GET a list page, retrying rate limits, 5xx and connection errors with
+        backoff. Returns the 200 response, None for 404/410, and raises
+        GitHubError if the page still fails, so callers never get a silently
+        shortened list.
+        """
+        response, error = None, None
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                response, error = self.get(url, params=params), None
+            except requests.RequestException as e:
+                response, error = None, e
+            if response is not None and response.status_code == 200:
+                return response
+            if response is not None and response.status_code in (404, 410):
+                return None
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                break
+            if attempt < MAX_RETRIES:
+                time.sleep(retry_delay(response, attempt))
+        reason = error or f"HTTP {response.status_code}"
+        raise GitHubError(f"GitHub request failed after {MAX_RETRIES + 1} attempts: {url} ({reason})")
+
+    def issue_url(self, owner, repo, issue_number):
+        return f"{self.base_url}/repos/{owner}/{repo}/issues/{issue_number}"
+
+    def fetch_issue(self, owner, repo, issue_number):
+        """Issue JSON, or None if the issue does not exist (GitHubError if GitHub keeps failing)"""
+        response = self.get_page(self.issue_url(owner, repo, issue_number))
+        return response.json() if response is not None else None
+
+    def fetch_all_pages(self, url, params=None, executor=None):
+        """
+        Fetch every page of a list endpoint. The first page tells us the page
+        count through its Link header; the remaining pages are fetched
+        concurrently and concatenated in page order. None if the endpoint does
+        not exist; GitHubError if any page keeps failing.
+        """
+        params = dict(params or {}, per_page=PER_PAGE)
+        first = self.get_page(url, params=dict(params, page=1))
+        if first is None:
+            return None
+
+        items = list(first.json())
+        pages = last_page_number(first)
+        if pages <= 1:
+            # No 'last' link but a 'next' one: walk it sequentially
+            next_url = first.links.get('next', {}).get('url')
+            while next_url:
+                response = self.get_page(next_url)
+                if response is None:
+                    raise GitHubError(f"GitHub page disappeared while paginating: {next_url}")
+                items.extend(response.json())
+                next_url = response.links.get('next', {}).get('url')
+            return items
+
+        def fetch_page(page):
+            response = self.get_page(url, params=dict(params, page=page))
+            if response is None:
+                raise GitHubError(f"GitHub page {page} disappeared while paginating: {url}")
+            return response.json()
+
+        if executor is not None:
+            results = list(executor.map(fetch_page, range(2, pages + 1)))
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                results = list(pool.map(fetch_page, range(2, pages + 1)))
+        for page_items in results:
+            items.extend(page_items)
+        return items
+
+    def iter_pages(self, url, params=None):
+        """
+        Yield a list endpoint one page at a time, prefetching the next page
+        while the caller works on the current one (at most two pages in memory).
+        """
+        params = dict(params or {}, per_page=PER_PAGE)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            future = pool.submit(self.get_page, url, params)
+            first = True
+            while future is not None:
+                response = future.result()
+                if response is None:
+                    if first:
+                        return
+                    raise GitHubError(f"GitHub page disappeared while paginating: {url}")
+                first = False
+                next_url = response.links.get('next', {}).get('url')
+                future = pool.submit(self.get_page, next_url) if next_url else None
+                yield response.json()
+
+    def iter_comment_pages(self, owner, repo, issue_number, since=None):
+        params = {'since': since} if since else None
+        return self.iter_pages(f"{self.issue_url(owner, repo, issue_number)}/comments", params)
+
+    def fetch_comments(self, owner, repo, issue_number, since=None, executor=None):
+        params = {'since': since} if since else None
+        return self.fetch_all_pages(f"{self.issue_url(owner, repo, issue_number)}/comments", params, executor)
+
+    def fetch_issue_with_comments(self, owner, repo, issue_number, since=None):
+        """
+        Fetch the issue and all of its comments in parallel; returns (issue, comments).
+        The comment pages fan out on their own executor: page tasks are never
+        queued behind the task that waits for them.
+        """
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            issue_future = pool.submit(self.fetch_issue, owner, repo, issue_number)
+            comments = self.fetch_comments(owner, repo, issue_number, since)
+            return issue_future.result(), comments
@@ -3,6 +3,7 @@
 import requests
 import re
 from urllib.parse import urlparse
+from utils.github_api import GitHubClient
 
 def extract_comments(github_url):
     """
@@ -25,19 +26,14 @@ def extract_comments(github_url):
         
         print(f"📋 Parsed URL - Owner: {owner}, Repo: {repo}, Issue: {issue_number}")
         
-        # GitHub API endpoints
-        issue_api_url = f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}"
-        comments_api_url = f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}/comments"
-        
-        # Headers for GitHub API (you can add token here if needed)
-        headers = {
-            'Accept': 'application/vnd.github.v3+json',
-            'User-Agent': 'GitHub-Issue-Classifier'
-        }
+        # GitHub API client (conditional requests served from the ETag cache)
+        client = GitHubClient()
+        issue_api_url = client.issue_url(owner, repo, issue_number)
+        comments_api_url = f"{issue_api_url}/comments"
         
         # Get issue details
         print(f"📥 Fetching issue details...")
-        issue_response = requests.get(issue_api_url, headers=headers)
+        issue_response = client.get(issue_api_url)
         
         if issue_response.status_code == 404:
             raise ValueError(f"Issue not found. Please check if the URL is correct: {github_url}")
@@ -53,13 +49,11 @@ def extract_comments(github_url):
         
         # Get comments
         print(f"📥 Fetching comments...")
-        comments_response = requests.get(comments_api_url, headers=headers)
+        comments_data = client.fetch_all_pages(comments_api_url)
         
-        if comments_response.status_code != 200:
-            print(f"⚠️ Failed to fetch comments. Status code: {comments_response.status_code}")
+        if comments_data is None:
+            print(f"⚠️ Failed to fetch comments.")
             comments_data = []
-        else:
-            comments_data = comments_response.json()
         
         # Prepare comments list
         comments_list = []
@@ -75,7 +69,7 @@ def extract_comments(github_url):
         
         # Add all comments
         for comment in comments_data:
-            comment_body = comment.get('body', '').strip()
+            comment_body = (comment.get('body') or '').strip()
             comment_author = comment.get('user', {}).get('login', 'unknown')
             
             if comment_body:  # Only add non-empty comments
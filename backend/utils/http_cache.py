@@ -0,0 +1,203 @@
+# backend/utils/http_cache.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Response headers worth keeping with the body (Link is needed for pagination)
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Link')
+
+
+class ConditionalRequestCache:
+    """
+    Persistent ETag cache for GitHub API GETs.
+
+    Within ``ttl`` seconds a stored response is served without any request.
+    After that the request is sent with If-None-Match / If-Modified-Since;
+    a 304 is answered from local storage and does not count against the
+    GitHub rate limit. The store is capped at ``max_bytes`` of bodies and
+    drops the least recently used entries first.
+    """
+
+    def __init__(self, db_path=None, ttl=60, max_bytes=100 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.db_path = None
+        self._conn = None
+        self._lock = threading.Lock()
+        self.fresh_hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.rate_limit = {}
+        if db_path:
+            self.open(db_path)
+
+    def configure(self, db_path=None, ttl=None, max_bytes=None):
+        if ttl is not None:
+            self.ttl = ttl
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        if db_path and db_path != self.db_path:
+            self.open(db_path)
+
+    def open(self, db_path):
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        conn.commit()
+        with self._lock:
+            self._conn = conn
+            self.db_path = db_path
+
+    @property
+    def enabled(self):
+        return self._conn is not None
+
+    def get(self, session, url, params=None, headers=None, timeout=30):
+        """Cached equivalent of session.get(url, params=params, headers=headers)"""
+        headers = dict(headers or {})
+        key = requests.Request('GET', url, params=params).prepare().url
+        if 'Authorization' in headers:
+            # Authenticated responses may include private data
+            key = f"auth:{key}"
+
+        entry = self._load(key)
+        now = time.time()
+        if entry and now - entry['fetched_at'] < self.ttl:
+            with self._lock:
+                self.fresh_hits += 1
+            self._touch(key, now)
+            return self._build_response(url, entry)
+
+        if entry:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = session.get(url, headers=headers, params=params, timeout=timeout)
+        self._record_rate_limit(response)
+
+        if response.status_code == 304 and entry:
+            with self._lock:
+                self.revalidated += 1
+            self._refresh(key, now)
+            return self._build_response(url, entry)
+
+        with self._lock:
+            self.misses += 1
+        if response.status_code == 200 and (response.headers.get('ETag') or response.headers.get('Last-Modified')):
+            self._store(key, response, now)
+        return response
+
+    def _load(self, key):
+        if self._conn is None:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, headers, body, fetched_at FROM http_cache WHERE url = ?", (key,)
+            ).fetchone()
+        if not row:
+            return None
+        return {'etag': row[0], 'last_modified': row[1], 'headers': json.loads(row[2]),
+                'body': row[3], 'fetched_at': row[4]}
+
+    def _touch(self, key, now):
+        with self._lock:
+            self._conn.execute("UPDATE http_cache SET accessed_at = ? WHERE url = ?", (now, key))
+            self._conn.commit()
+
+    def _refresh(self, key, now):
+        with self._lock:
+            self._conn.execute("UPDATE http_cache SET fetched_at = ?, accessed_at = ? WHERE url = ?", (now, now, key))
+            self._conn.commit()
+
+    def _store(self, key, response, now):
+        if self._conn is None:
+            return
+        body = response.content
+        stored_headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache (url, etag, last_modified, headers, body, size, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                 json.dumps(stored_headers), body, len(body), now, now)
+            )
+            self._evict_over_cap()
+            self._conn.commit()
+
+    def _evict_over_cap(self):
+        """Drop least recently used entries until the bodies fit max_bytes (caller holds the lock)"""
+        if not self.max_bytes:
+            return
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in self._conn.execute("SELECT url, size FROM http_cache ORDER BY accessed_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM http_cache WHERE url = ?", (url,))
+            total -= size
+
+    def _record_rate_limit(self, response):
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        if remaining is None:
+            return
+        with self._lock:
+            self.rate_limit = {
+                'limit': response.headers.get('X-RateLimit-Limit'),
+                'remaining': remaining,
+                'reset': response.headers.get('X-RateLimit-Reset'),
+            }
+
+    @staticmethod
+    def _build_response(url, entry):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = entry['body']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.url = url
+        response.encoding = 'utf-8'
+        return response
+
+    def stats(self):
+        with self._lock:
+            entries, size = 0, 0
+            if self._conn is not None:
+                entries, size = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_cache"
+                ).fetchone()
+            served = self.fresh_hits + self.revalidated
+            lookups = served + self.misses
+            return {
+                'enabled': self._conn is not None,
+                'fresh_hits': self.fresh_hits,
+                'revalidated_304': self.revalidated,
+                'misses': self.misses,
+                'hit_ratio': round(served / lookups, 4) if lookups else 0.0,
+                'entries': entries,
+                'size_mb': round(size / (1024 * 1024), 2),
+                'max_mb': round(self.max_bytes / (1024 * 1024), 1) if self.max_bytes else None,
+                'ttl_seconds': self.ttl,
+                'rate_limit': dict(self.rate_limit),
+            }
+
+
+github_cache = ConditionalRequestCache()
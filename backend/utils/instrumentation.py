@@ -0,0 +1,144 @@
+# backend/utils/instrumentation.py
+
+import logging
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from utils.metrics import STAGE_SECONDS, REQUEST_SECONDS
+
+LOGGER_NAME = 'issue_classifier'
+
+_settings = {'debug': False, 'sample_rate': 1.0}
+_local = threading.local()
+
+
+class KeyValueFormatter(logging.Formatter):
+    """``<time> <LEVEL> <logger> <message> key=value ...`` - one greppable line per event"""
+
+    def format(self, record):
+        line = f"{self.formatTime(record)} {record.levelname} {record.name} {record.getMessage()}"
+        fields = getattr(record, 'fields', None)
+        if fields:
+            line += " " + " ".join(f"{key}={_format_value(value)}" for key, value in fields.items())
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    text = str(value)
+    return f'"{text}"' if (' ' in text or not text) else text
+
+
+def configure_logging(level='INFO', debug=False, sample_rate=1.0):
+    """
+    Set up the application logger.
+
+    ``debug`` enables tensor dumps and the label-mapping self-test;
+    ``sample_rate`` is the share of requests whose detail lines are logged
+    (the per-request summary line is always written).
+    """
+    _settings['debug'] = bool(debug)
+    _settings['sample_rate'] = max(0.0, min(1.0, float(sample_rate)))
+
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(logging.DEBUG if debug else getattr(logging, str(level).upper(), logging.INFO))
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(KeyValueFormatter())
+        logger.addHandler(handler)
+    logger.propagate = False
+    return logger
+
+
+def get_logger(name=None):
+    return logging.getLogger(f"{LOGGER_NAME}.{name}" if name else LOGGER_NAME)
+
+
+def is_debug():
+    return _settings['debug']
+
+
+def log_event(logger, level, message, **fields):
+    if logger.isEnabledFor(level):
+        logger.log(level, message, extra={'fields': fields})
+
+
+class RequestTrace:
+    """Per-request stage timings, emitted as a single summary line"""
+
+    def __init__(self, name, **fields):
+        self.name = name
+        self.request_id = uuid.uuid4().hex[:12]
+        self.fields = OrderedDict(fields)
+        self.stages = OrderedDict()
+        self.started = time.perf_counter()
+        self.sampled = random.random() < _settings['sample_rate']
+        self.finished = False
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def detail(self, logger, message, **fields):
+        """Debug line, only for sampled requests"""
+        if self.sampled:
+            log_event(logger, logging.DEBUG, message, request_id=self.request_id, **fields)
+
+    def finish(self, logger, level=logging.INFO, **fields):
+        if self.finished:
+            return
+        self.finished = True
+        self.fields.update(fields)
+        total = time.perf_counter() - self.started
+        for name, seconds in self.stages.items():
+            STAGE_SECONDS.observe(seconds, endpoint=self.name, stage=name)
+        REQUEST_SECONDS.observe(total, endpoint=self.name, status=self.fields.get('status', ''))
+
+        timings = OrderedDict((f"{name}_ms", seconds * 1000) for name, seconds in self.stages.items())
+        timings['total_ms'] = total * 1000
+        log_event(logger, level, self.name, request_id=self.request_id, **self.fields, **timings)
+
+
+class _NullTrace(RequestTrace):
+    """Stand-in used when code runs outside a traced request (workers, scripts)"""
+
+    def __init__(self):
+        super().__init__('untraced')
+        self.sampled = False
+
+    def finish(self, logger, level=logging.INFO, **fields):
+        pass
+
+
+@contextmanager
+def traced(name, **fields):
+    """Make a RequestTrace the current trace of this thread for the duration of the block"""
+    trace = RequestTrace(name, **fields)
+    previous = getattr(_local, 'trace', None)
+    _local.trace = trace
+    try:
+        yield trace
+    finally:
+        _local.trace = previous
+
+
+def current_trace():
+    trace = getattr(_local, 'trace', None)
+    return trace if trace is not None else _NullTrace()
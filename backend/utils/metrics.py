@@ -0,0 +1,170 @@
+# backend/utils/metrics.py
+
+import bisect
+import functools
+import threading
+import time
+
+# Seconds; covers cache hits (ms) up to long GitHub fetches / cold model loads
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _label_key(labelnames, labels):
+    return tuple(str(labels.get(name, '')) for name in labelnames)
+
+
+def _format_labels(labelnames, key, extra=None):
+    pairs = list(zip(labelnames, key)) + list(extra or [])
+    if not pairs:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    type_name = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield f"{self.name}_total{_format_labels(self.labelnames, key)} {_format_number(value)}"
+
+
+class Histogram:
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # key -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(self.labelnames, labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def time(self, **labels):
+        """Decorator observing the duration of every call"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(time.perf_counter() - started, **labels)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        """{label values: (sum, count)} - used by the benchmark suite to diff stage timings"""
+        with self._lock:
+            return {key: (series[-2], series[-1]) for key, series in self._series.items()}
+
+    def samples(self):
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', _format_number(bound))])} {cumulative}"
+            yield f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', '+Inf')])} {series[-1]}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_number(series[-2])}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {series[-1]}"
+
+
+class Gauge:
+    """Gauge read from a callback at scrape time (returns a number or {label_value: number})"""
+
+    type_name = 'gauge'
+
+    def __init__(self, name, documentation, callback, labelname=None):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.labelname = labelname
+
+    def samples(self):
+        try:
+            value = self.callback()
+        except Exception:
+            return
+        if isinstance(value, dict):
+            for label, number in value.items():
+                yield f"{self.name}{_format_labels((self.labelname,), (str(label),))} {_format_number(number)}"
+        elif value is not None:
+            yield f"{self.name} {_format_number(value)}"
+
+
+class MetricsRegistry:
+    def __init__(self, prefix='issue_classifier'):
+        self.prefix = prefix
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(f"{self.prefix}_{name}", documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(f"{self.prefix}_{name}", documentation, labelnames, buckets))
+
+    def gauge(self, name, documentation, callback, labelname=None):
+        return self._register(Gauge(f"{self.prefix}_{name}", documentation, callback, labelname))
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+# Pipeline metrics shared by the ML, jobs and history modules
+STAGE_SECONDS = metrics.histogram(
+    'stage_seconds', 'Time spent per pipeline stage (fetch, model_load, tokenize, forward, serialize)',
+    ('endpoint', 'stage')
+)
+REQUEST_SECONDS = metrics.histogram('request_seconds', 'End-to-end request duration', ('endpoint', 'status'))
+GITHUB_FETCH_SECONDS = metrics.histogram('github_fetch_seconds', 'GitHub issue + comments fetch duration', ('outcome',))
+COMMENTS_CLASSIFIED = metrics.counter('comments_classified', 'Comments classified', ('model',))
+HISTORY_SECONDS = metrics.histogram('history_seconds', 'History endpoint duration', ('route',))